@@ -0,0 +1,59 @@
+"""
+Benchmark the event processing mux in
+`FlumineBacktest.run`, the per update cost
+should remain flat as the number of markets
+in the event grows.
+
+    python examples/benchmarks/eventmux.py
+"""
+import time
+import logging
+from types import SimpleNamespace
+
+from flumine import FlumineBacktest, clients
+
+logging.disable(logging.CRITICAL)
+
+UPDATES_PER_MARKET = 2000
+
+
+class BenchmarkStream:
+    def __init__(self, stream_id: int, offset: int):
+        self.stream_id = stream_id
+        self.market_filter = "1.%s" % stream_id
+        self.event_processing = True
+        self.event_id = "123"
+        self._offset = offset
+
+    def create_generator(self):
+        def gen():
+            for i in range(UPDATES_PER_MARKET):
+                yield [SimpleNamespace(publish_time_epoch=i * 100 + self._offset)]
+
+        return gen
+
+    def stop(self) -> None:
+        pass
+
+
+def run(market_count: int) -> float:
+    framework = FlumineBacktest(client=clients.BacktestClient())
+    framework._process_market_books = lambda event: None
+    framework._process_end_flumine = lambda: None
+    framework.streams._streams = [
+        BenchmarkStream(i, i % 100) for i in range(market_count)
+    ]
+    start = time.perf_counter()
+    framework.run()
+    elapsed = time.perf_counter() - start
+    return elapsed / (market_count * UPDATES_PER_MARKET)
+
+
+if __name__ == "__main__":
+    for market_count in (2, 10, 50, 100, 200):
+        per_update = run(market_count)
+        print(
+            "{0:>4} markets: {1:.2f}µs per update".format(
+                market_count, per_update * 1e6
+            )
+        )
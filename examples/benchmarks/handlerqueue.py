@@ -0,0 +1,57 @@
+"""
+Benchmark handler queue throughput (events per
+second) with 1, 4 and 16 producer threads and
+a single consumer, `queue.Queue` with a get per
+event against the batched `HandlerQueue`.
+
+    python examples/benchmarks/handlerqueue.py
+"""
+import time
+import queue
+import threading
+
+from flumine.events.handlerqueue import HandlerQueue
+
+EVENTS = 400000
+
+
+def consume_queue(q: queue.Queue, total: int) -> None:
+    for _ in range(total):
+        q.get()
+
+
+def consume_handler_queue(q: HandlerQueue, total: int) -> None:
+    count = 0
+    while count < total:
+        count += len(q.get_batch())
+
+
+def run(q, consumer, producers: int) -> float:
+    per_producer = EVENTS // producers
+    total = per_producer * producers
+
+    def producer():
+        put = q.put
+        for i in range(per_producer):
+            put(i)
+
+    threads = [threading.Thread(target=producer) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    consumer(q, total)
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return total / elapsed
+
+
+if __name__ == "__main__":
+    for producers in (1, 4, 16):
+        fifo = run(queue.Queue(), consume_queue, producers)
+        batched = run(HandlerQueue(), consume_handler_queue, producers)
+        print(
+            "{0:>2} producers: queue.Queue {1:,.0f}/s, HandlerQueue {2:,.0f}/s ({3:.1f}x)".format(
+                producers, fifo, batched, batched / fifo
+            )
+        )
@@ -0,0 +1,57 @@
+"""
+Benchmark replaying a historic market file from
+the raw text/bz2 file against the compiled binary
+replay cache (`config.historic_replay_cache_dir`).
+
+    python examples/benchmarks/replaycache.py tests/resources/SELF-1.181223995
+"""
+import os
+import bz2
+import sys
+import time
+import logging
+import tempfile
+from unittest import mock
+
+from flumine import config
+from flumine.streams.historicalstream import HistoricalStream, get_replay_cache
+
+logging.disable(logging.CRITICAL)
+
+REPEAT = 3
+
+
+def replay(file_path: str) -> float:
+    best = None
+    for _ in range(REPEAT):
+        stream = HistoricalStream(
+            mock.Mock(), 1, None, None, file_path, {}, output_queue=False
+        )
+        start = time.perf_counter()
+        for _ in stream.create_generator()():
+            pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    file_path = sys.argv[1]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bz2_path = os.path.join(tmp_dir, os.path.basename(file_path) + ".bz2")
+        with open(file_path, "rb") as f, open(bz2_path, "wb") as w:
+            w.write(bz2.compress(f.read()))
+        cache_dir = os.path.join(tmp_dir, "cache")
+        for path in (file_path, bz2_path):
+            config.historic_replay_cache_dir = None
+            text = replay(path)
+            start = time.perf_counter()
+            get_replay_cache(path, cache_dir)
+            compiled = time.perf_counter() - start
+            config.historic_replay_cache_dir = cache_dir
+            cache = replay(path)
+            print(
+                "{0}: text {1:.3f}s, replay cache {2:.3f}s ({3:.0%}), compile {4:.3f}s".format(
+                    os.path.basename(path), text, cache, cache / text, compiled
+                )
+            )
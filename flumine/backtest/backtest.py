@@ -1,10 +1,15 @@
+import heapq
 import logging
+import itertools
 from collections import defaultdict
 
-from .utils import SimulatedDateTime
+from .utils import PendingPackages
+from .parallel import run_processes
+from .sweep import ParameterSweep
 from ..baseflumine import BaseFlumine
+from ..clock import SimulatedClock
 from ..events import events
-from .. import utils
+from .. import utils, config
 from ..clients import ExchangeType
 from ..exceptions import RunError
 from ..order.order import OrderTypes
@@ -23,94 +28,132 @@ class FlumineBacktest(BaseFlumine):
 
     def __init__(self, client):
         super(FlumineBacktest, self).__init__(client)
-        self.simulated_datetime = SimulatedDateTime()
-        self.handler_queue = []
+        self.clock = SimulatedClock()
+        self.handler_queue = PendingPackages()
 
-    def run(self) -> None:
+    def run(self, processes: int = None, markets_per_process: int = 8) -> None:
+        """
+        :param processes: Number of worker processes, markets are
+            split into jobs and processed in parallel if > 1
+        :param markets_per_process: Max markets processed per
+            worker before it is recycled (event groups are kept together)
+        """
         if self.client.EXCHANGE != ExchangeType.SIMULATED:
             raise RunError(
                 "Incorrect client provided, only a Simulated client can be used when backtesting"
             )
+        if config.evict_closed_markets and not self._logging_controls:
+            logger.warning(
+                "Closed markets will be evicted without a logging control to receive results"
+            )
         with self:
-            with self.simulated_datetime:
-                """
-                list of either single stream or complete events depending
-                on event_processing flag:
-                   single: {None: [<Stream 1>], [<Stream 2>, ..]}
-                   event: {123: [<Stream 1>, <Stream 2>, ..], 456: [..]}
-                Event data to be muxed/processed chronologically as per
-                live rather than single which is per market in isolation.
-                """
-                event_streams = defaultdict(list)  # eventId: [<Stream>, ..]
-                for stream in self.streams:
-                    event_id = stream.event_id if stream.event_processing else None
-                    event_streams[event_id].append(stream)
-
-                for event_id, streams in event_streams.items():
-                    if event_id and len(streams) > 1:
-                        logger.info(
-                            "Starting historical event '{0}'".format(event_id),
-                            extra={
-                                "event_id": event_id,
-                                "markets": [s.market_filter for s in streams],
-                            },
-                        )
-                        self.simulated_datetime.reset_real_datetime()
-                        # create cycles
-                        cycles = []  # [[epoch, [MarketBook], gen], ..]
-                        for stream in streams:
-                            stream_gen = stream.create_generator()()
-                            market_book = next(stream_gen)
-                            publish_time_epoch = market_book[0].publish_time_epoch
-                            cycles.append([publish_time_epoch, market_book, stream_gen])
-                        # process cycles
-                        while cycles:
-                            # order by epoch
-                            cycles.sort(key=lambda x: x[0])
-                            # get current
-                            _, market_book, stream_gen = cycles.pop(0)
-                            # process current
-                            self._process_market_books(
-                                events.MarketBookEvent(market_book)
-                            )
-                            # gen next
-                            try:
-                                market_book = next(stream_gen)
-                            except StopIteration:
-                                continue
-                            publish_time_epoch = market_book[0].publish_time_epoch
-                            # add back
-                            cycles.append([publish_time_epoch, market_book, stream_gen])
-                        self.handler_queue.clear()
-                        logger.info("Completed historical event '{0}'".format(event_id))
-                    else:
-                        for stream in streams:
-                            logger.info(
-                                "Starting historical market '{0}'".format(
-                                    stream.market_filter
-                                ),
-                                extra={"market": stream.market_filter},
-                            )
-                            self.simulated_datetime.reset_real_datetime()
-                            stream_gen = stream.create_generator()
-                            for event in stream_gen():
-                                self._process_market_books(
-                                    events.MarketBookEvent(event)
-                                )
-                            self.handler_queue.clear()
-                            logger.info(
-                                "Completed historical market '{0}'".format(
-                                    stream.market_filter
-                                )
-                            )
+            if processes and processes > 1:
+                run_processes(self, processes, markets_per_process)
                 self._process_end_flumine()
-                logger.info("Backtesting complete")
+            else:
+                with self.clock:
+                    self._process_streams(self.streams)
+                    self._process_end_flumine()
+            logger.info("Backtesting complete")
+
+    def add_sweep(
+        self, strategy_class, variants: list, name: str = None, **kwargs
+    ) -> ParameterSweep:
+        """
+        Add a strategy variant per params dict in variants,
+        markets are parsed once and fanned out to each variant,
+        use `ParameterSweep.results()` once complete.
+        """
+        sweep = ParameterSweep(self, strategy_class, variants, name=name, **kwargs)
+        sweep.add()
+        return sweep
+
+    def _process_streams(self, streams) -> None:
+        """
+        list of either single stream or complete events depending
+        on event_processing flag:
+           single: {None: [<Stream 1>], [<Stream 2>, ..]}
+           event: {123: [<Stream 1>, <Stream 2>, ..], 456: [..]}
+        Event data to be muxed/processed chronologically as per
+        live rather than single which is per market in isolation.
+        """
+        event_streams = defaultdict(list)  # eventId: [<Stream>, ..]
+        for stream in streams:
+            event_id = stream.event_id if stream.event_processing else None
+            event_streams[event_id].append(stream)
+
+        for event_id, streams in event_streams.items():
+            if event_id and len(streams) > 1:
+                logger.info(
+                    "Starting historical event '{0}'".format(event_id),
+                    extra={
+                        "event_id": event_id,
+                        "markets": [s.market_filter for s in streams],
+                    },
+                )
+                self.clock.reset()
+                # create cycles (heap ordered by epoch, ties
+                # broken by insertion order to keep mux stable)
+                cycles = []  # [(epoch, seq, [MarketBook], gen), ..]
+                sequence = itertools.count()
+                for stream in streams:
+                    stream_gen = stream.create_generator()()
+                    market_book = next(stream_gen)
+                    publish_time_epoch = market_book[0].publish_time_epoch
+                    cycles.append(
+                        (
+                            publish_time_epoch,
+                            next(sequence),
+                            market_book,
+                            stream_gen,
+                        )
+                    )
+                heapq.heapify(cycles)
+                # process cycles
+                while cycles:
+                    # get current
+                    _, _, market_book, stream_gen = cycles[0]
+                    # process current
+                    self._process_market_books(events.MarketBookEvent(market_book))
+                    # gen next
+                    try:
+                        market_book = next(stream_gen)
+                    except StopIteration:
+                        heapq.heappop(cycles)
+                        continue
+                    publish_time_epoch = market_book[0].publish_time_epoch
+                    # add back
+                    heapq.heapreplace(
+                        cycles,
+                        (
+                            publish_time_epoch,
+                            next(sequence),
+                            market_book,
+                            stream_gen,
+                        ),
+                    )
+                self.handler_queue.clear()
+                logger.info("Completed historical event '{0}'".format(event_id))
+            else:
+                for stream in streams:
+                    logger.info(
+                        "Starting historical market '{0}'".format(stream.market_filter),
+                        extra={"market": stream.market_filter},
+                    )
+                    self.clock.reset()
+                    stream_gen = stream.create_generator()
+                    for event in stream_gen():
+                        self._process_market_books(events.MarketBookEvent(event))
+                    self.handler_queue.clear()
+                    logger.info(
+                        "Completed historical market '{0}'".format(stream.market_filter)
+                    )
 
     def _process_market_books(self, event: events.MarketBookEvent) -> None:
         # todo DRY!
         for market_book in event.event:
             market_id = market_book.market_id
-            self.simulated_datetime(market_book.publish_time)
+            self.clock(market_book.publish_time_epoch)
 
             # check if there are orders to process (limited to current market only)
             if self.handler_queue:
@@ -139,7 +182,9 @@ class FlumineBacktest(BaseFlumine):
             if market.blotter.active:
                 self._process_backtest_orders(market)
 
-            for strategy in self.strategies:
+            for strategy in self.strategies.stream_strategies(
+                market_book.streaming_unique_id
+            ):
                 if utils.call_strategy_error_handling(
                     strategy.check_market, market, market_book
                 ):
@@ -147,6 +192,15 @@ class FlumineBacktest(BaseFlumine):
                         strategy.process_market_book, market, market_book
                     )
 
+    def _process_close_market(self, event: events.CloseMarketEvent) -> None:
+        super(FlumineBacktest, self)._process_close_market(event)
+        if config.evict_closed_markets:
+            # results have been sent to the logging controls
+            # so all market state can now be released
+            market = self.markets.markets.get(event.event.market_id)
+            if market and market.closed:
+                self._remove_market(market)
+
     def process_order_package(self, order_package) -> None:
         # place in pending list (wait for latency+delay)
         self.handler_queue.append(order_package)
@@ -172,21 +226,29 @@ class FlumineBacktest(BaseFlumine):
                     if order.current_order.status == "EXECUTION_COMPLETE":
                         order.execution_complete()
                         blotter.complete_order(order)
-        for strategy in self.strategies:
-            strategy_orders = blotter.strategy_orders(strategy)
-            utils.call_process_orders_error_handling(strategy, market, strategy_orders)
+        changed_orders = defaultdict(list)  # {strategy: [orders]}
+        for order in blotter.pop_changed_orders():
+            if order.changed:
+                order.changed = False
+                changed_orders[order.trade.strategy].append(order)
+        self._process_strategy_orders(market, changed_orders)
 
     def _check_pending_packages(self, market_id: str) -> None:
-        processed = []
-        for order_package in self.handler_queue:
-            if (
-                order_package.market_id == market_id
-                and order_package.elapsed_seconds > order_package.simulated_delay
-            ):
-                order_package.client.execution.handler(order_package)
-                processed.append(order_package)
-        for p in processed:
-            self.handler_queue.remove(p)
+        for order_package in self.handler_queue.pop_due(market_id):
+            order_package.client.execution.handler(order_package)
+
+    @property
+    def info(self) -> dict:
+        # stream count rather than list as backtests can have 1m+ streams
+        return {
+            "client": self.client.info,
+            "markets": {
+                "market_count": len(self.markets),
+                "open_market_count": len(self.markets.open_market_ids),
+            },
+            "stream_count": len(self.streams),
+            "logging_controls": self._logging_controls,
+        }
 
     def __repr__(self) -> str:
         return "<FlumineBacktest>"
@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import datetime
+import logging
+from typing import Optional, Union
+from betfairlightweight.resources.baseresource import BaseResource
+from betfairlightweight.compat import json
+
+from ..streams.historicalstream import open_historic_file, split_archive_path
+
+logger = logging.getLogger(__name__)
+
+# marketDefinition key: index column
+COLUMNS = {
+    "eventId": "event_id",
+    "eventTypeId": "event_type_id",
+    "marketType": "market_type",
+    "countryCode": "country_code",
+    "venue": "venue",
+    "marketTime": "market_time",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    market_id TEXT,
+    event_id TEXT,
+    event_type_id TEXT,
+    market_type TEXT,
+    country_code TEXT,
+    venue TEXT,
+    market_time REAL
+)
+"""
+
+
+def _get_path(market: Union[str, tuple]) -> str:
+    if isinstance(market, tuple):
+        market = market[0]
+    return os.path.abspath(market)
+
+
+def _get_mtime(path: str) -> int:
+    # tar members are keyed on the archive mtime
+    archive_path, _ = split_archive_path(path)
+    return os.stat(archive_path or path).st_mtime_ns
+
+
+def _to_epoch(value: Union[str, datetime.datetime, None]) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = BaseResource.strip_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def read_file_md(path: str) -> tuple:
+    """Returns index row values from the first
+    line marketDefinition of a historic file.
+    """
+    with open_historic_file(path, background=False) as f:
+        first_line = f.readline()
+    mc = json.loads(first_line).get("mc") if first_line else None
+    if not mc or not isinstance(mc, list):
+        return (None,) * (len(COLUMNS) + 1)
+    md = mc[0].get("marketDefinition", {})
+    values = [mc[0].get("id")]
+    for key, column in COLUMNS.items():
+        value = md.get(key)
+        if column == "market_time":
+            value = _to_epoch(value)
+        values.append(value)
+    return tuple(values)
+
+
+class MarketIndex:
+    """
+    Persistent and incremental index of historic
+    market file metadata (first line marketDefinition)
+    keyed by path and mtime, files are only read when
+    new or modified. Defaults to an in memory index,
+    set `config.historic_market_index` to persist.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute(SCHEMA)
+
+    def update(self, markets: list) -> int:
+        """Index new/modified files, returns
+        number of files read.
+        """
+        indexed = dict(self._conn.execute("SELECT path, mtime FROM markets"))
+        rows = []
+        for market in markets:
+            path = _get_path(market)
+            mtime = _get_mtime(path)
+            if indexed.get(path) != mtime:
+                rows.append((path, mtime) + read_file_md(path))
+                indexed[path] = mtime
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO markets VALUES ({0})".format(
+                        ",".join("?" * (len(COLUMNS) + 3))
+                    ),
+                    rows,
+                )
+            logger.info(
+                "Market index updated",
+                extra={"index": self.path, "files_read": len(rows)},
+            )
+        return len(rows)
+
+    def get(self, market: Union[str, tuple]) -> dict:
+        """Returns file metadata, file indexed if required"""
+        path = _get_path(market)
+        row = self._conn.execute(
+            "SELECT * FROM markets WHERE path = ? AND mtime = ?",
+            (path, _get_mtime(path)),
+        ).fetchone()
+        if row is None:
+            self.update([market])
+            row = self._conn.execute(
+                "SELECT * FROM markets WHERE path = ?", (path,)
+            ).fetchone()
+        md = dict(row)
+        if md["market_time"] is not None:
+            md["market_time"] = datetime.datetime.utcfromtimestamp(md["market_time"])
+        return md
+
+    def filter(
+        self,
+        markets: list = None,
+        market_types: list = None,
+        country_codes: list = None,
+        event_ids: list = None,
+        venues: list = None,
+        market_start_time: dict = None,
+    ) -> list:
+        """Returns markets matching the filters in a single
+        query, files missing a value are not filtered (as
+        per get_file_md). If markets is None all indexed
+        paths are queried.
+
+        :param market_start_time: {"from": .., "to": ..} str or datetime (UTC)
+        """
+        where, params = [], []
+        for column, values in (
+            ("market_type", market_types),
+            ("country_code", country_codes),
+            ("event_id", event_ids),
+            ("venue", venues),
+        ):
+            if values:
+                where.append(
+                    "({0} IS NULL OR {0} IN ({1}))".format(
+                        column, ",".join("?" * len(values))
+                    )
+                )
+                params.extend(str(v) for v in values)
+        if market_start_time:
+            for key, op in (("from", ">="), ("to", "<=")):
+                epoch = _to_epoch(market_start_time.get(key))
+                if epoch is not None:
+                    where.append(
+                        "(market_time IS NULL OR market_time {0} ?)".format(op)
+                    )
+                    params.append(epoch)
+        if markets is not None:
+            paths = {_get_path(market) for market in markets}
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS selected (path TEXT PRIMARY KEY)"
+                )
+                self._conn.execute("DELETE FROM selected")
+                self._conn.executemany(
+                    "INSERT INTO selected VALUES (?)", ((p,) for p in paths)
+                )
+            where.append("path IN (SELECT path FROM selected)")
+        sql = "SELECT path FROM markets"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        matched = {row[0] for row in self._conn.execute(sql, params)}
+        if markets is None:
+            return sorted(matched)
+        return [m for m in markets if _get_path(m) in matched]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM markets").fetchone()[0]
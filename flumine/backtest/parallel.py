@@ -0,0 +1,154 @@
+import io
+import pickle
+import logging
+import multiprocessing
+from collections import OrderedDict
+
+from ..events.events import EventType
+from ..markets.markets import Markets
+from ..strategy.strategy import BaseStrategy
+from ..clients.baseclient import BaseClient
+from ..streams.basestream import BaseStream
+from ..streams.historicalstream import HistoricalStream
+
+logger = logging.getLogger(__name__)
+
+# logging events created by the parent process only
+PARENT_EVENT_TYPES = (
+    EventType.CONFIG,
+    EventType.STRATEGY,
+    EventType.BALANCE,
+    EventType.TERMINATOR,
+)
+
+_framework = None  # forked copy of FlumineBacktest used by workers
+
+
+def create_jobs(streams, markets_per_process: int) -> list:
+    """Splits streams into jobs of stream ids whilst
+    keeping event groups (event_processing) and
+    duplicate market files in the same job:
+        [[stream_id, ..], ..]
+    """
+    groups = OrderedDict()  # {key: [stream_id, ..]}
+    for stream in streams:
+        if stream.event_processing and stream.event_id:
+            key = ("event", stream.event_id)
+        else:
+            key = ("market", stream.market_filter)
+        groups.setdefault(key, []).append(stream.stream_id)
+
+    jobs, job = [], []
+    for stream_ids in groups.values():
+        if job and len(job) + len(stream_ids) > markets_per_process:
+            jobs.append(job)
+            job = []
+        job.extend(stream_ids)
+    if job:
+        jobs.append(job)
+    return jobs
+
+
+class _ResultPickler(pickle.Pickler):
+    """Pickles framework objects shared with the
+    parent process by reference rather than value.
+    """
+
+    def persistent_id(self, obj):
+        if obj is _framework:
+            return "flumine", None
+        elif isinstance(obj, BaseStrategy):
+            return "strategy", obj.name_hash
+        elif isinstance(obj, (BaseStream, HistoricalStream)):
+            return "stream", obj.stream_id
+        elif isinstance(obj, BaseClient):
+            # forked so object ids match the parent process
+            return "client", id(obj)
+        return None
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    def __init__(self, file, framework, clients: dict):
+        super(_ResultUnpickler, self).__init__(file)
+        self.framework = framework
+        self.clients = clients
+        self.streams = {stream.stream_id: stream for stream in framework.streams}
+
+    def persistent_load(self, pid):
+        type_, key = pid
+        if type_ == "flumine":
+            return self.framework
+        elif type_ == "strategy":
+            return self.framework.strategies.hashes[key]
+        elif type_ == "stream":
+            return self.streams[key]
+        elif type_ == "client":
+            return self.clients[key]
+        raise pickle.UnpicklingError("Unknown persistent id: %s" % str(pid))
+
+
+def _run_job(stream_ids: list) -> bytes:
+    """Runs in a forked worker, markets/middleware are
+    reset so that only the markets from this job are
+    processed. Results are pickled with the framework,
+    strategies, streams and clients by reference,
+    clients are matched by id() which is unchanged
+    across the fork.
+    """
+    framework = _framework
+    framework.markets = Markets()
+    framework._logging_controls = []
+    framework._workers = []
+    for middleware in framework._market_middleware:
+        middleware.reset()
+    logging_events = []
+    framework.log_control = logging_events.append
+    stream_ids = set(stream_ids)
+    streams = [s for s in framework.streams if s.stream_id in stream_ids]
+    with framework.clock:
+        framework._process_streams(streams)
+    logging_events = [
+        e for e in logging_events if e.EVENT_TYPE not in PARENT_EVENT_TYPES
+    ]
+    f = io.BytesIO()
+    _ResultPickler(f, pickle.HIGHEST_PROTOCOL).dump(
+        (list(framework.markets), logging_events)
+    )
+    return f.getvalue()
+
+
+def run_processes(framework, processes: int, markets_per_process: int) -> None:
+    """Runs the framework streams across forked worker
+    processes, each worker is recycled after a job to
+    cap memory. Markets and logging events are merged
+    back into the parent framework on completion.
+    """
+    global _framework
+    jobs = create_jobs(framework.streams, markets_per_process)
+    logger.info(
+        "Starting backtest processes",
+        extra={
+            "processes": processes,
+            "markets_per_process": markets_per_process,
+            "jobs": len(jobs),
+        },
+    )
+    clients = {id(framework.client): framework.client}
+    for strategy in framework.strategies:
+        if strategy.client:
+            clients[id(strategy.client)] = strategy.client
+
+    _framework = framework
+    try:
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(processes, maxtasksperchild=1) as pool:
+            for result in pool.imap_unordered(_run_job, jobs):
+                markets, logging_events = _ResultUnpickler(
+                    io.BytesIO(result), framework, clients
+                ).load()
+                for market in markets:
+                    framework.markets.markets[market.market_id] = market
+                for event in logging_events:
+                    framework.log_control(event)
+    finally:
+        _framework = None
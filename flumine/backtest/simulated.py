@@ -1,5 +1,4 @@
 import logging
-import datetime
 from typing import List, Optional
 from betfairlightweight.resources.bettingresources import MarketBook, RunnerBook
 
@@ -8,9 +7,9 @@ from .utils import (
     SimulatedCancelResponse,
     SimulatedUpdateResponse,
 )
-from ..utils import get_price, wap
+from ..utils import get_price, get_runner_book
 from ..order.ordertype import OrderTypes
-from .. import config
+from .. import config, clock
 
 logger = logging.getLogger(__name__)
 
@@ -18,17 +17,39 @@ logger = logging.getLogger(__name__)
 class Simulated:
     """
     Class to hold `simulated` order
-    matching and status.
+    matching and status, matched totals
+    are kept as running sums and size
+    remaining is cached until a fill,
+    cancel, lapse or void.
     """
 
+    __slots__ = (
+        "order",
+        "average_price_matched",
+        "market_version",
+        "_matched",
+        "_matched_size",
+        "_matched_value",
+        "_size_matched",
+        "_size_cancelled",
+        "_size_lapsed",
+        "_size_voided",
+        "_size_remaining",
+        "_piq",
+        "_bsp_reconciled",
+    )
+
     def __init__(self, order):
         self.order = order
-        self.size_matched = 0
+        self._size_matched = 0
         self.average_price_matched = 0
-        self.matched = []  # [[publishTime, price, size]..]
-        self.size_cancelled = 0.0
-        self.size_lapsed = 0.0
-        self.size_voided = 0.0
+        self._matched = []  # [[publishTime, price, size]..]
+        self._matched_size = 0  # running sum of size
+        self._matched_value = 0  # running sum of price * size
+        self._size_cancelled = 0.0
+        self._size_lapsed = 0.0
+        self._size_voided = 0.0
+        self._size_remaining = None  # cached (size, size_remaining)
         self.market_version = None  # version at place so we can lapse if needed
         self._piq = 0.0
         self._bsp_reconciled = False
@@ -184,7 +205,7 @@ class Simulated:
             bet_id=str(bet_id),
             average_price_matched=self.average_price_matched,
             size_matched=self.size_matched,
-            placed_date=datetime.datetime.utcnow(),
+            placed_date=clock.utcnow(),
             error_code=error_code,
         )
 
@@ -206,7 +227,7 @@ class Simulated:
             return SimulatedCancelResponse(
                 status="SUCCESS",  # todo handle errors
                 size_cancelled=_size_cancelled,
-                cancelled_date=datetime.datetime.utcnow(),
+                cancelled_date=clock.utcnow(),
             )
         else:
             return SimulatedCancelResponse(
@@ -244,11 +265,9 @@ class Simulated:
             )
 
     def _get_runner(self, market_book: MarketBook) -> RunnerBook:
-        runner_dict = {
-            (runner.selection_id, runner.handicap): runner
-            for runner in market_book.runners
-        }
-        return runner_dict.get((self.order.selection_id, self.order.handicap))
+        return get_runner_book(
+            market_book, self.order.selection_id, self.order.handicap
+        )
 
     def _process_price_matched(
         self, publish_time: int, price: float, size: float, available: list
@@ -296,11 +315,13 @@ class Simulated:
                 if self.side == "BACK":
                     if actual_sp < _order_type.price:
                         self.order.execution_complete()
+                        self._changed()
                         return
                     size = _order_type.liability
                 else:
                     if actual_sp > _order_type.price:
                         self.order.execution_complete()
+                        self._changed()
                         return
                     size = round(
                         _order_type.liability / (actual_sp - 1), 2
@@ -380,21 +401,106 @@ class Simulated:
 
     def _update_matched(self, data: List) -> None:
         logger.debug("Simulated order {0} matched: {1}".format(self.order.id, data))
-        self.matched.append(data)
-        self.size_matched, self.average_price_matched = wap(self.matched)
+        self._matched.append(data)
+        self._matched_value += data[1] * data[2]
+        self._matched_size += data[2]
+        self._set_matched_totals()
+
+    def refresh_matched(self) -> None:
+        """Recalculate matched totals, required
+        if matched is modified in place"""
+        self._matched_value, self._matched_size = 0, 0
+        for match in self._matched:
+            self._matched_value += match[1] * match[2]
+            self._matched_size += match[2]
+        self._set_matched_totals()
+
+    def _set_matched_totals(self) -> None:
+        # as per utils.wap
+        if self._matched_size == 0 or self._matched_value == 0:
+            self.average_price_matched, self.size_matched = 0, 0
+        else:
+            self.average_price_matched = round(
+                self._matched_value / self._matched_size, 2
+            )
+            self.size_matched = round(self._matched_size, 2)  # calls _changed
+
+    @property
+    def matched(self) -> list:
+        return self._matched
+
+    @matched.setter
+    def matched(self, value: list) -> None:
+        self._matched = value
+        self.refresh_matched()
+
+    @property
+    def size_matched(self) -> float:
+        return self._size_matched
+
+    @size_matched.setter
+    def size_matched(self, value: float) -> None:
+        self._size_matched = value
+        self._changed()
+
+    @property
+    def size_cancelled(self) -> float:
+        return self._size_cancelled
+
+    @size_cancelled.setter
+    def size_cancelled(self, value: float) -> None:
+        self._size_cancelled = value
+        self._changed()
+
+    @property
+    def size_lapsed(self) -> float:
+        return self._size_lapsed
+
+    @size_lapsed.setter
+    def size_lapsed(self, value: float) -> None:
+        self._size_lapsed = value
+        self._changed()
+
+    @property
+    def size_voided(self) -> float:
+        return self._size_voided
+
+    @size_voided.setter
+    def size_voided(self, value: float) -> None:
+        self._size_voided = value
+        self._changed()
+
+    def _changed(self) -> None:
+        # fill/cancel/lapse/void
+        self._size_remaining = None
+        self.order.mark_changed()
+        if not config.simulated:
+            self.order_changed()
+
+    def order_changed(self) -> None:
+        """Notify paper trade order stream"""
+        stream = self.order.trade.client.simulated_order_stream
+        if stream:
+            stream.order_changed(self.order)
 
     @property
     def size_remaining(self) -> float:
-        if self.order.order_type.ORDER_TYPE == OrderTypes.LIMIT:
-            size = self.order.order_type.size or self.order.order_type.bet_target_size
-            return round(
+        order_type = self.order.order_type
+        if order_type.ORDER_TYPE == OrderTypes.LIMIT:
+            size = order_type.size or order_type.bet_target_size
+            cached = self._size_remaining
+            if cached is not None and cached[0] == size:
+                return cached[1]
+            size_remaining = round(
                 size
-                - self.size_matched
-                - self.size_cancelled
-                - self.size_lapsed
-                - self.size_voided,
+                - self._size_matched
+                - self._size_cancelled
+                - self._size_lapsed
+                - self._size_voided,
                 2,
             )
+            self._size_remaining = (size, size_remaining)
+            return size_remaining
         else:
             return 0.0
 
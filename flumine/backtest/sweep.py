@@ -0,0 +1,129 @@
+import copy
+import logging
+from collections import defaultdict
+from typing import Type
+
+from .. import config
+from ..controls.clientcontrols import MaxTransactionCount
+from ..strategy.strategy import BaseStrategy
+from ..utils import create_short_uuid
+
+logger = logging.getLogger(__name__)
+
+
+class ParameterSweep:
+    """
+    Backtest N parameter variants of a strategy
+    over a single parse of each market, strategies
+    sharing a market filter share the historical
+    stream so each MarketBook is fanned out to every
+    variant. Each variant has its own client (copies
+    of the framework client controls, transaction
+    count), blotter orders, exposure controls and
+    simulated matching (requires
+    `config.simulated_strategy_isolation`).
+    """
+
+    def __init__(
+        self,
+        framework,
+        strategy_class: Type[BaseStrategy],
+        variants: list,
+        name: str = None,
+        **kwargs
+    ):
+        """
+        :param framework: FlumineBacktest instance
+        :param strategy_class: Strategy class to create variants of
+        :param variants: List of param dicts, merged over kwargs
+        :param name: Name prefix (defaults to class name)
+        :param kwargs: Strategy kwargs shared by all variants
+        """
+        self.framework = framework
+        self.strategy_class = strategy_class
+        self.variants = variants
+        self.name = name or strategy_class.__name__
+        self.kwargs = kwargs
+        self.strategies = []  # [(strategy, params), ..]
+
+    def add(self) -> list:
+        """Create and add a strategy per variant"""
+        if not config.simulated_strategy_isolation:
+            logger.warning(
+                "simulated_strategy_isolation is disabled, sweep variants will share available volume"
+            )
+        for i, params in enumerate(self.variants):
+            strategy_kwargs = dict(self.kwargs, **params)
+            strategy_kwargs["name"] = "{0}_{1}".format(self.name, i)
+            strategy = self.strategy_class(**strategy_kwargs)
+            client = self._create_client()
+            self.framework.add_strategy(strategy, client=client)
+            self.strategies.append((strategy, params))
+        return [strategy for strategy, _ in self.strategies]
+
+    def _create_client(self):
+        # copy settings from main client but isolate controls
+        main_client = self.framework.client
+        client = copy.copy(main_client)
+        client.id = create_short_uuid()
+        client.commission_paid = 0
+        client.trading_controls = []
+        client.add_execution(self.framework)
+        client.update_account_details()
+        for control in main_client.trading_controls:
+            if type(control) is MaxTransactionCount:
+                control = MaxTransactionCount(self.framework, client)
+            else:
+                # copy of control state, bound to the variant client
+                control = copy.deepcopy(
+                    control,
+                    {id(self.framework): self.framework, id(main_client): client},
+                )
+            client.trading_controls.append(control)
+        if not any(
+            type(control) is MaxTransactionCount for control in client.trading_controls
+        ):
+            client.trading_controls.append(MaxTransactionCount(self.framework, client))
+        return client
+
+    def results(self) -> list:
+        """
+        Per variant P&L table, commission is calculated
+        per market on positive profit (as per Market.cleared).
+        Requires markets to be held in framework.markets
+        (not compatible with `config.evict_closed_markets`).
+        """
+        totals = {
+            strategy: {
+                "strategy": strategy.name,
+                "params": params,
+                "markets": 0,
+                "bet_count": 0,
+                "size_matched": 0,
+                "profit": 0,
+                "commission": 0,
+                "net_profit": 0,
+            }
+            for strategy, params in self.strategies
+        }
+        for market in self.framework.markets:
+            market_profit = defaultdict(float)
+            for order in market.blotter:
+                strategy = order.trade.strategy
+                if strategy not in totals or not order.size_matched:
+                    continue
+                row = totals[strategy]
+                row["bet_count"] += 1
+                row["size_matched"] += order.size_matched
+                market_profit[strategy] += order.simulated.profit
+            for strategy, profit in market_profit.items():
+                row = totals[strategy]
+                commission = max(profit * strategy.client.commission_base, 0)
+                row["markets"] += 1
+                row["profit"] += profit
+                row["commission"] += commission
+        for row in totals.values():
+            for key in ("size_matched", "profit", "commission"):
+                row[key] = round(row[key], 2)
+            row["net_profit"] = round(row["profit"] - row["commission"], 2)
+        return list(totals.values())
@@ -1,41 +1,58 @@
+import heapq
 import datetime
-from contextlib import contextmanager
+import itertools
 
-from .. import config
 
+class PendingPackages:
+    """
+    Pending order packages waiting on simulated
+    latency/delay, indexed by market and ordered
+    by due time (created + simulated_delay) so
+    only packages that are due are checked.
+    """
 
-class NewDateTime(datetime.datetime):
-    @classmethod
-    def utcnow(cls):
-        return config.current_time
-
-
-class SimulatedDateTime:
     def __init__(self):
-        self._real_datetime = None
-
-    def __call__(self, pt: datetime.datetime):
-        config.current_time = pt
-
-    def reset_real_datetime(self):
-        config.current_time = self._real_datetime.utcnow()
-
-    @contextmanager
-    def real_time(self):
-        datetime.datetime = self._real_datetime
-        try:
-            yield datetime.datetime
-        finally:
-            datetime.datetime = NewDateTime
-
-    def __enter__(self):
-        config.current_time = datetime.datetime.utcnow()
-        self._real_datetime = datetime.datetime
-        datetime.datetime = NewDateTime
-        return datetime.datetime
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        datetime.datetime = self._real_datetime
+        self._markets = {}  # {market_id: [(due (epoch ms), seq, order_package), ..]}
+        self._sequence = itertools.count()
+        self._count = 0
+
+    def append(self, order_package) -> None:
+        due = order_package._time_created + (order_package.simulated_delay or 0) * 1e3
+        heap = self._markets.setdefault(order_package.market_id, [])
+        heapq.heappush(heap, (due, next(self._sequence), order_package))
+        self._count += 1
+
+    def pop_due(self, market_id: str) -> list:
+        """Returns due packages for market in the
+        order they were added.
+        """
+        heap = self._markets.get(market_id)
+        if not heap:
+            return []
+        due = []
+        while heap:
+            order_package = heap[0][2]
+            if order_package.elapsed_seconds > (order_package.simulated_delay or 0):
+                due.append(heapq.heappop(heap))
+            else:
+                break
+        if not heap:
+            del self._markets[market_id]
+        self._count -= len(due)
+        due.sort(key=lambda x: x[1])
+        return [order_package for _, _, order_package in due]
+
+    def clear(self) -> None:
+        self._markets.clear()
+        self._count = 0
+
+    def __iter__(self):
+        pending = [p for heap in self._markets.values() for p in heap]
+        pending.sort(key=lambda x: x[1])
+        return iter([order_package for _, _, order_package in pending])
+
+    def __len__(self) -> int:
+        return self._count
 
 
 class SimulatedPlaceResponse:
@@ -1,13 +1,14 @@
 import time
-import queue
 import logging
 import threading
+from collections import defaultdict
 from typing import Type
 from betfairlightweight import resources
 
 from .strategy.strategy import Strategies, BaseStrategy
 from .streams.streams import Streams
 from .events import events
+from .events.handlerqueue import HandlerQueue, ConflatedQueue
 from .worker import BackgroundWorker
 from .clients.baseclient import BaseClient
 from .markets.markets import Markets
@@ -43,7 +44,10 @@ class BaseFlumine:
         self._running = False
 
         # FIFO queue
-        self.handler_queue = queue.Queue()
+        if config.conflate_market_books and not self.BACKTEST:
+            self.handler_queue = ConflatedQueue()
+        else:
+            self.handler_queue = HandlerQueue()
 
         # markets
         self.markets = Markets()
@@ -152,7 +156,9 @@ class BaseFlumine:
             for middleware in self._market_middleware:
                 utils.call_middleware_error_handling(middleware, market)
 
-            for strategy in self.strategies:
+            for strategy in self.strategies.stream_strategies(
+                market_book.streaming_unique_id
+            ):
                 if utils.call_strategy_error_handling(
                     strategy.check_market, market, market_book
                 ):
@@ -198,9 +204,8 @@ class BaseFlumine:
                     datum["_stream_id"] = stream_id
                     self.handler_queue.put(events.CloseMarketEvent(datum))
 
-            for strategy in self.strategies:
-                if stream_id in strategy.stream_ids:
-                    strategy.process_raw_data(clk, publish_time, datum)
+            for strategy in self.strategies.stream_strategies(stream_id):
+                strategy.process_raw_data(clk, publish_time, datum)
 
     def _process_market_catalogues(self, event: events.MarketCatalogueEvent) -> None:
         for market_catalogue in event.event:
@@ -219,21 +224,49 @@ class BaseFlumine:
 
     def _process_current_orders(self, event: events.CurrentOrdersEvent) -> None:
         # update state
+        market_ids = []
         if event.event:
-            process_current_orders(
+            market_ids = process_current_orders(
                 self.markets, self.strategies, event, self.log_control, self._add_market
             )
-        for market in self.markets:
-            if market.closed is False and market.blotter.active:
+        if all(strategy.process_orders_on_change for strategy in self.strategies):
+            # only markets with orders in the update
+            markets = [self.markets.markets.get(market_id) for market_id in market_ids]
+        else:
+            markets = self.markets
+        for market in markets:
+            if market and market.closed is False and market.blotter.active:
                 blotter = market.blotter
                 for order in blotter.live_orders:
                     if order.complete:
                         blotter.complete_order(order)
-                for strategy in self.strategies:
-                    strategy_orders = blotter.strategy_orders(strategy)
+                changed_orders = defaultdict(list)  # {strategy: [orders]}
+                for order in blotter.pop_changed_orders():
+                    if order.changed:
+                        order.changed = False
+                        changed_orders[order.trade.strategy].append(order)
+                self._process_strategy_orders(market, changed_orders)
+
+    def _process_strategy_orders(self, market, changed_orders: dict) -> None:
+        """Call process_orders for each strategy, strategies
+        with process_orders_on_change are only called if
+        they have changed orders in the market
+        """
+        blotter = market.blotter
+        for strategy in self.strategies:
+            if strategy.process_orders_on_change:
+                strategy_changed_orders = changed_orders.get(strategy)
+                if strategy_changed_orders:
                     utils.call_process_orders_error_handling(
-                        strategy, market, strategy_orders
+                        strategy,
+                        market,
+                        blotter.strategy_orders(strategy),
+                        strategy_changed_orders,
                     )
+            else:
+                utils.call_process_orders_error_handling(
+                    strategy, market, blotter.strategy_orders(strategy)
+                )
 
     def _process_custom_event(self, event: events.CustomEvent) -> None:
         try:
@@ -279,9 +312,8 @@ class BaseFlumine:
             market(market_book)
             market.blotter.process_closed_market(event.event)
 
-        for strategy in self.strategies:
-            if stream_id in strategy.stream_ids:
-                strategy.process_closed_market(market, event.event)
+        for strategy in self.strategies.stream_strategies(stream_id):
+            strategy.process_closed_market(market, event.event)
 
         if recorder is False:
             if self.BACKTEST or self.client.paper_trade:
@@ -356,7 +388,7 @@ class BaseFlumine:
 
     @property
     def info(self) -> dict:
-        return {
+        info = {
             "client": self.client.info,
             "markets": {
                 "market_count": len(self.markets),
@@ -366,6 +398,9 @@ class BaseFlumine:
             "logging_controls": self._logging_controls,
             "threads": threading.enumerate(),
         }
+        if isinstance(self.handler_queue, ConflatedQueue):
+            info["handler_queue"] = self.handler_queue.info
+        return info
 
     def __enter__(self):
         logger.info("Starting flumine", extra=self.info)
@@ -50,6 +50,7 @@ class BaseClient:
         self.commission_paid = 0
 
         self.execution = None  # set during flumine init
+        self.simulated_order_stream = None  # set if paper trading
         self.trading_controls = []
 
     def login(self) -> None:
@@ -0,0 +1,94 @@
+import time as _time
+import datetime
+import threading
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class RealClock:
+    """Live clock"""
+
+    @staticmethod
+    def time() -> float:
+        # epoch milliseconds
+        return _time.time() * 1e3
+
+    @staticmethod
+    def utcnow() -> datetime.datetime:
+        return datetime.datetime.utcnow()
+
+
+class SimulatedClock:
+    """
+    Backtest clock driven by MarketBook
+    publish_time_epoch, set as the flumine
+    clock for the current thread whilst used
+    as a context manager.
+    """
+
+    def __init__(self):
+        self._time = None  # epoch milliseconds
+        self._previous_clock = None
+
+    def __call__(self, publish_time_epoch: int) -> None:
+        self._time = publish_time_epoch
+
+    def reset(self) -> None:
+        # set to real time (e.g. start of market)
+        self._time = RealClock.time()
+
+    def time(self) -> float:
+        return self._time
+
+    def utcnow(self) -> datetime.datetime:
+        return from_epoch(self._time)
+
+    def __enter__(self):
+        self.reset()
+        self._previous_clock = set_clock(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        set_clock(self._previous_clock)
+        self._previous_clock = None
+
+
+class _ThreadClock(threading.local):
+    # per thread so that backtests can run in parallel threads
+    clock = RealClock()
+
+
+_local = _ThreadClock()
+
+
+def set_clock(clock) -> object:
+    """Set flumine clock (current thread), returns previous clock"""
+    previous, _local.clock = _local.clock, clock
+    return previous
+
+
+def get_clock():
+    return _local.clock
+
+
+def time() -> float:
+    """Current epoch milliseconds"""
+    return _local.clock.time()
+
+
+def utcnow() -> datetime.datetime:
+    return _local.clock.utcnow()
+
+
+def elapsed_seconds(epoch: float) -> float:
+    """Seconds since epoch milliseconds"""
+    return (_local.clock.time() - epoch) / 1e3
+
+
+def from_epoch(epoch: float) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(milliseconds=epoch)
+
+
+def to_epoch(dt: datetime.datetime) -> float:
+    """Epoch milliseconds from (naive UTC) datetime"""
+    return (dt - EPOCH).total_seconds() * 1e3
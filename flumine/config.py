@@ -14,14 +14,26 @@ hostname = customer_strategy_ref
 
 process_id = os.getpid()  # process id of app
 
-current_time = None  # used for backtesting
-
 raise_errors = False  # used for call_check_market / call_process_market_book
 
 max_execution_workers = 32  # max number of workers in execution thread pool
 
 async_place_orders = False  # async place orders
 
+# coalesce unprocessed MarketBooks in the handler queue (live/paper trading),
+# a newer MarketBook supersedes an older one for the same market
+conflate_market_books = False
+
+# historic file reading used for backtesting
+historic_buffer_size = 1024 * 1024  # bytes
+historic_background_read = False  # read/decompress in background thread
+historic_replay_cache_dir = None  # directory for compiled binary replay cache
+historic_market_index = None  # sqlite path for persistent market metadata index
+
+# remove closed markets when backtesting, orders/results
+# are only available via logging controls when enabled
+evict_closed_markets = False
+
 # latencies used for backtesting
 place_latency = 0.120
 cancel_latency = 0.170
@@ -29,3 +41,13 @@ update_latency = 0.150
 replace_latency = 0.280
 
 order_sep = "-"  # customer_order_ref separator
+
+
+def __getattr__(name: str):
+    # backwards compatibility (python 3.7+), current_time
+    # was removed in favour of flumine.clock.utcnow()
+    if name == "current_time":
+        from . import clock
+
+        return clock.utcnow()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
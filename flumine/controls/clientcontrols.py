@@ -5,6 +5,7 @@ from typing import Optional
 
 from ..order.orderpackage import BaseOrder, OrderPackageType
 from . import BaseControl
+from .. import clock
 from ..clients.baseclient import BaseClient
 
 logger = logging.getLogger(__name__)
@@ -57,7 +58,7 @@ class MaxTransactionCount(BaseControl):
             )
 
     def _check_hour(self) -> None:
-        now = datetime.datetime.utcnow()
+        now = clock.utcnow()
         next_hour = now + datetime.timedelta(hours=1)
         if self._next_hour is None:
             self._set_next_hour()
@@ -79,7 +80,7 @@ class MaxTransactionCount(BaseControl):
             self._set_next_hour()
 
     def _set_next_hour(self) -> None:
-        now = datetime.datetime.utcnow()
+        now = clock.utcnow()
         self._next_hour = (now + datetime.timedelta(hours=1)).replace(
             minute=0, second=0, microsecond=0
         )
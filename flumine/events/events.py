@@ -1,6 +1,7 @@
-import datetime
 from enum import Enum
 
+from .. import clock
+
 
 class EventType(Enum):
     CONFIG = "Config"
@@ -36,12 +37,12 @@ class BaseEvent:
     __slots__ = ["_time_created", "event", "callback"]
 
     def __init__(self, event):
-        self._time_created = datetime.datetime.utcnow()
+        self._time_created = clock.time()  # epoch ms
         self.event = event
 
     @property
     def elapsed_seconds(self):
-        return (datetime.datetime.utcnow() - self._time_created).total_seconds()
+        return clock.elapsed_seconds(self._time_created)
 
     def __str__(self):
         return "<{0} [{1}]>".format(self.EVENT_TYPE.name, self.QUEUE_TYPE.name)
@@ -0,0 +1,135 @@
+import queue
+import threading
+from collections import deque, defaultdict
+
+from .events import EventType
+
+
+class HandlerQueue:
+    """
+    Multi producer single consumer handler queue,
+    producers append to a deque (atomic, no lock)
+    and the consumer drains all ready events in a
+    single batch. A threading.Event is only used
+    to wake the consumer when the queue was empty.
+    """
+
+    def __init__(self):
+        self.queue = deque()
+        self._ready = threading.Event()
+
+    def put(self, item, block: bool = True, timeout: float = None) -> None:
+        self.queue.append(item)
+        if not self._ready.is_set():
+            self._ready.set()
+
+    def get_batch(self, timeout: float = None) -> list:
+        """Block until events are available then return
+        all of them, empty list on timeout"""
+        while True:
+            batch = self._drain()
+            if batch:
+                return batch
+            self._ready.clear()
+            # recheck, put may have been called before clear
+            batch = self._drain()
+            if batch:
+                return batch
+            if not self._ready.wait(timeout) and timeout is not None:
+                return self._drain()
+
+    def get(self, block: bool = True, timeout: float = None):
+        """Single event (queue.Queue compatible)"""
+        while True:
+            try:
+                return self.queue.popleft()
+            except IndexError:
+                if not block:
+                    raise queue.Empty
+            self._ready.clear()
+            if self.queue:
+                continue
+            if not self._ready.wait(timeout) and timeout is not None:
+                try:
+                    return self.queue.popleft()
+                except IndexError:
+                    raise queue.Empty
+
+    def _drain(self) -> list:
+        batch = []
+        popleft = self.queue.popleft
+        try:
+            for _ in range(len(self.queue)):
+                batch.append(popleft())
+        except IndexError:
+            pass
+        return batch
+
+    def qsize(self) -> int:
+        return len(self.queue)
+
+    def empty(self) -> bool:
+        return not self.queue
+
+
+class ConflatedQueue(queue.Queue):
+    """
+    Handler queue that coalesces MarketBooks, a
+    newer MarketBook for a market supersedes an
+    unprocessed older one (removed from its queued
+    MarketBookEvent), all other events are never
+    dropped. Conflated MarketBooks are marked as
+    such in streaming_update as the superseded
+    deltas are not included (processed as a full
+    update by the SimulatedMiddleware).
+    """
+
+    def _init(self, maxsize: int) -> None:
+        super(ConflatedQueue, self)._init(maxsize)
+        self._pending = {}  # {marketId: MarketBookEvent}
+        self.conflated_count = 0
+        self.conflated_markets = defaultdict(int)  # {marketId: count}
+
+    def _put(self, item) -> None:
+        if item.EVENT_TYPE == EventType.MARKET_BOOK:
+            for market_book in item.event:
+                market_id = market_book.market_id
+                pending_event = self._pending.get(market_id)
+                if pending_event is not None:
+                    # remove superseded MarketBook
+                    pending_books = pending_event.event
+                    for i, pending_book in enumerate(pending_books):
+                        if pending_book.market_id == market_id:
+                            del pending_books[i]
+                            break
+                    market_book.streaming_update = dict(
+                        market_book.streaming_update or {}, conflated=True
+                    )
+                    self.conflated_count += 1
+                    self.conflated_markets[market_id] += 1
+                self._pending[market_id] = item
+        self.queue.append(item)
+
+    def get_batch(self, timeout: float = None) -> list:
+        """Single event batch so that newer MarketBooks
+        can continue to supersede queued ones"""
+        try:
+            return [self.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+    def _get(self):
+        item = self.queue.popleft()
+        if item.EVENT_TYPE == EventType.MARKET_BOOK:
+            for market_book in item.event:
+                if self._pending.get(market_book.market_id) is item:
+                    del self._pending[market_book.market_id]
+        return item
+
+    @property
+    def info(self) -> dict:
+        with self.mutex:
+            return {
+                "queue_size": len(self.queue),
+                "conflated_count": self.conflated_count,
+            }
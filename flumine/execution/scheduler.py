@@ -0,0 +1,77 @@
+import time
+import heapq
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Timer heap processed by a single thread,
+    calls func(*args) once delay has elapsed
+    so that delayed (paper trade) execution
+    does not block a thread pool worker.
+    """
+
+    def __init__(self, name: str = "Scheduler"):
+        self.name = name
+        self._heap = []  # [(due, count, func, args)..]
+        self._count = 0  # tie breaker to keep insertion order
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def schedule(self, delay: float, func: Callable, *args) -> None:
+        if delay <= 0:
+            func(*args)
+            return
+        with self._condition:
+            self._count += 1
+            heapq.heappush(
+                self._heap, (time.monotonic() + delay, self._count, func, args)
+            )
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(
+                    name=self.name, target=self._run, daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._heap:
+                        timeout = self._heap[0][0] - time.monotonic()
+                        if timeout <= 0:
+                            _, _, func, args = heapq.heappop(self._heap)
+                            break
+                        self._condition.wait(timeout)
+                    elif self._running:
+                        self._condition.wait()
+                    else:
+                        self._thread = None
+                        return
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(
+                    "Scheduler error",
+                    extra={"scheduler": self.name, "error": e},
+                    exc_info=True,
+                )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop once all scheduled calls are processed"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+            thread = self._thread
+        if wait and thread:
+            thread.join()
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -1,8 +1,8 @@
-import time
 import requests
 from typing import Optional
 
 from .baseexecution import BaseExecution
+from .scheduler import Scheduler
 from .. import config
 from ..clients.clients import ExchangeType
 from ..order.orderpackage import BaseOrderPackage, OrderPackageType
@@ -12,6 +12,12 @@ class SimulatedExecution(BaseExecution):
 
     EXCHANGE = ExchangeType.SIMULATED
 
+    def __init__(self, flumine, max_workers: int = None):
+        super(SimulatedExecution, self).__init__(flumine, max_workers)
+        # paper trade delays (bet delay/latency) are held
+        # in the scheduler rather than sleeping in the pool
+        self._scheduler = Scheduler(name="SimulatedExecutionScheduler")
+
     def handler(self, order_package: BaseOrderPackage) -> None:
         """Only uses _thread_pool if paper_trade"""
         if order_package.package_type == OrderPackageType.PLACE:
@@ -26,15 +32,31 @@ class SimulatedExecution(BaseExecution):
             raise NotImplementedError()
 
         if order_package.client.paper_trade:
-            self._thread_pool.submit(func, order_package, None)
+            self._scheduler.schedule(
+                self._paper_trade_delay(order_package),
+                self._thread_pool.submit,
+                func,
+                order_package,
+                None,
+            )
         else:
             func(order_package, http_session=None)
 
+    @staticmethod
+    def _paper_trade_delay(order_package: BaseOrderPackage) -> float:
+        package_type = order_package.package_type
+        if package_type == OrderPackageType.PLACE:
+            return order_package.bet_delay + config.place_latency
+        elif package_type == OrderPackageType.CANCEL:
+            return config.cancel_latency
+        elif package_type == OrderPackageType.UPDATE:
+            return config.update_latency
+        else:  # todo should the cancel happen without a delay?
+            return order_package.bet_delay + config.replace_latency
+
     def execute_place(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(order_package.bet_delay + config.place_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         for order, instruction in zip(order_package, order_package.place_instructions):
             with order.trade:
@@ -53,11 +75,11 @@ class SimulatedExecution(BaseExecution):
         # update transaction counts
         order_package.client.add_transaction(len(order_package))
 
+        self._order_package_changed(order_package)
+
     def execute_cancel(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(config.cancel_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order in order_package:
@@ -79,11 +101,11 @@ class SimulatedExecution(BaseExecution):
         if failed_transaction_count:
             order_package.client.add_transaction(failed_transaction_count, failed=True)
 
+        self._order_package_changed(order_package)
+
     def execute_update(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(config.update_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order, instruction in zip(order_package, order_package.update_instructions):
@@ -104,13 +126,11 @@ class SimulatedExecution(BaseExecution):
         if failed_transaction_count:
             order_package.client.add_transaction(failed_transaction_count, failed=True)
 
+        self._order_package_changed(order_package)
+
     def execute_replace(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if (
-            order_package.client.paper_trade
-        ):  # todo should the cancel happen without a delay?
-            time.sleep(order_package.bet_delay + config.replace_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order, instruction in zip(
@@ -158,3 +178,16 @@ class SimulatedExecution(BaseExecution):
         order_package.client.add_transaction(len(order_package))
         if failed_transaction_count:
             order_package.client.add_transaction(failed_transaction_count, failed=True)
+
+        self._order_package_changed(order_package)
+
+    @staticmethod
+    def _order_package_changed(order_package: BaseOrderPackage) -> None:
+        # notify paper trade order stream
+        if order_package.client.paper_trade:
+            for order in order_package:
+                order.simulated.order_changed()
+
+    def shutdown(self):
+        self._scheduler.shutdown(wait=True)
+        super(SimulatedExecution, self).shutdown()
@@ -12,41 +12,33 @@ class Flumine(BaseFlumine):
         """
         Main run thread
         """
+        handlers = self._get_event_handlers()
         with self:
             while True:
-                event = self.handler_queue.get()
-                if event.EVENT_TYPE == EventType.TERMINATOR:
-                    self._process_end_flumine()
-                    break
-
-                elif event.EVENT_TYPE == EventType.MARKET_CATALOGUE:
-                    self._process_market_catalogues(event)
-
-                elif event.EVENT_TYPE == EventType.MARKET_BOOK:
-                    self._process_market_books(event)
-
-                elif event.EVENT_TYPE == EventType.RAW_DATA:
-                    self._process_raw_data(event)
-
-                elif event.EVENT_TYPE == EventType.CURRENT_ORDERS:
-                    self._process_current_orders(event)
-
-                elif event.EVENT_TYPE == EventType.CLEARED_MARKETS:
-                    self._process_cleared_markets(event)
-
-                elif event.EVENT_TYPE == EventType.CLEARED_ORDERS:
-                    self._process_cleared_orders(event)
-
-                elif event.EVENT_TYPE == EventType.CLOSE_MARKET:
-                    self._process_close_market(event)
-
-                elif event.EVENT_TYPE == EventType.CUSTOM_EVENT:
-                    self._process_custom_event(event)
-
-                else:
-                    logger.error("Unknown item in handler_queue: %s" % str(event))
-
-                del event
+                batch = self.handler_queue.get_batch()
+                for event in batch:
+                    if event.EVENT_TYPE == EventType.TERMINATOR:
+                        self._process_end_flumine()
+                        return
+                    handler = handlers.get(event.EVENT_TYPE)
+                    if handler:
+                        handler(event)
+                    else:
+                        logger.error("Unknown item in handler_queue: %s" % str(event))
+                del batch
+
+    def _get_event_handlers(self) -> dict:
+        # {EventType: handler} dispatch table
+        return {
+            EventType.MARKET_CATALOGUE: self._process_market_catalogues,
+            EventType.MARKET_BOOK: self._process_market_books,
+            EventType.RAW_DATA: self._process_raw_data,
+            EventType.CURRENT_ORDERS: self._process_current_orders,
+            EventType.CLEARED_MARKETS: self._process_cleared_markets,
+            EventType.CLEARED_ORDERS: self._process_cleared_orders,
+            EventType.CLOSE_MARKET: self._process_close_market,
+            EventType.CUSTOM_EVENT: self._process_custom_event,
+        }
 
     def _add_default_workers(self):
         ka_interval = min((self.client.betting_client.session_timeout / 2), 1200)
@@ -1,13 +1,10 @@
 import logging
-from typing import Iterable, Optional
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, Optional
 from collections import defaultdict
 
 from ..order.ordertype import OrderTypes
-from ..utils import (
-    calculate_unmatched_exposure,
-    calculate_matched_exposure,
-    STRATEGY_NAME_HASH_LENGTH,
-)
+from ..utils import STRATEGY_NAME_HASH_LENGTH
 from ..order.order import BaseOrder, OrderStatus
 
 logger = logging.getLogger(__name__)
@@ -16,6 +13,250 @@ logger = logging.getLogger(__name__)
 IMPLIED_COMMISSION_RATE = 0.03
 
 
+class PriceLevels:
+    """
+    Resting orders on a runner/side keyed by
+    price level, each level holds orders in
+    queue (placement) order.
+    """
+
+    __slots__ = ["prices", "levels"]
+
+    def __init__(self):
+        self.prices = []  # sorted
+        self.levels = {}  # {price: [Order,]}
+
+    def add(self, order) -> None:
+        price = order.order_type.price
+        try:
+            self.levels[price].append(order)
+        except KeyError:
+            self.levels[price] = [order]
+            insort(self.prices, price)
+
+    def remove(self, order) -> None:
+        price = order.order_type.price
+        try:
+            level = self.levels[price]
+            level.remove(order)
+        except (KeyError, ValueError):
+            return
+        if not level:
+            del self.levels[price]
+            del self.prices[bisect_left(self.prices, price)]
+
+    def ascending(self, max_price: float) -> Iterator:
+        """Orders at levels <= max_price, lowest first"""
+        levels = self.levels
+        for price in self.prices[: bisect_right(self.prices, max_price)]:
+            yield from levels[price]
+
+    def descending(self, min_price: float) -> Iterator:
+        """Orders at levels >= min_price, highest first"""
+        levels = self.levels
+        for price in reversed(self.prices[bisect_left(self.prices, min_price) :]):
+            yield from levels[price]
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels.values())
+
+
+class ExposureLedger:
+    """
+    Running exposure totals for a strategy/selection,
+    orders are flagged on change (status/fill/cancel/
+    void) and only their contribution is replaced when
+    exposures are next requested, O(changed orders)
+    rather than O(orders).
+    """
+
+    __slots__ = ["contributions", "invalid", "totals", "_changed_orders"]
+
+    # matched win/lose, unmatched win/lose, moc win/lose
+    EMPTY = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def __init__(self):
+        self.contributions = {}  # {Order.id: (6 floats)}
+        self.invalid = {}  # {Order.id: ORDER_TYPE} unexpected order types
+        self.totals = [0.0] * 6
+        self._changed_orders = {}  # {Order.id: Order}
+
+    def update(self, order) -> None:
+        # called on order change, can be from execution threads
+        self._changed_orders[order.id] = order
+
+    def _process_changed_orders(self) -> None:
+        changed_orders, totals = self._changed_orders, self.totals
+        while changed_orders:
+            order_id, order = changed_orders.popitem()
+            order_type = order.order_type.ORDER_TYPE
+            if order_type not in (
+                OrderTypes.LIMIT,
+                OrderTypes.LIMIT_ON_CLOSE,
+                OrderTypes.MARKET_ON_CLOSE,
+            ):
+                self.invalid[order_id] = order_type
+                continue
+            contribution = self.calculate(order)
+            previous = self.contributions.get(order_id, self.EMPTY)
+            if contribution != previous:
+                for i in range(6):
+                    totals[i] += contribution[i] - previous[i]
+                self.contributions[order_id] = contribution
+
+    @staticmethod
+    def calculate(order) -> tuple:
+        """Order contribution, as per utils.calculate_matched_exposure
+        and utils.calculate_unmatched_exposure"""
+        if order.status in (
+            OrderStatus.PENDING,
+            OrderStatus.VIOLATION,
+            OrderStatus.EXPIRED,
+        ):
+            return ExposureLedger.EMPTY
+        matched_win, matched_lose = 0.0, 0.0
+        unmatched_win, unmatched_lose = 0.0, 0.0
+        moc_win, moc_lose = 0.0, 0.0
+        order_type = order.order_type
+        if order_type.ORDER_TYPE == OrderTypes.LIMIT:
+            _size_matched = order.size_matched  # cache
+            if _size_matched:
+                if order.side == "BACK":
+                    matched_win = (order.average_price_matched - 1) * _size_matched
+                    matched_lose = -_size_matched
+                else:
+                    matched_win = (order.average_price_matched - 1) * -_size_matched
+                    matched_lose = _size_matched
+            if not order.complete:
+                _size_remaining = order.size_remaining  # cache
+                if order_type.price and _size_remaining:
+                    if order.side == "BACK":
+                        unmatched_lose = -_size_remaining
+                    else:
+                        unmatched_win = (order_type.price - 1) * -_size_remaining
+        elif order.side == "BACK":
+            moc_lose = -order_type.liability
+        else:
+            moc_win = -order_type.liability
+        return (
+            matched_win,
+            matched_lose,
+            unmatched_win,
+            unmatched_lose,
+            moc_win,
+            moc_lose,
+        )
+
+    def exposures(self, exclusion=None) -> dict:
+        if self._changed_orders:
+            self._process_changed_orders()
+        totals = self.totals
+        if exclusion is not None:
+            excluded = self.contributions.get(exclusion.id)
+            if excluded:
+                totals = [total - excluded[i] for i, total in enumerate(totals)]
+        for order_id, order_type in self.invalid.items():
+            if exclusion is None or order_id != exclusion.id:
+                raise ValueError("Unexpected order type: %s" % order_type)
+        matched_win, matched_lose = round(totals[0], 2), round(totals[1], 2)
+        unmatched_win, unmatched_lose = round(totals[2], 2), round(totals[3], 2)
+        moc_win, moc_lose = round(totals[4], 2), round(totals[5], 2)
+        return {
+            "matched_profit_if_win": matched_win,
+            "matched_profit_if_lose": matched_lose,
+            "worst_potential_unmatched_profit_if_win": unmatched_win,
+            "worst_potential_unmatched_profit_if_lose": unmatched_lose,
+            "worst_possible_profit_on_win": matched_win + unmatched_win + moc_win,
+            "worst_possible_profit_on_lose": matched_lose + unmatched_lose + moc_lose,
+        }
+
+
+def _order_status_key(order):
+    return order.status
+
+
+def _order_matched_key(order) -> bool:
+    return order.size_matched > 0
+
+
+class OrderIndex:
+    """
+    Orders grouped per strategy and strategy/selection
+    by key (e.g. status), orders are flagged on change
+    and regrouped when the index is next read. Groups
+    are insertion ordered dicts so that moving an
+    order is O(1), the ordered list is cached per group
+    until the group changes.
+    """
+
+    __slots__ = ["key", "groups", "keys", "sequence", "_sorted", "_changed_orders"]
+
+    def __init__(self, key):
+        self.key = key  # module level function (pickle)
+        # {(strategy, key)/(strategy, selectionId, handicap, key): {sequence: Order}}
+        self.groups = defaultdict(dict)
+        self.keys = {}  # {Order.id: key}
+        self.sequence = {}  # {Order.id: int} blotter insertion order
+        self._sorted = {}  # {group: [Order..]} blotter insertion order
+        self._changed_orders = {}  # {Order.id: Order}
+
+    def add(self, order) -> None:
+        self.sequence[order.id] = len(self.sequence)
+        self._changed_orders[order.id] = order
+
+    def update(self, order) -> None:
+        # called on order change, can be from execution threads
+        self._changed_orders[order.id] = order
+
+    def _process_changed_orders(self) -> None:
+        changed_orders, keys = self._changed_orders, self.keys
+        while changed_orders:
+            order_id, order = changed_orders.popitem()
+            key = self.key(order)
+            strategy, selection = order.trade.strategy, order.lookup[1:]
+            sequence = self.sequence[order_id]
+            try:
+                previous = keys[order_id]
+            except KeyError:
+                pass
+            else:
+                if previous == key:
+                    continue
+                self._remove((strategy, previous), sequence)
+                self._remove((strategy, *selection, previous), sequence)
+            self._add((strategy, key), sequence, order)
+            self._add((strategy, *selection, key), sequence, order)
+            keys[order_id] = key
+
+    def _add(self, group: tuple, sequence: int, order) -> None:
+        self.groups[group][sequence] = order
+        cached = self._sorted.get(group)
+        if cached is not None:
+            if not cached or self.sequence[cached[-1].id] < sequence:
+                cached.append(order)  # newest order, still sorted
+            else:
+                del self._sorted[group]
+
+    def _remove(self, group: tuple, sequence: int) -> None:
+        del self.groups[group][sequence]
+        self._sorted.pop(group, None)
+
+    def get(self, *group) -> list:
+        """Returns orders in group, blotter insertion order"""
+        if self._changed_orders:
+            self._process_changed_orders()
+        try:
+            cached = self._sorted[group]
+        except KeyError:
+            orders = self.groups.get(group)
+            if not orders:
+                return []
+            cached = self._sorted[group] = [
+                orders[sequence] for sequence in sorted(orders)
+            ]
+        return list(cached)
+
+
 class Blotter:
 
     """
@@ -38,9 +279,17 @@ class Blotter:
         # cached lists/dicts for faster lookup
         self._trades = defaultdict(list)  # {Trade.id: [Order,]}
         self._bet_id_lookup = {}  # {Order.bet_id: Order, }
-        self._live_orders = []
+        self._live_orders = {}  # {Order.id: Order}
         self._strategy_orders = defaultdict(list)
         self._strategy_selection_orders = defaultdict(list)
+        self._strategy_live_orders = defaultdict(dict)  # {strategy: {Order.id: Order}}
+        self._status_index = OrderIndex(_order_status_key)
+        self._matched_index = OrderIndex(_order_matched_key)
+        # {(selectionId, handicap, side): PriceLevels} limit orders until complete
+        self._resting_orders = {}
+        # {strategy: {(selectionId, handicap): ExposureLedger}}
+        self._exposure_ledgers = defaultdict(dict)
+        self._changed_orders = {}  # {Order.id: Order} pending process_orders
 
     def get_order_bet_id(self, bet_id: str) -> Optional[BaseOrder]:
         try:
@@ -55,12 +304,14 @@ class Blotter:
         matched_only: Optional[bool] = None,
     ) -> list:
         """Returns all orders related to a strategy."""
-        orders = self._strategy_orders[strategy]
         if order_status:
-            orders = [o for o in orders if o.status == order_status]
-        if matched_only:
-            orders = [o for o in orders if o.size_matched > 0]
-        return orders
+            orders = self._status_index.get(strategy, order_status)
+            if matched_only:
+                orders = [o for o in orders if o.size_matched > 0]
+            return orders
+        elif matched_only:
+            return self._matched_index.get(strategy, True)
+        return self._strategy_orders[strategy]
 
     def strategy_selection_orders(
         self,
@@ -71,16 +322,32 @@ class Blotter:
         matched_only: Optional[bool] = None,
     ) -> list:
         """Returns all orders related to a strategy selection."""
-        orders = self._strategy_selection_orders[(strategy, selection_id, handicap)]
         if order_status:
-            orders = [o for o in orders if o.status == order_status]
-        if matched_only:
-            orders = [o for o in orders if o.size_matched > 0]
-        return orders
+            orders = self._status_index.get(
+                strategy, selection_id, handicap, order_status
+            )
+            if matched_only:
+                orders = [o for o in orders if o.size_matched > 0]
+            return orders
+        elif matched_only:
+            return self._matched_index.get(strategy, selection_id, handicap, True)
+        return self._strategy_selection_orders[(strategy, selection_id, handicap)]
+
+    def strategy_live_orders(self, strategy) -> Iterable:
+        """Returns live orders related to a strategy (view,
+        orders cannot be completed whilst iterating)."""
+        return self._strategy_live_orders[strategy].values()
+
+    @property
+    def orders(self) -> Iterable:
+        """All orders (view, orders cannot be added
+        whilst iterating)."""
+        return self._orders.values()
 
     @property
     def live_orders(self) -> Iterable:
-        return iter(list(self._live_orders))
+        # copy as orders are completed whilst iterating
+        return iter(list(self._live_orders.values()))
 
     @property
     def has_live_orders(self) -> bool:
@@ -90,7 +357,7 @@ class Blotter:
         number_of_winners = len(
             [runner for runner in market_book.runners if runner.status == "WINNER"]
         )
-        for order in self:
+        for order in self._orders.values():
             for runner in market_book.runners:
                 if (order.selection_id, order.handicap) == (
                     runner.selection_id,
@@ -106,7 +373,7 @@ class Blotter:
             if order_id in self:
                 self[order_id].cleared_order = cleared_order
 
-        return [order for order in self]
+        return list(self._orders.values())
 
     """ position """
 
@@ -114,18 +381,15 @@ class Blotter:
         """Returns worst-case exposure for market, which is the maximum potential loss (negative),
         arising from the worst race outcome, or the minimum potential profit (positive).
         """
-        orders = self.strategy_orders(strategy)
-        runners = set([order.lookup for order in orders])
-        worst_possible_profits = [
-            self.get_exposures(strategy, lookup) for lookup in runners
-        ]
+        ledgers = self._exposure_ledgers[strategy]
+        worst_possible_profits = [ledger.exposures() for ledger in ledgers.values()]
         worst_possible_profits_on_loses = [
             wpp["worst_possible_profit_on_lose"] for wpp in worst_possible_profits
         ]
         differences = [
             wpp["worst_possible_profit_on_win"] - wpp["worst_possible_profit_on_lose"]
             for wpp in worst_possible_profits
-        ] + (market_book.number_of_active_runners - len(runners)) * [0]
+        ] + (market_book.number_of_active_runners - len(ledgers)) * [0]
         worst_differences = sorted(differences)[: market_book.number_of_winners]
         return sum(worst_possible_profits_on_loses) + sum(worst_differences)
 
@@ -144,68 +408,50 @@ class Blotter:
 
     def get_exposures(self, strategy, lookup: tuple, exclusion=None) -> dict:
         """Returns strategy/selection exposures as a dict."""
-        mb, ml = [], []  # matched bets, (price, size)
-        ub, ul = [], []  # unmatched bets, (price, size)
-        moc_win_liability = 0.0
-        moc_lose_liability = 0.0
-        for order in self.strategy_selection_orders(strategy, *lookup[1:]):
-            if order == exclusion:
-                continue
-            if order.status in [
-                OrderStatus.PENDING,
-                OrderStatus.VIOLATION,
-                OrderStatus.EXPIRED,
-            ]:
-                continue
-            if order.order_type.ORDER_TYPE == OrderTypes.LIMIT:
-                _size_matched = order.size_matched  # cache
-                if _size_matched:
-                    if order.side == "BACK":
-                        mb.append((order.average_price_matched, _size_matched))
-                    else:
-                        ml.append((order.average_price_matched, _size_matched))
-                if not order.complete:
-                    _size_remaining = order.size_remaining  # cache
-                    if order.order_type.price and _size_remaining:
-                        if order.side == "BACK":
-                            ub.append((order.order_type.price, _size_remaining))
-                        else:
-                            ul.append((order.order_type.price, _size_remaining))
-            elif order.order_type.ORDER_TYPE in (
-                OrderTypes.LIMIT_ON_CLOSE,
-                OrderTypes.MARKET_ON_CLOSE,
-            ):
-                if order.side == "BACK":
-                    moc_lose_liability -= order.order_type.liability
-                else:
-                    moc_win_liability -= order.order_type.liability
-            else:
-                raise ValueError(
-                    "Unexpected order type: %s" % order.order_type.ORDER_TYPE
-                )
-        matched_exposure = calculate_matched_exposure(mb, ml)
-        unmatched_exposure = calculate_unmatched_exposure(ub, ul)
-
-        worst_possible_profit_on_win = (
-            matched_exposure[0] + unmatched_exposure[0] + moc_win_liability
-        )
-        worst_possible_profit_on_lose = (
-            matched_exposure[1] + unmatched_exposure[1] + moc_lose_liability
-        )
-
-        return {
-            "matched_profit_if_win": matched_exposure[0],
-            "matched_profit_if_lose": matched_exposure[1],
-            "worst_potential_unmatched_profit_if_win": unmatched_exposure[0],
-            "worst_potential_unmatched_profit_if_lose": unmatched_exposure[1],
-            "worst_possible_profit_on_win": worst_possible_profit_on_win,
-            "worst_possible_profit_on_lose": worst_possible_profit_on_lose,
-        }
+        try:
+            ledger = self._exposure_ledgers[strategy][lookup[1:]]
+        except KeyError:
+            ledger = ExposureLedger()
+        return ledger.exposures(exclusion)
 
     """ getters / setters """
 
+    def resting_orders(
+        self, selection_id: int, handicap: float, side: str
+    ) -> Optional[PriceLevels]:
+        """Returns limit orders on a runner/side by price level."""
+        return self._resting_orders.get((selection_id, handicap, side))
+
+    def order_changed(self, order) -> None:
+        """Called on order status/size change (can be
+        from execution threads), exposures and indexes
+        are updated when next read."""
+        self._exposure_ledgers[order.trade.strategy][order.lookup[1:]].update(order)
+        self._status_index.update(order)
+        self._matched_index.update(order)
+        self._changed_orders[order.id] = order
+
+    def pop_changed_orders(self) -> list:
+        """Returns orders changed since last called (blotter
+        order), includes orders that are no longer live
+        e.g. voided after completion."""
+        changed_orders, orders = self._changed_orders, []
+        while changed_orders:
+            orders.append(changed_orders.popitem()[1])
+        sequence = self._status_index.sequence
+        orders.sort(key=lambda order: sequence[order.id])
+        return orders
+
     def complete_order(self, order) -> None:
-        self._live_orders.remove(order)
+        if self._live_orders.pop(order.id, None) is None:
+            return  # already complete
+        self._strategy_live_orders[order.trade.strategy].pop(order.id, None)
+        if order.order_type.ORDER_TYPE == OrderTypes.LIMIT:
+            price_levels = self._resting_orders.get(
+                (order.selection_id, order.handicap, order.side)
+            )
+            if price_levels:
+                price_levels.remove(order)
 
     def has_order(self, customer_order_ref: str) -> bool:
         return customer_order_ref in self._orders
@@ -219,12 +465,31 @@ class Blotter:
         self.active = True
         self._orders[customer_order_ref] = order
         self._bet_id_lookup[order.bet_id] = order
-        self._live_orders.append(order)
+        self._live_orders[order.id] = order
+        self._strategy_live_orders[order.trade.strategy][order.id] = order
         self._trades[order.trade.id].append(order)
         self._strategy_orders[order.trade.strategy].append(order)
         self._strategy_selection_orders[
             (order.trade.strategy, *order.lookup[1:])
         ].append(order)
+        ledgers = self._exposure_ledgers[order.trade.strategy]
+        try:
+            ledger = ledgers[order.lookup[1:]]
+        except KeyError:
+            ledger = ledgers[order.lookup[1:]] = ExposureLedger()
+        ledger.update(order)
+        self._status_index.add(order)
+        self._matched_index.add(order)
+        order.blotter = self
+        if order.changed:
+            self._changed_orders[order.id] = order
+        if order.order_type.ORDER_TYPE == OrderTypes.LIMIT:
+            key = (order.selection_id, order.handicap, order.side)
+            try:
+                self._resting_orders[key].add(order)
+            except KeyError:
+                price_levels = self._resting_orders[key] = PriceLevels()
+                price_levels.add(order)
 
     def __getitem__(self, customer_order_ref: str):
         return self._orders[customer_order_ref]
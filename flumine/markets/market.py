@@ -2,11 +2,16 @@ import datetime
 import logging
 from typing import Optional
 from collections import defaultdict
-from betfairlightweight.resources.bettingresources import MarketBook, MarketCatalogue
+from betfairlightweight.resources.bettingresources import (
+    MarketBook,
+    MarketCatalogue,
+    RunnerBook,
+)
 
-from .. import config
+from .. import config, clock
 from .blotter import Blotter
 from ..execution.transaction import Transaction
+from ..utils import get_runner_book
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +34,8 @@ class Market:
         self.flumine = flumine
         self.market_id = market_id
         self.closed = False
-        self.date_time_created = datetime.datetime.utcnow()
-        self.date_time_closed = None
+        self.date_time_created = clock.utcnow()
+        self.time_closed = None  # epoch ms
         self.market_book = market_book
         self.market_catalogue = market_catalogue
         self.update_market_catalogue = True
@@ -39,6 +44,9 @@ class Market:
         self.context = {"simulated": {}}  # data store (raceCard / scores etc)
         self.blotter = Blotter(market_id)
         self._transaction_id = 0
+        # cache
+        self._market_start_datetime = None
+        self._market_start_epoch = None
 
     def __call__(self, market_book: MarketBook):
         if self.market_book and market_book.version != self.market_book.version:
@@ -56,7 +64,7 @@ class Market:
 
     def close_market(self) -> None:
         self.closed = True
-        self.date_time_closed = datetime.datetime.utcnow()
+        self.time_closed = clock.time()
         logger.info(
             "Market {0} closed".format(self.market_id),
             extra=self.info,
@@ -99,6 +107,13 @@ class Market:
         with self.transaction() as t:
             return t.replace_order(order, new_price, market_version, force)
 
+    def get_runner_book(
+        self, selection_id: int, handicap: float = 0
+    ) -> Optional[RunnerBook]:
+        """Returns runner book from latest MarketBook"""
+        if self.market_book:
+            return get_runner_book(self.market_book, selection_id, handicap)
+
     @property
     def event(self) -> dict:
         event = defaultdict(list)
@@ -133,12 +148,30 @@ class Market:
 
     @property
     def seconds_to_start(self) -> float:
-        return (self.market_start_datetime - datetime.datetime.utcnow()).total_seconds()
+        return (self.market_start_epoch - clock.time()) / 1e3
+
+    @property
+    def date_time_closed(self) -> Optional[datetime.datetime]:
+        if self.time_closed:
+            return clock.from_epoch(self.time_closed)
+
+    @date_time_closed.setter
+    def date_time_closed(self, value: Optional[datetime.datetime]) -> None:
+        self.time_closed = clock.to_epoch(value) if value else None
 
     @property
     def elapsed_seconds_closed(self) -> Optional[float]:
-        if self.closed and self.date_time_closed:
-            return (datetime.datetime.utcnow() - self.date_time_closed).total_seconds()
+        if self.closed and self.time_closed:
+            return clock.elapsed_seconds(self.time_closed)
+
+    @property
+    def market_start_epoch(self) -> float:
+        """market_start_datetime as epoch milliseconds"""
+        market_start_datetime = self.market_start_datetime
+        if market_start_datetime is not self._market_start_datetime:
+            self._market_start_epoch = clock.to_epoch(market_start_datetime)
+            self._market_start_datetime = market_start_datetime
+        return self._market_start_epoch
 
     @property
     def market_start_datetime(self):
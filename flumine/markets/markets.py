@@ -10,6 +10,7 @@ logger = logging.getLogger(__name__)
 class Markets:
     def __init__(self):
         self._markets = {}  # marketId: <Market>
+        self._reconciled_orders = {}  # betId: <Order> (all markets)
 
     def add_market(self, market_id: str, market: Market) -> None:
         if market_id in self._markets:
@@ -23,6 +24,9 @@ class Markets:
         return market
 
     def remove_market(self, market_id: str) -> None:
+        if self._reconciled_orders:
+            for order in self._markets[market_id].blotter:
+                self._reconciled_orders.pop(order.bet_id, None)
         del self._markets[market_id].blotter
         del self._markets[market_id]
         logger.info("Market removed", extra={"market_id": market_id})
@@ -39,6 +43,15 @@ class Markets:
         blotter = self.markets[market_id].blotter
         return blotter.get_order_bet_id(bet_id)
 
+    def get_reconciled_order(self, bet_id: str) -> Optional[BetfairOrder]:
+        """Returns order previously reconciled with a
+        current order (bet id), single lookup across
+        all markets"""
+        return self._reconciled_orders.get(bet_id)
+
+    def add_reconciled_order(self, bet_id: str, order: BetfairOrder) -> None:
+        self._reconciled_orders[bet_id] = order
+
     @property
     def markets(self) -> dict:
         return self._markets
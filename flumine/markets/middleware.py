@@ -1,15 +1,24 @@
 import logging
+from typing import Optional
 from collections import defaultdict
 from betfairlightweight.resources.bettingresources import RunnerBook
 
 from ..order.order import OrderStatus, OrderTypes
-from ..utils import wap
 from .. import config
+from ..utils import get_runner_index
 
 logger = logging.getLogger(__name__)
 
 WIN_MINIMUM_ADJUSTMENT_FACTOR = 2.5
+# order status requiring simulated matching
+SIMULATED_STATUSES = (
+    OrderStatus.EXECUTABLE,
+    OrderStatus.CANCELLING,
+    OrderStatus.UPDATING,
+    OrderStatus.REPLACING,
+)
 PLACE_MINIMUM_ADJUSTMENT_FACTOR = 0  # todo implement correctly (https://en-betfair.custhelp.com/app/answers/detail/a_id/406)
+TRADED_TOTAL_TOLERANCE = 0.01  # traded ladder total vs runner total_matched
 
 
 class Middleware:
@@ -22,6 +31,10 @@ class Middleware:
     def remove_market(self, market) -> None:
         pass
 
+    def reset(self) -> None:
+        # clear market state (e.g. forked backtest worker)
+        pass
+
 
 class SimulatedMiddleware(Middleware):
     """
@@ -33,46 +46,80 @@ class SimulatedMiddleware(Middleware):
     def __init__(self):
         # {marketId: {(selectionId, handicap): RunnerAnalytics}}
         self.markets = defaultdict(dict)
+        # {marketId: {(selectionId, handicap), ..}} updated on last update
+        self._updated_runners = {}
         self._runner_removals = []
 
+    def reset(self) -> None:
+        self.markets.clear()
+        self._updated_runners.clear()
+        self._runner_removals.clear()
+
     def __call__(self, market) -> None:
-        market_analytics = self.markets[market.market_id]
-        runner_removals = []  # [(selectionId, handicap, adjustmentFactor)..]
-        # optimisation to only process a runner on an update
-        runner_updates = self._process_streaming_update(market.market_book)
-
-        for runner in market.market_book.runners:
-            if runner.status == "ACTIVE":
-                update = bool(runner.selection_id in runner_updates)
-                self._process_runner(market_analytics, runner, update)
-            elif runner.status == "REMOVED":
-                _removal = (
-                    runner.selection_id,
-                    runner.handicap,
-                    runner.adjustment_factor,
-                )
-                if _removal not in self._runner_removals:
-                    logger.warning(
-                        "Runner {0} ({2}) removed from market {3}".format(
-                            *_removal, market.market_id
+        market_id = market.market_id
+        market_book = market.market_book
+        market_analytics = self.markets[market_id]
+        # optimisation to only process runners in the update
+        runner_updates = self._process_streaming_update(market_book)
+        updated_runners = set()
+
+        if runner_updates is None:
+            runner_removals = []  # [(selectionId, handicap, adjustmentFactor)..]
+            for runner in market_book.runners:
+                if runner.status == "ACTIVE":
+                    self._process_runner(market_analytics, runner, True)
+                    updated_runners.add((runner.selection_id, runner.handicap))
+                elif runner.status == "REMOVED":
+                    _removal = (
+                        runner.selection_id,
+                        runner.handicap,
+                        runner.adjustment_factor,
+                    )
+                    if _removal not in self._runner_removals:
+                        logger.warning(
+                            "Runner {0} ({2}) removed from market {3}".format(
+                                *_removal, market_id
+                            )
                         )
+                        self._runner_removals.append(_removal)
+                        runner_removals.append(_removal)
+
+            for _removal in runner_removals:
+                self._process_runner_removal(market, *_removal)
+        elif runner_updates:
+            # runner status only changes on a marketDefinition
+            runner_index = get_runner_index(market_book)
+            for key in runner_updates:
+                runner = runner_index.get(key)
+                if runner and runner.status == "ACTIVE":
+                    self._process_runner(
+                        market_analytics, runner, True, runner_updates[key]
                     )
-                    self._runner_removals.append(_removal)
-                    runner_removals.append(_removal)
+                    updated_runners.add(key)
 
-        for _removal in runner_removals:
-            self._process_runner_removal(market, *_removal)
+        # reset runners not in this update
+        for key in self._updated_runners.get(market_id, ()):
+            if key not in updated_runners:
+                market_analytics[key](None, False)
+        self._updated_runners[market_id] = updated_runners
 
         market.context["simulated"] = market_analytics
         # process simulated orders
         if market.blotter.active:
-            self._process_simulated_orders(market, market_analytics)
+            if runner_updates is None:
+                self._process_simulated_orders(market, market_analytics)
+            else:
+                traded_runners = {
+                    key for key in updated_runners if market_analytics[key].traded
+                }
+                self._process_simulated_orders(market, market_analytics, traded_runners)
 
     def remove_market(self, market) -> None:
         try:
             del self.markets[market.market_id]
         except KeyError:
             pass
+        self._updated_runners.pop(market.market_id, None)
 
     def _process_runner_removal(
         self,
@@ -106,12 +153,9 @@ class SimulatedMiddleware(Middleware):
                         order.order_type.ORDER_TYPE == OrderTypes.MARKET_ON_CLOSE
                     ) and order.side == "LAY":
                         if market.market_type == "WIN":
-                            runner = [
-                                x
-                                for x in market.market_book.runners
-                                if x.selection_id == order.selection_id
-                                and x.handicap == order.handicap
-                            ][0]
+                            runner = market.get_runner_book(
+                                order.selection_id, order.handicap
+                            )
                             runner_adjustment_factor = runner.adjustment_factor
                             # See https://github.com/liampauling/flumine/issues/454
                             multiplier = 1 - (
@@ -119,6 +163,7 @@ class SimulatedMiddleware(Middleware):
                                 / (100 - runner_adjustment_factor)
                             )
                             order.order_type.liability *= multiplier
+                            order.mark_changed()
                             if order.average_price_matched:
                                 # We will get here if the NR is declared inplay
                                 order.current_order.size_matched = round(
@@ -135,6 +180,7 @@ class SimulatedMiddleware(Middleware):
                         elif market.market_type in {"PLACE", "OTHER_PLACE"}:
                             multiplier = (100 - removal_adjustment_factor) * 0.01
                             order.order_type.liability *= multiplier
+                            order.mark_changed()
                             if order.average_price_matched:
                                 # We will get here if the NR is declared inplay
                                 order.current_order.size_matched = round(
@@ -157,9 +203,7 @@ class SimulatedMiddleware(Middleware):
                             match[1] = self._calculate_reduction_factor(
                                 match[1], removal_adjustment_factor
                             )
-                        _, order.simulated.average_price_matched = wap(
-                            order.simulated.matched
-                        )
+                        order.simulated.refresh_matched()
                         logger.warning(
                             "Order adjusted due to non runner {0}".format(
                                 order.selection_id
@@ -168,20 +212,37 @@ class SimulatedMiddleware(Middleware):
                         )
 
     @staticmethod
-    def _process_streaming_update(market_book) -> list:
-        # return list of runners that have been updated
+    def _process_streaming_update(market_book) -> Optional[dict]:
+        """Returns {(selectionId, handicap): trd} of runners
+        that have been updated, None if all runners require
+        a full update (img/marketDefinition/conflated)
+        trd: raw traded changes, () if no change or None
+        if a full update is required (ladder cleared)
+        """
         update = market_book.streaming_update
-        if update.get("img") or update.get("marketDefinition"):
-            return [runner.selection_id for runner in market_book.runners]
-        else:
-            return [runner["id"] for runner in update.get("rc", [])]
+        if (
+            update.get("img")
+            or update.get("marketDefinition")
+            or update.get("conflated")  # deltas superseded in handler queue
+        ):
+            return None
+        runner_updates = {}
+        for runner_change in update.get("rc", []):
+            if "trd" not in runner_change:
+                trd = ()
+            else:
+                trd = runner_change["trd"] or None
+            runner_updates[(runner_change["id"], runner_change.get("hc", 0))] = trd
+        return runner_updates
 
     @staticmethod
     def _calculate_reduction_factor(price: float, adjustment_factor: float) -> float:
         price_adjusted = round(price * (1 - (adjustment_factor / 100)), 2)
         return max(price_adjusted, 1.01)  # min: 1.01
 
-    def _process_simulated_orders(self, market, market_analytics: dict) -> None:
+    def _process_simulated_orders(
+        self, market, market_analytics: dict, traded_runners: set = None
+    ) -> None:
         """
         #538 smart matching
           - isolation per order
@@ -190,47 +251,96 @@ class SimulatedMiddleware(Middleware):
             Prevent double counting of passive liquidity per strategy
           - isolation per instance
             Prevent double counting of passive liquidity on all orders regardless of strategy (interaction across strategies)
+
+        traded_runners: runners with traded volume on a
+        delta update, see `_process_traded_orders` (None
+        processes all orders)
         """
+        if traded_runners is not None:
+            self._process_traded_orders(market, market_analytics, traded_runners)
+            return
         # isolation per strategy (default)
         if config.simulated_strategy_isolation:
-            for strategy, orders in market.blotter._strategy_orders.items():
+            for strategy in market.flumine.strategies:
                 live_orders = [
                     o
-                    for o in orders
-                    if o.status
-                    in [
-                        OrderStatus.EXECUTABLE,
-                        OrderStatus.CANCELLING,
-                        OrderStatus.UPDATING,
-                        OrderStatus.REPLACING,
-                    ]
-                    and o.simulated
+                    for o in market.blotter.strategy_live_orders(strategy)
+                    if o.status in SIMULATED_STATUSES and o.simulated
                 ]
                 if live_orders:
-                    _lookup = {k: v.traded.copy() for k, v in market_analytics.items()}
+                    _lookup = {}  # {(selectionId, handicap): TradedView}
                     live_orders_sorted = self._sort_orders(live_orders)
                     for order in live_orders_sorted:
-                        runner_traded = _lookup[(order.selection_id, order.handicap)]
+                        runner_traded = self._get_traded_view(
+                            _lookup, market_analytics, order
+                        )
                         order.simulated(market.market_book, runner_traded)
         else:  # isolation per instance
             live_orders = list(market.blotter.live_orders)
             if live_orders:
-                _lookup = {k: v.traded.copy() for k, v in market_analytics.items()}
+                _lookup = {}
                 live_orders_sorted = self._sort_orders(live_orders)
                 for order in live_orders_sorted:
-                    if (
-                        order.status
-                        in [
-                            OrderStatus.EXECUTABLE,
-                            OrderStatus.CANCELLING,
-                            OrderStatus.UPDATING,
-                            OrderStatus.REPLACING,
-                        ]
-                        and order.simulated
-                    ):
-                        runner_traded = _lookup[(order.selection_id, order.handicap)]
+                    if order.status in SIMULATED_STATUSES and order.simulated:
+                        runner_traded = self._get_traded_view(
+                            _lookup, market_analytics, order
+                        )
                         order.simulated(market.market_book, runner_traded)
 
+    @staticmethod
+    def _get_traded_view(_lookup: dict, market_analytics: dict, order):
+        key = (order.selection_id, order.handicap)
+        try:
+            return _lookup[key]
+        except KeyError:
+            traded_view = _lookup[key] = TradedView(market_analytics[key].traded)
+            return traded_view
+
+    @staticmethod
+    def _process_traded_orders(market, market_analytics: dict, traded_runners: set):
+        """
+        Delta update, matching (and version/lapse) can only
+        change on a marketDefinition so only resting limit
+        orders at price levels that can match the traded
+        volume are processed, per runner in `_sort_orders`
+        order (lays highest first, backs lowest first) using
+        the blotter price levels. Orders yet to process BSP
+        reconciliation are also processed.
+        """
+        market_book = market.market_book
+        blotter = market.blotter
+        isolation = config.simulated_strategy_isolation
+        processed = set()
+        for selection_id, handicap in traded_runners:
+            runner_traded = market_analytics[(selection_id, handicap)].traded
+            orders = []
+            lay_orders = blotter.resting_orders(selection_id, handicap, "LAY")
+            if lay_orders:
+                orders.extend(lay_orders.descending(min(runner_traded)))
+            back_orders = blotter.resting_orders(selection_id, handicap, "BACK")
+            if back_orders:
+                orders.extend(back_orders.ascending(max(runner_traded)))
+            _lookup = {}  # {strategy: TradedView}
+            for order in orders:
+                if order.status in SIMULATED_STATUSES and order.simulated:
+                    group = order.trade.strategy if isolation else None
+                    try:
+                        traded = _lookup[group]
+                    except KeyError:
+                        traded = _lookup[group] = TradedView(runner_traded)
+                    order.simulated(market_book, traded)
+                    processed.add(order)
+        if market_book.bsp_reconciled:
+            for order in blotter.live_orders:
+                if (
+                    order not in processed
+                    and order.status in SIMULATED_STATUSES
+                    and order.simulated
+                    and order.simulated._bsp_reconciled is False
+                ):
+                    # unable to match traded so no volume required
+                    order.simulated(market_book, {})
+
     @staticmethod
     def _sort_orders(orders: list) -> list:
         # order by betId (default), side (Lay,Back) and then price
@@ -259,7 +369,10 @@ class SimulatedMiddleware(Middleware):
 
     @staticmethod
     def _process_runner(
-        market_analytics: dict, runner: RunnerBook, update: bool
+        market_analytics: dict,
+        runner: RunnerBook,
+        update: bool,
+        traded_update: Optional[list] = None,
     ) -> None:
         try:
             runner_analytics = market_analytics[(runner.selection_id, runner.handicap)]
@@ -267,7 +380,51 @@ class SimulatedMiddleware(Middleware):
             runner_analytics = market_analytics[
                 (runner.selection_id, runner.handicap)
             ] = RunnerAnalytics(runner)
-        runner_analytics(runner, update)
+        runner_analytics(runner, update, traded_update)
+
+
+class TradedView:
+    """
+    Copy on write view of RunnerAnalytics.traded
+    used to isolate traded volume consumed by
+    simulated orders, the traded dict is only
+    copied once volume is consumed.
+    """
+
+    __slots__ = ["_traded", "_copied"]
+
+    def __init__(self, traded: dict):
+        self._traded = traded
+        self._copied = False
+
+    def items(self):
+        return self._traded.items()
+
+    def get(self, key, default=None):
+        return self._traded.get(key, default)
+
+    def __getitem__(self, key):
+        return self._traded[key]
+
+    def __setitem__(self, key, value) -> None:
+        if not self._copied:
+            self._traded = self._traded.copy()
+            self._copied = True
+        self._traded[key] = value
+
+    def __iter__(self):
+        return iter(self._traded)
+
+    def __len__(self) -> int:
+        return len(self._traded)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TradedView):
+            other = other._traded
+        return self._traded == other
+
+    def __repr__(self) -> str:
+        return "<TradedView {0}>".format(self._traded)
 
 
 class RunnerAnalytics:
@@ -280,13 +437,20 @@ class RunnerAnalytics:
         self._p_v = {
             i["price"]: i["size"] for i in runner.ex.traded_volume
         }  # cached current volume
+        self._p_v_total = sum(self._p_v.values())  # cached total volume
 
-    def __call__(self, runner: RunnerBook, update: bool):
+    def __call__(
+        self, runner: RunnerBook, update: bool, traded_update: Optional[list] = None
+    ):
         if update:
             self.middle = self._calculate_middle(self._runner)  # use last update
             self.matched = self._calculate_matched(runner)
             _tv = runner.ex.traded_volume
-            if self._traded_volume == _tv:
+            if traded_update is not None:
+                self.traded = self._calculate_traded_update(
+                    traded_update, _tv, runner.total_matched
+                )
+            elif self._traded_volume == _tv:
                 self.traded = {}
             else:
                 self.traded = self._calculate_traded(_tv)
@@ -310,6 +474,47 @@ class RunnerAnalytics:
                 traded[key] = value
         # cache for next update
         self._p_v = c_v
+        self._p_v_total = sum(c_v.values())
+        return traded
+
+    def _calculate_traded_update(
+        self,
+        traded_update: list,
+        traded_volume: list,
+        total_matched: Optional[float] = None,
+    ) -> dict:
+        """Calculates traded from the raw streaming
+        trd changes ([[price, size], ..]) rather than
+        diffing the full traded ladder, resyncs if the
+        ladder/total no longer match (missed updates).
+        """
+        p_v, traded, total = self._p_v, {}, self._p_v_total
+        for price, size in traded_update:
+            value = p_v.get(price)
+            if size == 0:
+                if value is not None:
+                    del p_v[price]
+                    total -= value
+                continue
+            if value is None:
+                traded[price] = size
+                total += size
+            else:
+                new_value = size - value
+                if new_value > 0:
+                    traded[price] = round(new_value, 2)
+                total += new_value
+            p_v[price] = size
+        self._p_v_total = total
+        if len(p_v) != len(traded_volume) or (
+            total_matched is not None
+            and abs(total - total_matched) >= TRADED_TOTAL_TOLERANCE
+        ):
+            # missed updates (inactive listener) so resync
+            traded.update(self._calculate_traded(traded_volume))
+        if len(traded) > 1:
+            # ladder order
+            traded = dict(sorted(traded.items()))
         return traded
 
     @staticmethod
@@ -3,6 +3,7 @@ import uuid
 import logging
 import datetime
 import string
+import operator
 import collections
 from enum import Enum
 from typing import Union, Optional
@@ -14,7 +15,7 @@ from .ordertype import LimitOrder, LimitOnCloseOrder, MarketOnCloseOrder, OrderT
 from .responses import Responses
 from ..exceptions import OrderUpdateError
 from ..backtest.simulated import Simulated
-from .. import config
+from .. import config, clock
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,17 @@ VALID_BETFAIR_CUSTOMER_ORDER_REF_CHARACTERS = (
     .union(set(string.ascii_letters))
     .union(set(string.digits))
 )
+# current order fields that change order state (process_orders/blotter)
+CURRENT_ORDER_STATE = operator.attrgetter(
+    "status",
+    "persistence_type",
+    "average_price_matched",
+    "size_matched",
+    "size_remaining",
+    "size_lapsed",
+    "size_cancelled",
+    "size_voided",
+)
 
 
 class OrderStatus(Enum):
@@ -65,6 +77,9 @@ class BaseOrder:
         self.number_of_dead_heat_winners = None
         self.status = None
         self.complete = False
+        self.changed = False  # status/size change since last process_orders
+        self._current_order_state = None  # CURRENT_ORDER_STATE of last current order
+        self.blotter = None  # set by Blotter
         self.status_log = []
         self.violation_msg = None
         self.context = context or {}  # store order specific notes/triggers
@@ -80,7 +95,7 @@ class BaseOrder:
         self.market_version = None  # marketBook.version
         self.async_ = None
 
-        self.date_time_created = datetime.datetime.utcnow()
+        self.time_created = clock.time()  # epoch ms
         self.date_time_execution_complete = None
 
         self.cleared_order = None
@@ -93,11 +108,18 @@ class BaseOrder:
         self.status_log.append(status)
         self.status = status
         self.complete = self._is_complete()
+        self.mark_changed()
         if logger.isEnabledFor(logging.INFO):
             logger.info("Order status update: %s" % self.status.value, extra=self.info)
         if self.complete and self.trade.complete and status != OrderStatus.VIOLATION:
             self.trade.complete_trade()
 
+    def mark_changed(self) -> None:
+        # status/size change, flag for process_orders and blotter
+        self.changed = True
+        if self.blotter is not None:
+            self.blotter.order_changed(self)
+
     def placing(self) -> None:
         self._update_status(OrderStatus.PENDING)
 
@@ -107,7 +129,7 @@ class BaseOrder:
 
     def execution_complete(self) -> None:
         self._update_status(OrderStatus.EXECUTION_COMPLETE)
-        self.date_time_execution_complete = datetime.datetime.utcnow()
+        self.date_time_execution_complete = clock.utcnow()
         self.update_data.clear()
 
     def cancelling(self) -> None:
@@ -153,6 +175,15 @@ class BaseOrder:
     # currentOrder
     def update_current_order(self, current_order: CurrentOrder) -> None:
         self.responses.current_order = current_order
+        if self.simulated:
+            # paper trade current order is the order, changes flagged by Simulated
+            self.mark_changed()
+            return
+        # full images resend unchanged orders
+        state = CURRENT_ORDER_STATE(current_order)
+        if state != self._current_order_state:
+            self._current_order_state = state
+            self.mark_changed()
 
     def _is_complete(self) -> bool:
         """Returns False if order is
@@ -224,16 +255,15 @@ class BaseOrder:
 
     @property
     def elapsed_seconds(self) -> Optional[float]:
-        if self.responses.date_time_placed:
-            return (
-                datetime.datetime.utcnow() - self.responses.date_time_placed
-            ).total_seconds()
-        else:
-            return
+        return self.responses.elapsed_seconds_placed
+
+    @property
+    def date_time_created(self) -> datetime.datetime:
+        return clock.from_epoch(self.time_created)
 
     @property
     def elapsed_seconds_created(self) -> float:
-        return (datetime.datetime.utcnow() - self.date_time_created).total_seconds()
+        return clock.elapsed_seconds(self.time_created)
 
     @property
     def elapsed_seconds_executable(self) -> Optional[float]:
@@ -15,12 +15,14 @@ Various functions to update current order status
 and update status.
 
 Loop through each current order:
+    order = Lookup reconciled order using betId, else:
     order = Lookup order in market using marketId and orderId
     if order is None (not present locally):
         create local order using data and make executable #todo!!!
     if order betId != current_order betId:
         Get order using current_order betId due to replace request (new betId)
     if order:
+        add to reconciled orders (betId)
         process()
             update current status
             if betId is None (async placement):
@@ -32,41 +34,59 @@ orderStatus: PENDING, EXECUTION_COMPLETE, EXECUTABLE, EXPIRED
 
 def process_current_orders(
     markets: Markets, strategies: Strategies, event, log_control, add_market
-) -> None:
+) -> list:
+    """Returns market ids of the processed orders"""
+    market_ids = {}
     for current_orders in event.event:
         for current_order in current_orders.orders:
-            order_id = current_order.customer_order_ref[STRATEGY_NAME_HASH_LENGTH + 1 :]
-            order = markets.get_order(
-                market_id=current_order.market_id,
-                order_id=order_id,
-            )
+            order = markets.get_reconciled_order(current_order.bet_id)
             if order is None:
-                logger.warning(
-                    "Order %s not present in blotter" % current_order.bet_id,
-                    extra={
-                        "bet_id": current_order.bet_id,
-                        "market_id": current_order.market_id,
-                        "customer_strategy_ref": current_order.customer_strategy_ref,
-                        "customer_order_ref": current_order.customer_order_ref,
-                    },
-                )
-                order = create_order_from_current(
+                order = reconcile_current_order(
                     markets, strategies, current_order, add_market
                 )
                 if order is None:
                     continue
+            process_current_order(order, current_order, log_control)
+            market_ids[order.market_id] = None
+    return list(market_ids)
 
-            if (
-                order.bet_id and order.bet_id != current_order.bet_id
-            ):  # replaceOrder handling (hacky)
-                order = markets.get_order_from_bet_id(
-                    market_id=current_order.market_id,
-                    bet_id=current_order.bet_id,
-                )
-                if order is None:
-                    continue
 
-            process_current_order(order, current_order, log_control)
+def reconcile_current_order(
+    markets: Markets, strategies: Strategies, current_order, add_market
+) -> Optional[BaseOrder]:
+    order_id = current_order.customer_order_ref[STRATEGY_NAME_HASH_LENGTH + 1 :]
+    order = markets.get_order(
+        market_id=current_order.market_id,
+        order_id=order_id,
+    )
+    if order is None:
+        logger.warning(
+            "Order %s not present in blotter" % current_order.bet_id,
+            extra={
+                "bet_id": current_order.bet_id,
+                "market_id": current_order.market_id,
+                "customer_strategy_ref": current_order.customer_strategy_ref,
+                "customer_order_ref": current_order.customer_order_ref,
+            },
+        )
+        order = create_order_from_current(
+            markets, strategies, current_order, add_market
+        )
+        if order is None:
+            return
+
+    if (
+        order.bet_id and order.bet_id != current_order.bet_id
+    ):  # replaceOrder handling (hacky)
+        order = markets.get_order_from_bet_id(
+            market_id=current_order.market_id,
+            bet_id=current_order.bet_id,
+        )
+        if order is None:
+            return
+
+    markets.add_reconciled_order(current_order.bet_id, order)
+    return order
 
 
 def process_current_order(order: BaseOrder, current_order, log_control) -> None:
@@ -1,24 +1,26 @@
 import datetime
 from typing import Optional
 
+from .. import clock
+
 
 class Responses:
     """Order responses"""
 
     def __init__(self):
-        self.date_time_created = datetime.datetime.utcnow()
+        self.date_time_created = clock.utcnow()
         self.current_order = None  # resources.CurrentOrder
         self.place_response = None  # resources.PlaceOrderInstructionReports
         self.cancel_responses = []
         self.replace_responses = []
         self.update_responses = []
-        self._date_time_placed = None
+        self.time_placed = None  # epoch ms
 
     def placed(self, response=None, dt: bool = True) -> None:
         if response:
             self.place_response = response
         if dt:
-            self._date_time_placed = datetime.datetime.utcnow()
+            self.time_placed = clock.time()
 
     def cancelled(self, response) -> None:
         self.cancel_responses.append(response)
@@ -31,7 +33,14 @@ class Responses:
 
     @property
     def date_time_placed(self) -> Optional[datetime.datetime]:
-        if self._date_time_placed:
-            return self._date_time_placed
+        if self.time_placed is not None:
+            return clock.from_epoch(self.time_placed)
         elif self.current_order:
             return self.current_order.placed_date
+
+    @property
+    def elapsed_seconds_placed(self) -> Optional[float]:
+        if self.time_placed is not None:
+            return clock.elapsed_seconds(self.time_placed)
+        elif self.current_order and self.current_order.placed_date:
+            return (clock.utcnow() - self.current_order.placed_date).total_seconds()
@@ -2,6 +2,8 @@ import logging
 import datetime
 from typing import Optional
 
+from .. import clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,21 +13,21 @@ class RunnerContext:
     def __init__(self, selection_id: int):
         self.selection_id = selection_id
         self.invested = False
-        self.datetime_last_placed = None
-        self.datetime_last_reset = None
+        self.time_last_placed = None  # epoch ms
+        self.time_last_reset = None  # epoch ms
         self.trades = []
         self.live_trades = []
 
     def place(self, trade_id) -> None:
         self.invested = True
-        self.datetime_last_placed = datetime.datetime.utcnow()
+        self.time_last_placed = clock.time()
         if trade_id not in self.trades:
             self.trades.append(trade_id)
         if trade_id not in self.live_trades:
             self.live_trades.append(trade_id)
 
     def reset(self, trade_id) -> None:
-        self.datetime_last_reset = datetime.datetime.utcnow()
+        self.time_last_reset = clock.time()
         try:
             self.live_trades.remove(trade_id)
         except ValueError:
@@ -49,16 +51,22 @@ class RunnerContext:
     def live_trade_count(self) -> int:
         return len(self.live_trades)
 
+    @property
+    def datetime_last_placed(self) -> Optional[datetime.datetime]:
+        if self.time_last_placed is not None:
+            return clock.from_epoch(self.time_last_placed)
+
+    @property
+    def datetime_last_reset(self) -> Optional[datetime.datetime]:
+        if self.time_last_reset is not None:
+            return clock.from_epoch(self.time_last_reset)
+
     @property
     def placed_elapsed_seconds(self) -> Optional[float]:
-        if self.datetime_last_placed:
-            return (
-                datetime.datetime.utcnow() - self.datetime_last_placed
-            ).total_seconds()
+        if self.time_last_placed is not None:
+            return clock.elapsed_seconds(self.time_last_placed)
 
     @property
     def reset_elapsed_seconds(self) -> Optional[float]:
-        if self.datetime_last_reset:
-            return (
-                datetime.datetime.utcnow() - self.datetime_last_reset
-            ).total_seconds()
+        if self.time_last_reset is not None:
+            return clock.elapsed_seconds(self.time_last_reset)
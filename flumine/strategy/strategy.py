@@ -51,6 +51,7 @@ class BaseStrategy:
         max_trade_count: int = 1e6,
         max_live_trade_count: int = 1,
         multi_order_trades: bool = False,
+        process_orders_on_change: bool = False,
     ):
         """
         :param market_filter: Streaming market filter dict or list of market filters
@@ -66,6 +67,7 @@ class BaseStrategy:
         :param max_trade_count: max total number of trades per runner
         :param max_live_trade_count: max live (with executable orders) trades per runner
         :param multi_order_trades: allow multiple live orders per trade
+        :param process_orders_on_change: only call process_orders when orders have changed
         """
         self.market_filter = market_filter
         self.market_data_filter = market_data_filter or DEFAULT_MARKET_DATA_FILTER
@@ -80,15 +82,18 @@ class BaseStrategy:
         self.max_trade_count = max_trade_count
         self.max_live_trade_count = max_live_trade_count
         self.multi_order_trades = multi_order_trades
+        self.process_orders_on_change = process_orders_on_change
 
         self._invested = {}  # {(marketId, selectionId, handicap): RunnerContext}
         self.streams = []  # list of streams strategy is subscribed
         self.historic_stream_ids = []
         # cache
         self.name_hash = create_cheap_hash(self.name, STRATEGY_NAME_HASH_LENGTH)
+        self._stream_id_set = set()
+        self._stream_id_set_key = None
 
     def check_market(self, market: Market, market_book: MarketBook) -> bool:
-        if market_book.streaming_unique_id not in self.stream_ids:
+        if market_book.streaming_unique_id not in self.stream_id_set:
             return False  # strategy not subscribed to market stream
         elif self.check_market_book(market, market_book):
             return True
@@ -115,8 +120,11 @@ class BaseStrategy:
     def process_raw_data(self, clk: str, publish_time: int, datum: dict) -> None:
         return
 
-    def process_orders(self, market: Market, orders: list) -> None:
-        # process list of Order objects for strategy and Market
+    def process_orders(
+        self, market: Market, orders: list, changed_orders: list = None
+    ) -> None:
+        # process list of Order objects for strategy and Market,
+        # changed_orders only provided if process_orders_on_change
         return
 
     def process_closed_market(self, market: Market, market_book: MarketBook) -> None:
@@ -196,6 +204,21 @@ class BaseStrategy:
         else:
             return [stream.stream_id for stream in self.streams]
 
+    @property
+    def stream_id_set(self) -> set:
+        """Cached set of stream_ids, rebuilt when
+        streams/historic_stream_ids are added to"""
+        key = (
+            id(self.historic_stream_ids),
+            len(self.historic_stream_ids),
+            id(self.streams),
+            len(self.streams),
+        )
+        if key != self._stream_id_set_key:
+            self._stream_id_set = set(self.stream_ids)
+            self._stream_id_set_key = key
+        return self._stream_id_set
+
     @property
     def info(self) -> dict:
         return {
@@ -209,6 +232,7 @@ class BaseStrategy:
             "max_order_exposure": self.max_order_exposure,
             "max_live_trade_count": self.max_live_trade_count,
             "max_trade_count": self.max_trade_count,
+            "process_orders_on_change": self.process_orders_on_change,
             "context": self.context,
             "name_hash": self.name_hash,
             "client": str(self.client),
@@ -225,11 +249,42 @@ class BaseStrategy:
 class Strategies:
     def __init__(self):
         self._strategies = []
+        self._stream_index = {}  # {stream_id: [strategy..]}
+        self._indexed_stream_ids = {}  # {strategy: {stream_id..}}
+        self._hashes = {}  # {name_hash: strategy}
 
     def __call__(self, strategy: BaseStrategy, client: BaseClient) -> None:
         strategy.client = client
         self._strategies.append(strategy)
+        self._hashes[strategy.name_hash] = strategy
         strategy.add()
+        self._indexed_stream_ids[strategy] = set()
+        self.update_stream_index(strategy)
+
+    def update_stream_index(self, strategy: BaseStrategy) -> None:
+        """Add strategy stream_ids not yet indexed to the
+        stream_id to subscribed strategies index, called
+        on strategy add/stream subscription"""
+        indexed_stream_ids = self._indexed_stream_ids.get(strategy)
+        if indexed_stream_ids is None:
+            return  # indexed when added
+        for stream_id in strategy.stream_ids:
+            if stream_id not in indexed_stream_ids:
+                indexed_stream_ids.add(stream_id)
+                self._stream_index.setdefault(stream_id, []).append(strategy)
+
+    def stream_strategies(self, stream_id: int) -> list:
+        """Strategies subscribed to stream, the index is
+        updated on a miss to pick up streams subscribed to
+        outside of flumine (e.g. custom streams), strategies
+        subscribing to an indexed stream directly need to
+        call update_stream_index"""
+        strategies = self._stream_index.get(stream_id)
+        if strategies is None:
+            for strategy in self._strategies:
+                self.update_stream_index(strategy)
+            strategies = self._stream_index.get(stream_id, [])
+        return strategies
 
     def start(self) -> None:
         for s in self:
@@ -237,7 +292,7 @@ class Strategies:
 
     @property
     def hashes(self) -> dict:
-        return {strategy.name_hash: strategy for strategy in self}
+        return self._hashes
 
     def __iter__(self) -> Iterator[BaseStrategy]:
         return iter(self._strategies)
@@ -1,19 +1,329 @@
+import io
+import os
+import bz2
+import gzip
+import lzma
+import mmap
+import array
+import queue
+import struct
+import hashlib
 import logging
+import tarfile
+import tempfile
 import datetime
-from typing import Optional
+import threading
+import contextlib
+from pathlib import Path
+from typing import Optional, Callable, Iterator, BinaryIO
 from betfairlightweight.streaming import StreamListener, HistoricalGeneratorStream
 from betfairlightweight.streaming.stream import MarketStream, RaceStream
 from betfairlightweight.streaming.cache import MarketBookCache, RaceCache
 from betfairlightweight.resources.baseresource import BaseResource
 from betfairlightweight.compat import json
+import json as std_json
 
-from .basestream import BaseStream
 from ..exceptions import ListenerError
 from ..utils import create_time
+from .. import config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
 
+""" historic file readers """
+
+
+def _open_zstd(f: BinaryIO) -> BinaryIO:
+    if zstandard is None:
+        raise ImportError("zstandard is required to read zstd compressed files")
+    return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+
+
+# [(name, magic bytes, opener), ..] checked in order
+READERS = [
+    ("gzip", b"\x1f\x8b", lambda f: gzip.GzipFile(fileobj=f, mode="rb")),
+    ("bz2", b"BZh", lambda f: bz2.BZ2File(f, mode="rb")),
+    ("xz", b"\xfd7zXZ\x00", lambda f: lzma.LZMAFile(f, mode="rb")),
+    ("zstd", b"\x28\xb5\x2f\xfd", _open_zstd),
+]
+ARCHIVE_SUFFIX = ".tar"
+_ARCHIVE_MEMBERS = {}  # {archive_path: (mtime, {member_name: TarInfo})}
+
+
+def register_reader(
+    name: str, magic: bytes, opener: Callable[[BinaryIO], BinaryIO]
+) -> None:
+    """Register a decompression reader, opener is
+    called with the raw binary file object when the
+    file starts with the magic bytes.
+    """
+    READERS.insert(0, (name, magic, opener))
+
+
+def split_archive_path(file_path: str) -> tuple:
+    """Returns (archive_path, member_name) if the path
+    points to a member of a tar archive, e.g.
+    `/data/2021_01_JanFootball.tar/BASIC/2021/Jan/1/301/1.17.bz2`
+    """
+    parts = Path(file_path).parts
+    for i, part in enumerate(parts[:-1]):
+        if part.endswith(ARCHIVE_SUFFIX):
+            archive_path = os.path.join(*parts[: i + 1])
+            if os.path.isfile(archive_path):
+                return archive_path, "/".join(parts[i + 1 :])
+    return None, None
+
+
+def _get_archive_member(archive_path: str, member_name: str) -> tarfile.TarInfo:
+    # index archive once, members are then read in place
+    mtime = os.path.getmtime(archive_path)
+    try:
+        members_mtime, members = _ARCHIVE_MEMBERS[archive_path]
+    except KeyError:
+        members_mtime, members = None, None
+    if members_mtime != mtime:
+        with tarfile.open(archive_path, "r") as tar:
+            members = {m.name: m for m in tar.getmembers() if m.isfile()}
+        _ARCHIVE_MEMBERS[archive_path] = (mtime, members)
+    try:
+        return members[member_name]
+    except KeyError:
+        raise FileNotFoundError(
+            "%s not found in archive %s" % (member_name, archive_path)
+        )
+
+
+def _decompress(f: BinaryIO, buffer_size: int) -> BinaryIO:
+    magic = f.peek(8)[:8] if hasattr(f, "peek") else b""
+    for name, reader_magic, opener in READERS:
+        if magic.startswith(reader_magic):
+            return io.BufferedReader(opener(f), buffer_size)
+    return f
+
+
+def _background_lines(f, buffer_size: int) -> Iterator[str]:
+    """Read/decompress in a background thread so that
+    decompression overlaps with json parsing, bz2/zlib/lzma
+    release the GIL when decompressing.
+    """
+    lines_queue = queue.Queue(maxsize=8)
+    stop = threading.Event()
+
+    def read():
+        try:
+            while not stop.is_set():
+                lines = f.readlines(buffer_size)
+                if not lines:
+                    break
+                lines_queue.put(lines)
+        except Exception as e:
+            lines_queue.put(e)
+        lines_queue.put(None)
+
+    thread = threading.Thread(name="historic_file_reader", target=read, daemon=True)
+    thread.start()
+    try:
+        while True:
+            lines = lines_queue.get()
+            if lines is None:
+                break
+            elif isinstance(lines, Exception):
+                raise lines
+            yield from lines
+    finally:
+        stop.set()
+        while thread.is_alive():  # unblock reader
+            try:
+                lines_queue.get_nowait()
+            except queue.Empty:
+                thread.join(0.01)
+
+
+@contextlib.contextmanager
+def open_historic_file(
+    file_path: str, buffer_size: int = None, background: bool = None
+) -> Iterator[Iterator[str]]:
+    """Opens a historic (or self recorded) file returning
+    an iterator of lines, gz/bz2/xz/zstd compression is
+    detected and tar archive members read in place.
+
+    :param file_path: path to file or archive member
+    :param buffer_size: read buffer size in bytes
+    :param background: read/decompress in a background thread
+    """
+    buffer_size = buffer_size or config.historic_buffer_size
+    if background is None:
+        background = config.historic_background_read
+    with contextlib.ExitStack() as stack:
+        archive_path, member_name = split_archive_path(file_path)
+        if archive_path:
+            member = _get_archive_member(archive_path, member_name)
+            tar = stack.enter_context(tarfile.open(archive_path, "r"))
+            f = tar.extractfile(member)
+        else:
+            f = open(file_path, "rb", buffering=buffer_size)
+        stack.enter_context(f)
+        f = stack.enter_context(_decompress(f, buffer_size))
+        f = stack.enter_context(io.TextIOWrapper(f, encoding="utf-8"))
+        if background:
+            lines = _background_lines(f, buffer_size)
+            stack.callback(lines.close)
+            yield lines
+        else:
+            yield f
+
+
+""" replay cache """
+
+REPLAY_CACHE_MAGIC = b"FLMRPC01"
+REPLAY_CACHE_VERSION = 1
+REPLAY_CACHE_SUFFIX = ".flr"
+
+
+def file_hash(file_path: str) -> str:
+    """sha1 of the raw (compressed) source file"""
+    hash_ = hashlib.sha1()
+    archive_path, member_name = split_archive_path(file_path)
+    with contextlib.ExitStack() as stack:
+        if archive_path:
+            member = _get_archive_member(archive_path, member_name)
+            tar = stack.enter_context(tarfile.open(archive_path, "r"))
+            f = stack.enter_context(tar.extractfile(member))
+        else:
+            f = stack.enter_context(open(file_path, "rb"))
+        for chunk in iter(lambda: f.read(config.historic_buffer_size), b""):
+            hash_.update(chunk)
+    return hash_.hexdigest()
+
+
+def compile_replay_cache(file_path: str, cache_path: str) -> str:
+    """Compiles a historic market file into a binary replay
+    cache, layout (arrays in native byte order):
+        magic | header length (uint32) | header json
+        publish times (int64[n]) | offsets (int64[n + 1])
+        definition flags (uint8[n]) | payload
+    Distinct marketDefinitions are stored once in the header
+    and referenced by index from the market changes, the
+    payload is the compact `mc` list of each update.
+    """
+    publish_times = array.array("q")
+    offsets = array.array("q", [0])
+    flags = array.array("B")
+    definitions, definition_lookup = [], {}
+    payload = io.BytesIO()
+    with open_historic_file(file_path) as f:
+        for line in f:
+            update = json.loads(line)
+            if update.get("op", "mcm") != "mcm":
+                raise ValueError("Replay cache only supports market files")
+            market_changes = update.get("mc", [])
+            flag = 0
+            for market_change in market_changes:
+                market_definition = market_change.get("marketDefinition")
+                if market_definition is not None:
+                    key = std_json.dumps(market_definition, separators=(",", ":"))
+                    index = definition_lookup.get(key)
+                    if index is None:
+                        index = definition_lookup[key] = len(definitions)
+                        definitions.append(market_definition)
+                    market_change["marketDefinition"] = index
+                    flag = 1
+            publish_times.append(update["pt"])
+            flags.append(flag)
+            payload.write(
+                std_json.dumps(market_changes, separators=(",", ":")).encode()
+            )
+            offsets.append(payload.tell())
+    header = std_json.dumps(
+        {
+            "version": REPLAY_CACHE_VERSION,
+            "source_hash": file_hash(file_path),
+            "count": len(publish_times),
+            "definitions": definitions,
+        },
+        separators=(",", ":"),
+    ).encode()
+    # write then rename so concurrent processes never read partial files
+    cache_dir = os.path.dirname(os.path.abspath(cache_path))
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(REPLAY_CACHE_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            publish_times.tofile(f)
+            offsets.tofile(f)
+            flags.tofile(f)
+            f.write(payload.getbuffer())
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    logger.info(
+        "Replay cache compiled",
+        extra={
+            "file_path": file_path,
+            "cache_path": cache_path,
+            "updates": len(publish_times),
+            "definitions": len(definitions),
+        },
+    )
+    return cache_path
+
+
+def get_replay_cache(file_path: str, cache_dir: str) -> str:
+    """Returns path to the replay cache of file_path, keyed
+    by source file hash so changed files are recompiled.
+    """
+    cache_path = os.path.join(cache_dir, file_hash(file_path) + REPLAY_CACHE_SUFFIX)
+    if not os.path.exists(cache_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        compile_replay_cache(file_path, cache_path)
+    return cache_path
+
+
+def read_replay_cache(cache_path: str) -> Iterator[tuple]:
+    """Memory maps a replay cache yielding
+    (publish_time, [market_change, ..])
+    """
+    loads = json.loads
+    with open(cache_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[: len(REPLAY_CACHE_MAGIC)] != REPLAY_CACHE_MAGIC:
+                raise ValueError("Invalid replay cache %s" % cache_path)
+            cursor = len(REPLAY_CACHE_MAGIC)
+            (header_length,) = struct.unpack_from("<I", mm, cursor)
+            cursor += 4
+            header = std_json.loads(mm[cursor : cursor + header_length])
+            cursor += header_length
+            if header["version"] != REPLAY_CACHE_VERSION:
+                raise ValueError("Invalid replay cache version %s" % cache_path)
+            count, definitions = header["count"], header["definitions"]
+            publish_times = array.array("q")
+            publish_times.frombytes(mm[cursor : cursor + count * 8])
+            cursor += count * 8
+            offsets = array.array("q")
+            offsets.frombytes(mm[cursor : cursor + (count + 1) * 8])
+            cursor += (count + 1) * 8
+            flags = mm[cursor : cursor + count]
+            cursor += count
+            for i in range(count):
+                market_changes = loads(
+                    mm[cursor + offsets[i] : cursor + offsets[i + 1]]
+                )
+                if flags[i]:
+                    for market_change in market_changes:
+                        index = market_change.get("marketDefinition")
+                        if index is not None:
+                            market_change["marketDefinition"] = definitions[index]
+                yield publish_times[i], market_changes
+
+
 class FlumineMarketStream(MarketStream):
     """
     Custom bflw stream to speed up processing
@@ -166,33 +476,115 @@ class FlumineHistoricalGeneratorStream(HistoricalGeneratorStream):
 
     def _read_loop(self) -> dict:
         self.listener.register_stream(self.unique_id, self.operation)
-        listener_on_data = self.listener.on_data  # cache functions
-        stream_snap = self.listener.stream.snap
-        with open(self.file_path, "r") as f:
-            for update in f:
-                if listener_on_data(update):
+        stream_snap = self.listener.stream.snap  # cache functions
+        if config.historic_replay_cache_dir and self.operation == "marketSubscription":
+            cache_path = get_replay_cache(
+                self.file_path, config.historic_replay_cache_dir
+            )
+            stream_process = self.listener.stream._process
+            for publish_time, market_changes in read_replay_cache(cache_path):
+                if stream_process(market_changes, publish_time):
                     yield stream_snap()
+        else:
+            listener_on_data = self.listener.on_data
+            with open_historic_file(self.file_path) as f:
+                for update in f:
+                    if listener_on_data(update):
+                        yield stream_snap()
 
 
-class HistoricalStream(BaseStream):
+class HistoricalStream:
+    """
+    Lightweight backtest stream descriptor, unlike
+    the live streams this is not a thread and the
+    listener/cache is only created when the market
+    is replayed (create_generator) so it can be
+    garbage collected once processed.
+    """
 
     LISTENER = HistoricListener
     MAX_LATENCY = None
 
+    __slots__ = [
+        "flumine",
+        "stream_id",
+        "market_filter",
+        "market_data_filter",
+        "streaming_timeout",
+        "conflate_ms",
+        "_client",
+        "custom",
+        "_stream",
+        "event_processing",
+        "event_id",
+        "operation",
+        "listener_kwargs",
+    ]
+
+    def __init__(
+        self,
+        flumine,
+        stream_id: int = None,
+        streaming_timeout: float = None,
+        conflate_ms: int = None,
+        market_filter: str = None,
+        market_data_filter: dict = None,
+        custom: bool = False,
+        client=None,
+        output_queue: bool = False,
+        event_processing: bool = False,
+        event_id: str = None,
+        operation: str = "marketSubscription",
+        **listener_kwargs,
+    ):
+        self.flumine = flumine
+        self.stream_id = stream_id
+        self.market_filter = market_filter
+        self.market_data_filter = market_data_filter
+        self.streaming_timeout = streaming_timeout
+        self.conflate_ms = conflate_ms
+        self._client = client
+        self.custom = custom
+        self._stream = None
+        self.event_processing = event_processing
+        self.event_id = event_id
+        self.operation = operation
+        self.listener_kwargs = listener_kwargs
+
     def run(self) -> None:
         pass
 
     def handle_output(self) -> None:
         pass
 
-    def create_generator(self):
-        self._listener.update_clk = (
+    def stop(self) -> None:
+        pass
+
+    def create_listener(self) -> HistoricListener:
+        listener = self.LISTENER(
+            output_queue=None, max_latency=self.MAX_LATENCY, **self.listener_kwargs
+        )
+        listener.update_clk = (
             False  # do not update clk on updates (not required when backtesting)
         )
+        return listener
+
+    def create_generator(self):
         stream = FlumineHistoricalGeneratorStream(
             file_path=self.market_filter,
-            listener=self._listener,
+            listener=self.create_listener(),
             operation=self.operation,
             unique_id=self.stream_id,
         )
         return stream.get_generator()
+
+    @property
+    def betting_client(self):
+        return self.client.betting_client
+
+    @property
+    def client(self):
+        if self._client:
+            return self._client
+        else:
+            return self.flumine.client
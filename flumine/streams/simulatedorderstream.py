@@ -1,5 +1,7 @@
 import time
+import queue
 import logging
+from typing import Optional
 
 from .basestream import BaseStream
 from ..events.events import CurrentOrdersEvent
@@ -14,6 +16,23 @@ class CurrentOrders:
 
 
 class SimulatedOrderStream(BaseStream):
+    """
+    Paper trade order stream, orders are
+    added on simulated change (fill, cancel,
+    lapse, void or execution) and emitted
+    immediately, live orders are also emitted
+    every streaming_timeout so that process_orders
+    is called for resting (unchanged) orders.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SimulatedOrderStream, self).__init__(*args, **kwargs)
+        self._changed_orders = queue.Queue()
+
+    def order_changed(self, order) -> None:
+        """Called on simulated order change (thread safe)"""
+        self._changed_orders.put(order)
+
     def run(self) -> None:
         logger.info(
             "Starting SimulatedOrderStream {0}".format(self.stream_id),
@@ -23,21 +42,57 @@ class SimulatedOrderStream(BaseStream):
             },
         )
 
+        last_poll = time.monotonic()
         while self.is_alive():
-            if self.flumine.markets.live_orders:
-                current_orders = self._get_current_orders()
-                if current_orders:
-                    self.flumine.handler_queue.put(
-                        CurrentOrdersEvent([CurrentOrders(current_orders)])
-                    )
-            time.sleep(self.streaming_timeout)
+            timeout = self.streaming_timeout - (time.monotonic() - last_poll)
+            changed_orders = self._get_changed_orders(max(timeout, 0))
+            if changed_orders is None:
+                break
+            if time.monotonic() - last_poll >= self.streaming_timeout:
+                last_poll = time.monotonic()
+                changed_orders = self._add_live_orders(changed_orders)
+            current_orders = self._get_current_orders(changed_orders)
+            if current_orders:
+                self.flumine.handler_queue.put(
+                    CurrentOrdersEvent([CurrentOrders(current_orders)])
+                )
         logger.info("Stopped SimulatedOrderStream {0}".format(self.stream_id))
 
-    def _get_current_orders(self) -> list:
-        current_orders = []
+    def stop(self) -> None:
+        self._changed_orders.put(None)
+
+    def _get_changed_orders(self, timeout: float = None) -> Optional[list]:
+        # block until a change (or timeout) then drain queue (deduplicated)
+        orders = {}
+        try:
+            order = self._changed_orders.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        while True:
+            if order is None:  # stop
+                if orders:
+                    self._changed_orders.put(None)
+                    return list(orders.values())
+                return
+            orders[order.id] = order
+            try:
+                order = self._changed_orders.get_nowait()
+            except queue.Empty:
+                return list(orders.values())
+
+    def _add_live_orders(self, changed_orders: list) -> list:
+        orders = {order.id: order for order in changed_orders}
         for market in self.flumine.markets:
             if market.closed is False:
-                for order in market.blotter:
-                    if order.simulated and order.trade.client == self.client:
-                        current_orders.append(order)
+                for order in market.blotter.live_orders:
+                    orders.setdefault(order.id, order)
+        return list(orders.values())
+
+    def _get_current_orders(self, changed_orders: list) -> list:
+        current_orders = []
+        for order in changed_orders:
+            market = self.flumine.markets.markets.get(order.market_id)
+            if market and market.closed is False:
+                if order.simulated and order.trade.client == self.client:
+                    current_orders.append(order)
         return current_orders
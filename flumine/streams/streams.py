@@ -9,22 +9,35 @@ from .historicalstream import HistoricalStream
 from .orderstream import OrderStream
 from .simulatedorderstream import SimulatedOrderStream
 from ..clients import ExchangeType, BaseClient
-from ..utils import get_file_md
+from ..backtest.marketindex import MarketIndex
+from .. import config
 
 logger = logging.getLogger(__name__)
 
 
+def _hashable(listener_kwargs: dict) -> tuple:
+    return tuple(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in sorted(listener_kwargs.items())
+    )
+
+
 class Streams:
     def __init__(self, flumine):
         self.flumine = flumine
         self._streams = []
         self._stream_id = 0
+        self._market_index = None
+        self._historical_streams = {}  # {(market, event_processing, kwargs): stream}
 
     def __call__(self, strategy: BaseStrategy) -> None:
         if self.flumine.BACKTEST:
             markets = strategy.market_filter.get("markets")
             market_types = strategy.market_filter.get("market_types")
             country_codes = strategy.market_filter.get("country_codes")
+            event_ids = strategy.market_filter.get("event_ids")
+            venues = strategy.market_filter.get("venues")
+            market_start_time = strategy.market_filter.get("market_start_time")
             event_processing = strategy.market_filter.get("event_processing", False)
             events = strategy.market_filter.get("events")
             listener_kwargs = strategy.market_filter.get("listener_kwargs", {})
@@ -41,33 +54,31 @@ class Streams:
             elif markets:
                 # order markets by name as an attempt to process in chronological order
                 markets.sort()
-                for market in markets:
-                    market_type = get_file_md(market, "marketType")
-                    country_code = get_file_md(market, "countryCode")
-                    if market_types and market_type and market_type not in market_types:
-                        logger.warning(
-                            "Skipping market %s (%s) for strategy %s due to marketType filter"
-                            % (market, market_type, strategy)
-                        )
-                    elif (
-                        country_codes
-                        and country_code
-                        and country_code not in country_codes
-                    ):
-                        logger.warning(
-                            "Skipping market %s (%s) for strategy %s due to countryCode filter"
-                            % (market, country_code, strategy)
-                        )
-                    else:
-                        stream = self.add_historical_stream(
-                            strategy, market, event_processing, **listener_kwargs
-                        )
-                        strategy.streams.append(stream)
-                        strategy.historic_stream_ids.append(stream.stream_id)
+                self.market_index.update(markets)
+                filtered_markets = self.market_index.filter(
+                    markets,
+                    market_types=market_types,
+                    country_codes=country_codes,
+                    event_ids=event_ids,
+                    venues=venues,
+                    market_start_time=market_start_time,
+                )
+                if len(filtered_markets) != len(markets):
+                    logger.warning(
+                        "Skipping %s markets for strategy %s due to market filter"
+                        % (len(markets) - len(filtered_markets), strategy)
+                    )
+                for market in filtered_markets:
+                    stream = self.add_historical_stream(
+                        strategy, market, event_processing, **listener_kwargs
+                    )
+                    strategy.streams.append(stream)
+                    strategy.historic_stream_ids.append(stream.stream_id)
             elif events:
                 raise NotImplementedError()
         else:
             self.add_stream(strategy)
+        self.flumine.strategies.update_stream_index(strategy)
 
     def add_client(self, client: BaseClient) -> None:
         if client.order_stream:
@@ -124,16 +135,13 @@ class Streams:
         event_processing: bool,
         **listener_kwargs
     ) -> HistoricalStream:
-        for stream in self:
-            if (
-                stream.market_filter == market
-                and stream.event_processing == event_processing
-                and stream.listener_kwargs == listener_kwargs
-            ):
-                return stream
+        key = (market, event_processing, _hashable(listener_kwargs))
+        stream = self._historical_streams.get(key)
+        if stream:
+            return stream
         else:
             stream_id = self._increment_stream_id()
-            event_id = get_file_md(market, "eventId")
+            event_id = self.market_index.get(market)["event_id"]
             if event_processing and event_id is None:
                 logger.warning("EventId not found for market %s" % market)
             logger.info(
@@ -161,6 +169,7 @@ class Streams:
                 **listener_kwargs,
             )
             self._streams.append(stream)
+            self._historical_streams[key] = stream
             return stream
 
     """ order data """
@@ -200,6 +209,7 @@ class Streams:
             client=client,
             custom=True,
         )
+        client.simulated_order_stream = stream
         self._streams.append(stream)
         return stream
 
@@ -225,6 +235,13 @@ class Streams:
         for stream in self:
             stream.stop()
 
+    @property
+    def market_index(self) -> MarketIndex:
+        # historic file metadata (created on first use)
+        if self._market_index is None:
+            self._market_index = MarketIndex(config.historic_market_index or ":memory:")
+        return self._market_index
+
     def _increment_stream_id(self) -> int:
         self._stream_id += int(1e3)
         return self._stream_id
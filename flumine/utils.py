@@ -61,11 +61,15 @@ def file_line_count(file_path: str) -> int:
 
 def get_file_md(file_dir: Union[str, tuple], value: str) -> Optional[str]:
     # get value from raw streaming file marketDefinition
+    from .streams.historicalstream import open_historic_file  # circular import
+
     if isinstance(file_dir, tuple):
         file_dir = file_dir[0]
-    with open(file_dir, "r") as f:
+    with open_historic_file(file_dir, background=False) as f:
         first_line = f.readline()
-        update = json.loads(first_line)
+    if not first_line:
+        return None
+    update = json.loads(first_line)
     if "mc" not in update or not isinstance(update["mc"], list) or not update["mc"]:
         return None
     md = update["mc"][0].get("marketDefinition", {})
@@ -256,9 +260,14 @@ def call_middleware_error_handling(middleware, market) -> None:
             raise
 
 
-def call_process_orders_error_handling(strategy, market, strategy_orders: list) -> None:
+def call_process_orders_error_handling(
+    strategy, market, strategy_orders: list, changed_orders: list = None
+) -> None:
     try:
-        strategy.process_orders(market, strategy_orders)
+        if changed_orders is None:
+            strategy.process_orders(market, strategy_orders)
+        else:
+            strategy.process_orders(market, strategy_orders, changed_orders)
     except FlumineException as e:
         logger.error(
             "FlumineException %s in %s (%s)" % (e, strategy, market.market_id),
@@ -273,16 +282,26 @@ def call_process_orders_error_handling(strategy, market, strategy_orders: list)
             raise
 
 
+def get_runner_index(market_book: MarketBook) -> dict:
+    """Returns {(selection_id, handicap): RunnerBook},
+    built once per MarketBook and cached on it.
+    """
+    try:
+        return vars(market_book)["_runner_index"]
+    except KeyError:
+        runner_index = {
+            (runner_book.selection_id, runner_book.handicap): runner_book
+            for runner_book in market_book.runners
+        }
+        market_book._runner_index = runner_index
+        return runner_index
+
+
 def get_runner_book(
     market_book: MarketBook, selection_id: int, handicap=0
 ) -> Optional[RunnerBook]:
     """Returns runner book based on selection id."""
-    for runner_book in market_book.runners:
-        if (
-            runner_book.selection_id == selection_id
-            and runner_book.handicap == handicap
-        ):
-            return runner_book
+    return get_runner_index(market_book).get((selection_id, handicap))
 
 
 def get_market_notes(market, selection_id: int) -> Optional[str]:
@@ -20,6 +20,7 @@ setup(
             "examples.workers",
             "examples.middleware",
             "examples.controls",
+            "examples.benchmarks",
         ]
     ),
     package_dir={"flumine": "flumine"},
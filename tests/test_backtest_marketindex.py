@@ -0,0 +1,125 @@
+import os
+import bz2
+import shutil
+import datetime
+import tempfile
+import unittest
+from unittest import mock
+
+from flumine.backtest import marketindex
+
+BASIC = "tests/resources/BASIC-1.132153978"
+SELF = "tests/resources/SELF-1.181223995"
+
+
+class MarketIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.market_index = marketindex.MarketIndex()
+
+    def tearDown(self):
+        self.market_index.close()
+
+    def test_init(self):
+        self.assertEqual(self.market_index.path, ":memory:")
+        self.assertEqual(len(self.market_index), 0)
+
+    def test_read_file_md(self):
+        self.assertEqual(
+            marketindex.read_file_md(BASIC),
+            (
+                "1.132153978",
+                "28270094",
+                "7",
+                "WIN",
+                "GB",
+                "Hamilton",
+                1497466500.0,
+            ),
+        )
+
+    def test_read_file_md_empty(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "1.132153978")
+            open(file_path, "w").close()
+            self.assertEqual(
+                marketindex.read_file_md(file_path),
+                (None,) * (len(marketindex.COLUMNS) + 1),
+            )
+
+    def test_update(self):
+        self.assertEqual(self.market_index.update([BASIC, (SELF, "tar")]), 2)
+        self.assertEqual(len(self.market_index), 2)
+        # only new/modified files are read
+        with mock.patch("flumine.backtest.marketindex.read_file_md") as mock_read:
+            self.assertEqual(self.market_index.update([BASIC, SELF]), 0)
+            mock_read.assert_not_called()
+
+    def test_update_modified(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "1.132153978")
+            shutil.copy(BASIC, path)
+            self.market_index.update([path])
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(self.market_index.update([path]), 1)
+
+    def test_get(self):
+        md = self.market_index.get(BASIC)
+        self.assertEqual(md["path"], os.path.abspath(BASIC))
+        self.assertEqual(md["market_id"], "1.132153978")
+        self.assertEqual(md["event_id"], "28270094")
+        self.assertEqual(md["market_type"], "WIN")
+        self.assertEqual(md["country_code"], "GB")
+        self.assertEqual(md["venue"], "Hamilton")
+        self.assertEqual(md["market_time"], datetime.datetime(2017, 6, 14, 18, 55))
+        self.assertEqual(len(self.market_index), 1)
+
+    def test_get_compressed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "1.132153978.bz2")
+            with open(BASIC, "rb") as f, bz2.open(path, "wb") as f_out:
+                f_out.write(f.read())
+            self.assertEqual(self.market_index.get(path)["event_id"], "28270094")
+
+    def test_filter(self):
+        markets = [BASIC, SELF]
+        self.market_index.update(markets)
+        self.assertEqual(self.market_index.filter(markets), markets)
+        self.assertEqual(
+            self.market_index.filter(markets, market_types=["WIN"]), [BASIC]
+        )
+        self.assertEqual(
+            self.market_index.filter(markets, country_codes=["GB"]), markets
+        )
+        self.assertEqual(
+            self.market_index.filter(markets, event_ids=[30388764]), [SELF]
+        )
+        self.assertEqual(self.market_index.filter(markets, venues=["Ascot"]), [])
+        self.assertEqual(
+            self.market_index.filter(
+                markets, market_start_time={"from": "2021-01-01T00:00:00.000Z"}
+            ),
+            [SELF],
+        )
+        self.assertEqual(
+            self.market_index.filter(
+                markets, market_start_time={"to": datetime.datetime(2021, 1, 1)}
+            ),
+            [BASIC],
+        )
+
+    def test_filter_all(self):
+        self.market_index.update([BASIC, SELF])
+        self.assertEqual(
+            self.market_index.filter(market_types=["PLACE"]), [os.path.abspath(SELF)]
+        )
+
+    def test_persistent(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "index.db")
+            market_index = marketindex.MarketIndex(path)
+            market_index.update([BASIC])
+            market_index.close()
+            market_index = marketindex.MarketIndex(path)
+            self.assertEqual(len(market_index), 1)
+            self.assertEqual(market_index.update([BASIC]), 0)
+            market_index.close()
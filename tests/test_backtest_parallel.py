@@ -0,0 +1,78 @@
+import io
+import pickle
+import unittest
+from unittest import mock
+
+from flumine import FlumineBacktest, BaseStrategy
+from flumine.clients import ExchangeType
+from flumine.backtest import parallel
+
+
+class CreateJobsTest(unittest.TestCase):
+    def _create_stream(self, stream_id, market_filter, event_processing, event_id):
+        return mock.Mock(
+            stream_id=stream_id,
+            market_filter=market_filter,
+            event_processing=event_processing,
+            event_id=event_id,
+        )
+
+    def test_create_jobs(self):
+        streams = [self._create_stream(i, "1.%s" % i, False, None) for i in range(5)]
+        self.assertEqual(parallel.create_jobs(streams, 2), [[0, 1], [2, 3], [4]])
+
+    def test_create_jobs_event(self):
+        streams = [
+            self._create_stream(1, "1.1", True, "123"),
+            self._create_stream(2, "1.2", False, None),
+            self._create_stream(3, "1.3", True, "123"),
+            self._create_stream(4, "1.4", True, "123"),
+            self._create_stream(5, "1.5", True, "456"),
+        ]
+        self.assertEqual(parallel.create_jobs(streams, 2), [[1, 3, 4], [2, 5]])
+
+    def test_create_jobs_duplicate_market(self):
+        streams = [
+            self._create_stream(1, "1.1", False, None),
+            self._create_stream(2, "1.2", False, None),
+            self._create_stream(3, "1.1", False, None),
+        ]
+        self.assertEqual(parallel.create_jobs(streams, 1), [[1, 3], [2]])
+
+
+class ResultPicklerTest(unittest.TestCase):
+    def setUp(self):
+        self.mock_client = mock.Mock(EXCHANGE=ExchangeType.SIMULATED)
+        self.flumine = FlumineBacktest(self.mock_client)
+        self.strategy = BaseStrategy(market_filter={})
+        self.flumine.strategies(self.strategy, self.mock_client)
+        parallel._framework = self.flumine
+
+    def test_persistent_id(self):
+        pickler = parallel._ResultPickler(io.BytesIO())
+        self.assertEqual(pickler.persistent_id(self.flumine), ("flumine", None))
+        self.assertEqual(
+            pickler.persistent_id(self.strategy),
+            ("strategy", self.strategy.name_hash),
+        )
+        self.assertIsNone(pickler.persistent_id({}))
+
+    def test_round_trip(self):
+        f = io.BytesIO()
+        parallel._ResultPickler(f).dump(
+            {"flumine": self.flumine, "strategy": self.strategy, "value": 1}
+        )
+        result = parallel._ResultUnpickler(
+            io.BytesIO(f.getvalue()), self.flumine, {}
+        ).load()
+        self.assertIs(result["flumine"], self.flumine)
+        self.assertIs(result["strategy"], self.strategy)
+        self.assertEqual(result["value"], 1)
+
+    def test_persistent_load_error(self):
+        unpickler = parallel._ResultUnpickler(io.BytesIO(), self.flumine, {})
+        with self.assertRaises(pickle.UnpicklingError):
+            unpickler.persistent_load(("test", None))
+
+    def tearDown(self):
+        parallel._framework = None
@@ -0,0 +1,152 @@
+import unittest
+from unittest import mock
+
+from flumine import config
+from flumine.backtest.sweep import ParameterSweep
+from flumine.clients import BacktestClient
+from flumine.controls import BaseControl
+from flumine.controls.clientcontrols import MaxTransactionCount
+
+
+class ParameterSweepTest(unittest.TestCase):
+    def setUp(self):
+        self.mock_framework = mock.Mock()
+        self.mock_framework.client = BacktestClient(commission_base=0.02)
+        self.mock_strategy_class = mock.Mock(__name__="Strategy")
+        self.variants = [{"context": {"a": 1}}, {"context": {"a": 2}}]
+        self.sweep = ParameterSweep(
+            self.mock_framework,
+            self.mock_strategy_class,
+            self.variants,
+            max_order_exposure=10,
+        )
+
+    def test_init(self):
+        self.assertEqual(self.sweep.framework, self.mock_framework)
+        self.assertEqual(self.sweep.strategy_class, self.mock_strategy_class)
+        self.assertEqual(self.sweep.variants, self.variants)
+        self.assertEqual(self.sweep.name, "Strategy")
+        self.assertEqual(self.sweep.kwargs, {"max_order_exposure": 10})
+        self.assertEqual(self.sweep.strategies, [])
+
+    def test_add(self):
+        strategies = self.sweep.add()
+        self.mock_strategy_class.assert_has_calls(
+            [
+                mock.call(context={"a": 1}, max_order_exposure=10, name="Strategy_0"),
+                mock.call(context={"a": 2}, max_order_exposure=10, name="Strategy_1"),
+            ]
+        )
+        self.assertEqual(len(strategies), 2)
+        self.assertEqual(self.mock_framework.add_strategy.call_count, 2)
+        clients = [
+            c[1]["client"] for c in self.mock_framework.add_strategy.call_args_list
+        ]
+        self.assertNotEqual(clients[0], clients[1])
+        self.assertNotEqual(clients[0].id, clients[1].id)
+        self.assertEqual(
+            self.sweep.strategies,
+            [(strategies[0], self.variants[0]), (strategies[1], self.variants[1])],
+        )
+
+    @mock.patch("flumine.backtest.sweep.logger")
+    def test_add_isolation_warning(self, mock_logger):
+        config.simulated_strategy_isolation = False
+        try:
+            self.sweep.add()
+        finally:
+            config.simulated_strategy_isolation = True
+        mock_logger.warning.assert_called_once()
+
+    def test__create_client(self):
+        client = self.sweep._create_client()
+        self.assertIsNot(client, self.mock_framework.client)
+        self.assertNotEqual(client.id, self.mock_framework.client.id)
+        self.assertEqual(client.commission_base, 0.02)
+        self.assertEqual(client.execution, self.mock_framework.simulated_execution)
+        self.assertIsNotNone(client.account_details)
+        self.assertEqual(len(client.trading_controls), 1)
+        self.assertIsInstance(client.trading_controls[0], MaxTransactionCount)
+        self.assertEqual(client.trading_controls[0].client, client)
+        self.assertEqual(self.mock_framework.client.trading_controls, [])
+
+    def test__create_client_controls(self):
+        class MaxOrders(BaseControl):
+            NAME = "MAX_ORDERS"
+
+            def __init__(self, flumine, client, max_orders):
+                super(MaxOrders, self).__init__(flumine)
+                self.client = client
+                self.max_orders = max_orders
+                self.orders = []
+
+        main_client = self.mock_framework.client
+        main_client.trading_controls = [
+            MaxTransactionCount(self.mock_framework, main_client),
+            MaxOrders(self.mock_framework, main_client, max_orders=5),
+        ]
+        client = self.sweep._create_client()
+        self.assertEqual(len(client.trading_controls), 2)
+        transaction_count, max_orders = client.trading_controls
+        self.assertIsInstance(transaction_count, MaxTransactionCount)
+        self.assertIsNot(transaction_count, main_client.trading_controls[0])
+        self.assertEqual(transaction_count.client, client)
+        self.assertIsInstance(max_orders, MaxOrders)
+        self.assertIsNot(max_orders, main_client.trading_controls[1])
+        self.assertEqual(max_orders.client, client)
+        self.assertEqual(max_orders.flumine, self.mock_framework)
+        self.assertEqual(max_orders.max_orders, 5)
+        self.assertIsNot(max_orders.orders, main_client.trading_controls[1].orders)
+
+    def test_results(self):
+        mock_strategy_one = mock.Mock(name="one")
+        mock_strategy_one.name = "one"
+        mock_strategy_one.client.commission_base = 0.05
+        mock_strategy_two = mock.Mock()
+        mock_strategy_two.name = "two"
+        self.sweep.strategies = [
+            (mock_strategy_one, {"a": 1}),
+            (mock_strategy_two, {"a": 2}),
+        ]
+
+        def mock_order(strategy, size_matched, profit):
+            order = mock.Mock(size_matched=size_matched)
+            order.trade.strategy = strategy
+            order.simulated.profit = profit
+            return order
+
+        mock_market_one = mock.Mock(
+            blotter=[
+                mock_order(mock_strategy_one, 2, 4),
+                mock_order(mock_strategy_one, 2, -2),
+                mock_order(mock_strategy_one, 0, 0),
+                mock_order(mock.Mock(), 2, 10),
+            ]
+        )
+        mock_market_two = mock.Mock(blotter=[mock_order(mock_strategy_one, 5, -5)])
+        self.mock_framework.markets = [mock_market_one, mock_market_two]
+        self.assertEqual(
+            self.sweep.results(),
+            [
+                {
+                    "strategy": "one",
+                    "params": {"a": 1},
+                    "markets": 2,
+                    "bet_count": 3,
+                    "size_matched": 9,
+                    "profit": -3,
+                    "commission": 0.1,
+                    "net_profit": -3.1,
+                },
+                {
+                    "strategy": "two",
+                    "params": {"a": 2},
+                    "markets": 0,
+                    "bet_count": 0,
+                    "size_matched": 0,
+                    "profit": 0,
+                    "commission": 0,
+                    "net_profit": 0,
+                },
+            ],
+        )
@@ -4,40 +4,66 @@ from unittest import mock
 from flumine.backtest import utils
 
 
-class NewDateTimeTest(unittest.TestCase):
-    @mock.patch("flumine.backtest.utils.config")
-    def test_new_date_time(self, mock_config):
-        mock_config.current_time = 123
-        x = utils.NewDateTime
-        self.assertEqual(x.utcnow(), 123)
-
-
-class SimulatedDateTimeTest(unittest.TestCase):
+class PendingPackagesTest(unittest.TestCase):
     def setUp(self):
-        self.s = utils.SimulatedDateTime()
+        self.pending = utils.PendingPackages()
+        self.now = 1609459200000
+
+    def _create_package(self, market_id: str, delay: float, elapsed: float):
+        return mock.Mock(
+            market_id=market_id,
+            _time_created=self.now,
+            simulated_delay=delay,
+            elapsed_seconds=elapsed,
+        )
 
     def test_init(self):
-        self.assertIsNone(self.s._real_datetime)
-
-    @mock.patch("flumine.backtest.utils.config")
-    def test_reset_real_datetime(self, mock_config):
-        mock_real_datetime = mock.Mock()
-        self.s._real_datetime = mock_real_datetime
-        self.s.reset_real_datetime()
-        mock_real_datetime.utcnow.assert_called()
-        self.assertEqual(mock_config.current_time, mock_real_datetime.utcnow())
-
-    @mock.patch("flumine.backtest.utils.config")
-    def test_call(self, mock_config):
-        mock_dt = mock.Mock()
-        self.s(mock_dt)
-        self.assertEqual(mock_config.current_time, mock_dt)
-
-    @mock.patch("flumine.backtest.utils.config")
-    def test_context_manager(self, mock_config):
-        with self.s as datetime:
-            mock_config.current_time = 456
-            self.assertEqual(datetime.utcnow(), 456)
-        import datetime
-
-        self.assertIsInstance(datetime.datetime.utcnow(), datetime.datetime)
+        self.assertEqual(self.pending._markets, {})
+        self.assertEqual(len(self.pending), 0)
+        self.assertFalse(self.pending)
+
+    def test_append(self):
+        package = self._create_package("1.23", 0.12, 0)
+        self.pending.append(package)
+        self.assertEqual(len(self.pending), 1)
+        self.assertEqual(
+            self.pending._markets,
+            {"1.23": [(self.now + 120, 0, package)]},
+        )
+
+    def test_pop_due(self):
+        place = self._create_package("1.23", 1.12, 0.5)
+        cancel = self._create_package("1.23", 0.17, 0.5)
+        other = self._create_package("1.24", 0.17, 0.5)
+        for package in (place, cancel, other):
+            self.pending.append(package)
+        self.assertEqual(self.pending.pop_due("1.23"), [cancel])
+        self.assertEqual(self.pending.pop_due("1.23"), [])
+        self.assertEqual(self.pending.pop_due("1.25"), [])
+        self.assertEqual(len(self.pending), 2)
+        place.elapsed_seconds = 1.2
+        self.assertEqual(self.pending.pop_due("1.23"), [place])
+        self.assertNotIn("1.23", self.pending._markets)
+        self.assertEqual(list(self.pending), [other])
+
+    def test_pop_due_order(self):
+        place = self._create_package("1.23", 1.12, 2)
+        cancel = self._create_package("1.23", 0.17, 2)
+        self.pending.append(place)
+        self.pending.append(cancel)
+        # processed in the order added
+        self.assertEqual(self.pending.pop_due("1.23"), [place, cancel])
+        self.assertEqual(len(self.pending), 0)
+
+    def test_clear(self):
+        self.pending.append(self._create_package("1.23", 0.12, 0))
+        self.pending.clear()
+        self.assertEqual(self.pending._markets, {})
+        self.assertEqual(len(self.pending), 0)
+
+    def test_iter(self):
+        one = self._create_package("1.24", 0.12, 0)
+        two = self._create_package("1.23", 0.12, 0)
+        self.pending.append(one)
+        self.pending.append(two)
+        self.assertEqual(list(self.pending), [one, two])
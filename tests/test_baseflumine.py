@@ -1,7 +1,9 @@
 import unittest
 from unittest import mock
 
+from flumine import config
 from flumine.baseflumine import BaseFlumine, FlumineException
+from flumine.events.handlerqueue import HandlerQueue, ConflatedQueue
 
 
 class BaseFlumineTest(unittest.TestCase):
@@ -36,6 +38,16 @@ class BaseFlumineTest(unittest.TestCase):
         BaseFlumine(mock_client)
         mock_add_market_middleware.assert_called_with(mock_SimulatedMiddleware())
 
+    def test_init_conflate_market_books(self):
+        self.assertIsInstance(self.base_flumine.handler_queue, HandlerQueue)
+        config.conflate_market_books = True
+        try:
+            base_flumine = BaseFlumine(self.mock_client)
+        finally:
+            config.conflate_market_books = False
+        self.assertIsInstance(base_flumine.handler_queue, ConflatedQueue)
+        self.assertIn("handler_queue", base_flumine.info)
+
     def test_run(self):
         with self.assertRaises(NotImplementedError):
             self.base_flumine.run()
@@ -43,7 +55,7 @@ class BaseFlumineTest(unittest.TestCase):
     @mock.patch("flumine.baseflumine.events")
     @mock.patch("flumine.baseflumine.BaseFlumine.log_control")
     def test_add_strategy(self, mock_log_control, mock_events):
-        mock_strategy = mock.Mock(market_filter={})
+        mock_strategy = mock.Mock(market_filter={}, stream_ids=[])
         mock_client = mock.Mock()
         self.base_flumine.add_strategy(mock_strategy, mock_client)
         self.assertEqual(len(self.base_flumine.strategies), 1)
@@ -97,6 +109,34 @@ class BaseFlumineTest(unittest.TestCase):
         mock_event.event = [mock_market_book]
         self.base_flumine._process_market_books(mock_event)
 
+    @mock.patch(
+        "flumine.baseflumine.utils.call_strategy_error_handling", return_value=True
+    )
+    def test__process_market_books_stream_strategies(
+        self, mock_call_strategy_error_handling
+    ):
+        mock_strategy_one = mock.Mock(stream_ids=[1])
+        mock_strategy_two = mock.Mock(stream_ids=[2])
+        self.base_flumine.strategies(mock_strategy_one, mock.Mock())
+        self.base_flumine.strategies(mock_strategy_two, mock.Mock())
+        mock_market_book = mock.Mock(
+            publish_time_epoch=123, streaming_unique_id=2, status="OPEN"
+        )
+        mock_event = mock.Mock(event=[mock_market_book])
+        self.base_flumine._process_market_books(mock_event)
+        mock_market = self.base_flumine.markets.markets[mock_market_book.market_id]
+        mock_call_strategy_error_handling.assert_has_calls(
+            [
+                mock.call(
+                    mock_strategy_two.check_market, mock_market, mock_market_book
+                ),
+                mock.call(
+                    mock_strategy_two.process_market_book, mock_market, mock_market_book
+                ),
+            ]
+        )
+        self.assertEqual(mock_call_strategy_error_handling.call_count, 2)
+
     def test_process_order_package(self):
         mock_order_package = mock.Mock()
         self.base_flumine.process_order_package(mock_order_package)
@@ -136,6 +176,20 @@ class BaseFlumineTest(unittest.TestCase):
         self.base_flumine._process_raw_data(mock_event)
         mock__add_market.assert_called_with("1.23", None)
 
+    @mock.patch("flumine.baseflumine.BaseFlumine._add_market")
+    def test__process_raw_data_stream_strategies(self, mock__add_market):
+        mock_strategy_one = mock.Mock(stream_ids=[12])
+        mock_strategy_two = mock.Mock(stream_ids=[13])
+        self.base_flumine.strategies(mock_strategy_one, mock.Mock())
+        self.base_flumine.strategies(mock_strategy_two, mock.Mock())
+        mock_event = mock.Mock()
+        mock_event.event = (12, "AAA", 12345, [{"id": "1.23"}])
+        self.base_flumine._process_raw_data(mock_event)
+        mock_strategy_one.process_raw_data.assert_called_with(
+            "AAA", 12345, {"id": "1.23"}
+        )
+        mock_strategy_two.process_raw_data.assert_not_called()
+
     @mock.patch("flumine.baseflumine.events")
     @mock.patch("flumine.baseflumine.BaseFlumine._add_market")
     def test__process_raw_data_closed(self, mock__add_market, mock_events):
@@ -177,12 +231,71 @@ class BaseFlumineTest(unittest.TestCase):
         mock_log_control.assert_called_with(mock_events.MarketEvent(mock_market))
         self.assertFalse(mock_market.update_market_catalogue)
 
-    def test__process_current_orders(self):
-        mock_event = mock.Mock()
-        mock_current_orders = mock.Mock()
-        mock_current_orders.orders = []
-        mock_event.event = [mock_current_orders]
+    @mock.patch("flumine.baseflumine.process_current_orders")
+    def test__process_current_orders(self, mock_process_current_orders):
+        mock_strategy = mock.Mock(process_orders_on_change=False)
+        mock_order = mock.Mock(complete=True, changed=False)
+        mock_market = mock.Mock(closed=False)
+        mock_market.blotter.live_orders = [mock_order]
+        mock_market.blotter.pop_changed_orders.return_value = []
+        self.base_flumine.markets._markets = {"1.1": mock_market}
+        self.base_flumine.strategies = [mock_strategy]
+        mock_event = mock.Mock(event=[])
         self.base_flumine._process_current_orders(mock_event)
+        mock_process_current_orders.assert_not_called()
+        # all markets processed (strategy not process_orders_on_change)
+        mock_market.blotter.complete_order.assert_called_with(mock_order)
+        mock_strategy.process_orders.assert_called_with(
+            mock_market, mock_market.blotter.strategy_orders(mock_strategy)
+        )
+
+    @mock.patch("flumine.baseflumine.process_current_orders", return_value=["1.1"])
+    def test__process_current_orders_changed(self, mock_process_current_orders):
+        mock_strategy = mock.Mock(process_orders_on_change=True)
+        mock_order = mock.Mock(complete=True, changed=True)
+        mock_order.trade.strategy = mock_strategy
+        mock_order_two = mock.Mock(complete=False, changed=False)
+        mock_market = mock.Mock(closed=False)
+        mock_market.blotter.live_orders = [mock_order, mock_order_two]
+        mock_market.blotter.pop_changed_orders.return_value = [
+            mock_order,
+            mock_order_two,
+        ]
+        mock_market_two = mock.Mock(closed=False)
+        self.base_flumine.markets._markets = {
+            "1.1": mock_market,
+            "1.2": mock_market_two,
+        }
+        self.base_flumine.strategies = [mock_strategy]
+        mock_event = mock.Mock(event=[mock.Mock()])
+        self.base_flumine._process_current_orders(mock_event)
+        mock_process_current_orders.assert_called_with(
+            self.base_flumine.markets,
+            self.base_flumine.strategies,
+            mock_event,
+            self.base_flumine.log_control,
+            self.base_flumine._add_market,
+        )
+        mock_market.blotter.complete_order.assert_called_once_with(mock_order)
+        self.assertFalse(mock_order.changed)
+        mock_strategy.process_orders.assert_called_once_with(
+            mock_market,
+            mock_market.blotter.strategy_orders(mock_strategy),
+            [mock_order],
+        )
+        # market not in update (all strategies process_orders_on_change)
+        mock_market_two.blotter.pop_changed_orders.assert_not_called()
+
+    def test__process_strategy_orders(self):
+        mock_strategy = mock.Mock(process_orders_on_change=False)
+        mock_strategy_two = mock.Mock(process_orders_on_change=True)
+        mock_market = mock.Mock()
+        self.base_flumine.strategies = [mock_strategy, mock_strategy_two]
+        self.base_flumine._process_strategy_orders(mock_market, {})
+        mock_strategy.process_orders.assert_called_with(
+            mock_market, mock_market.blotter.strategy_orders(mock_strategy)
+        )
+        mock_strategy_two.process_orders.assert_not_called()
 
     def test__process_custom_event(self):
         mock_market = mock.Mock()
@@ -222,7 +335,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, mock.Mock())
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         self.base_flumine.markets._markets = {"1.23": mock_market}
         mock_event = mock.Mock()
@@ -242,7 +355,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market_datum(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, mock.Mock())
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         self.base_flumine.markets._markets = {"1.23": mock_market}
         mock_event = mock.Mock()
@@ -273,7 +386,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market_closed(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, mock.Mock())
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         self.base_flumine.markets._markets = {
@@ -309,7 +422,7 @@ class BaseFlumineTest(unittest.TestCase):
         self.base_flumine.client.paper_trade = True
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies(mock_strategy, mock.Mock())
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         mock_market.cleared.return_value = {}
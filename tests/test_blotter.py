@@ -1,9 +1,22 @@
+import random
 import unittest
 from unittest import mock
 
-from flumine.markets.blotter import Blotter
-from flumine.order.order import OrderStatus
-from flumine.order.ordertype import MarketOnCloseOrder, LimitOrder, LimitOnCloseOrder
+from flumine import config
+from flumine.markets.blotter import Blotter, ExposureLedger, OrderIndex, PriceLevels
+from flumine.order.order import BetfairOrder, OrderStatus
+from flumine.order.trade import Trade
+from flumine.utils import (
+    PRICES_FLOAT,
+    calculate_matched_exposure,
+    calculate_unmatched_exposure,
+)
+from flumine.order.ordertype import (
+    MarketOnCloseOrder,
+    LimitOrder,
+    LimitOnCloseOrder,
+    OrderTypes,
+)
 
 
 class BlotterTest(unittest.TestCase):
@@ -15,10 +28,16 @@ class BlotterTest(unittest.TestCase):
         self.assertFalse(self.blotter.active)
         self.assertEqual(self.blotter._orders, {})
         self.assertEqual(self.blotter._bet_id_lookup, {})
-        self.assertEqual(self.blotter._live_orders, [])
+        self.assertEqual(self.blotter._live_orders, {})
         self.assertEqual(self.blotter._trades, {})
         self.assertEqual(self.blotter._strategy_orders, {})
         self.assertEqual(self.blotter._strategy_selection_orders, {})
+        self.assertEqual(self.blotter._strategy_live_orders, {})
+        self.assertIsInstance(self.blotter._status_index, OrderIndex)
+        self.assertIsInstance(self.blotter._matched_index, OrderIndex)
+        self.assertEqual(self.blotter._resting_orders, {})
+        self.assertEqual(self.blotter._exposure_ledgers, {})
+        self.assertEqual(self.blotter._changed_orders, {})
 
     def test_get_order_bet_id(self):
         self.assertIsNone(self.blotter.get_order_bet_id("123"))
@@ -97,12 +116,29 @@ class BlotterTest(unittest.TestCase):
     def test_live_orders(self):
         self.assertEqual(list(self.blotter.live_orders), [])
         mock_order = mock.Mock(complete=False)
-        self.blotter._live_orders = [mock_order]
+        self.blotter._live_orders = {mock_order.id: mock_order}
         self.assertEqual(list(self.blotter.live_orders), [mock_order])
 
+    def test_strategy_live_orders(self):
+        mock_order = mock.Mock(lookup=(1, 2, 3))
+        self.blotter["123"] = mock_order
+        self.assertEqual(
+            list(self.blotter.strategy_live_orders(mock_order.trade.strategy)),
+            [mock_order],
+        )
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(
+            list(self.blotter.strategy_live_orders(mock_order.trade.strategy)), []
+        )
+
+    def test_orders(self):
+        mock_order = mock.Mock(lookup=(1, 2, 3))
+        self.blotter["123"] = mock_order
+        self.assertEqual(list(self.blotter.orders), [mock_order])
+
     def test_has_live_orders(self):
         self.assertFalse(self.blotter.has_live_orders)
-        self.blotter._live_orders = [mock.Mock()]
+        self.blotter._live_orders = {"123": mock.Mock()}
         self.assertTrue(self.blotter.has_live_orders)
 
     def test_process_closed_market(self):
@@ -180,6 +216,19 @@ class BlotterTest(unittest.TestCase):
             },
         )
 
+    def test_get_exposures_no_orders(self):
+        self.assertEqual(
+            self.blotter.get_exposures(mock.Mock(), (self.blotter.market_id, 123, 0)),
+            {
+                "matched_profit_if_lose": 0.0,
+                "matched_profit_if_win": 0.0,
+                "worst_possible_profit_on_lose": 0.0,
+                "worst_possible_profit_on_win": 0.0,
+                "worst_potential_unmatched_profit_if_lose": 0.0,
+                "worst_potential_unmatched_profit_if_win": 0.0,
+            },
+        )
+
     def test_get_exposures_with_exclusion(self):
         mock_strategy = mock.Mock()
         mock_trade = mock.Mock(strategy=mock_strategy)
@@ -524,8 +573,40 @@ class BlotterTest(unittest.TestCase):
         )
 
     def test_complete_order(self):
-        self.blotter._live_orders = ["test"]
-        self.blotter.complete_order("test")
+        mock_order = mock.Mock()
+        self.blotter._live_orders = {mock_order.id: mock_order}
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(self.blotter._live_orders, {})
+        # already complete
+        self.blotter.complete_order(mock_order)
+
+    def test_complete_order_resting(self):
+        mock_order = mock.Mock(
+            lookup=(1, 2, 3), selection_id=2, handicap=3, side="BACK"
+        )
+        mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order.order_type.price = 2.0
+        self.blotter["123"] = mock_order
+        self.assertEqual(len(self.blotter.resting_orders(2, 3, "BACK")), 1)
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(len(self.blotter.resting_orders(2, 3, "BACK")), 0)
+
+    def test_resting_orders(self):
+        self.assertIsNone(self.blotter.resting_orders(2, 3, "BACK"))
+        mock_order = mock.Mock(lookup=(1, 2, 3), selection_id=2, handicap=3, side="LAY")
+        mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order.order_type.price = 2.0
+        mock_order_moc = mock.Mock(
+            lookup=(1, 2, 3), selection_id=2, handicap=3, side="LAY"
+        )
+        mock_order_moc.order_type.ORDER_TYPE = OrderTypes.MARKET_ON_CLOSE
+        self.blotter["123"] = mock_order
+        self.blotter["456"] = mock_order_moc
+        self.assertIsNone(self.blotter.resting_orders(2, 3, "BACK"))
+        self.assertEqual(
+            list(self.blotter.resting_orders(2, 3, "LAY").ascending(1000)),
+            [mock_order],
+        )
 
     def test_has_trade(self):
         self.assertFalse(self.blotter.has_trade("123"))
@@ -543,7 +624,7 @@ class BlotterTest(unittest.TestCase):
         self.assertTrue(self.blotter.active)
         self.assertEqual(self.blotter._orders, {"123": mock_order})
         self.assertEqual(self.blotter._bet_id_lookup, {"456": mock_order})
-        self.assertEqual(self.blotter._live_orders, [mock_order])
+        self.assertEqual(self.blotter._live_orders, {mock_order.id: mock_order})
         self.assertEqual(self.blotter._trades, {mock_order.trade.id: [mock_order]})
         self.assertEqual(
             self.blotter._strategy_orders, {mock_order.trade.strategy: [mock_order]}
@@ -552,6 +633,61 @@ class BlotterTest(unittest.TestCase):
             self.blotter._strategy_selection_orders,
             {(mock_order.trade.strategy, 2, 3): [mock_order]},
         )
+        self.assertEqual(
+            self.blotter._strategy_live_orders,
+            {mock_order.trade.strategy: {mock_order.id: mock_order}},
+        )
+        self.assertEqual(mock_order.blotter, self.blotter)
+
+    def test_pop_changed_orders(self):
+        mock_order = mock.Mock(lookup=(1, 2, 3), changed=True)
+        mock_order_two = mock.Mock(lookup=(1, 2, 3), changed=False)
+        self.blotter["123"] = mock_order
+        self.blotter["456"] = mock_order_two
+        self.assertEqual(self.blotter._changed_orders, {mock_order.id: mock_order})
+        self.blotter.order_changed(mock_order_two)
+        self.blotter.order_changed(mock_order)
+        self.assertEqual(
+            self.blotter.pop_changed_orders(), [mock_order, mock_order_two]
+        )
+        self.assertEqual(self.blotter.pop_changed_orders(), [])
+        # complete (no longer live)
+        self.blotter.complete_order(mock_order)
+        self.blotter.order_changed(mock_order)
+        self.assertEqual(self.blotter.pop_changed_orders(), [mock_order])
+
+    def test_order_changed(self):
+        mock_order = mock.Mock(
+            lookup=(1, 2, 3), status=OrderStatus.PENDING, size_matched=0
+        )
+        self.blotter["123"] = mock_order
+        self.assertEqual(
+            self.blotter.strategy_orders(
+                mock_order.trade.strategy, order_status=OrderStatus.PENDING
+            ),
+            [mock_order],
+        )
+        mock_order.status = OrderStatus.EXECUTABLE
+        mock_order.size_matched = 2
+        self.blotter.order_changed(mock_order)
+        self.assertEqual(
+            self.blotter.strategy_orders(
+                mock_order.trade.strategy, order_status=OrderStatus.PENDING
+            ),
+            [],
+        )
+        self.assertEqual(
+            self.blotter.strategy_orders(
+                mock_order.trade.strategy, order_status=OrderStatus.EXECUTABLE
+            ),
+            [mock_order],
+        )
+        self.assertEqual(
+            self.blotter.strategy_selection_orders(
+                mock_order.trade.strategy, 2, 3, matched_only=True
+            ),
+            [mock_order],
+        )
 
     def test__getitem(self):
         self.blotter._orders = {"12345": "test", "54321": "test2"}
@@ -561,3 +697,459 @@ class BlotterTest(unittest.TestCase):
     def test__len(self):
         self.blotter._orders = {"12345": "test", "54321": "test"}
         self.assertEqual(len(self.blotter), 2)
+
+
+class PriceLevelsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.price_levels = PriceLevels()
+
+    def _create_order(self, price):
+        mock_order = mock.Mock()
+        mock_order.order_type.price = price
+        self.price_levels.add(mock_order)
+        return mock_order
+
+    def test_init(self):
+        self.assertEqual(self.price_levels.prices, [])
+        self.assertEqual(self.price_levels.levels, {})
+        self.assertEqual(len(self.price_levels), 0)
+
+    def test_add(self):
+        order_one = self._create_order(3.0)
+        order_two = self._create_order(2.0)
+        order_three = self._create_order(3.0)
+        self.assertEqual(self.price_levels.prices, [2.0, 3.0])
+        self.assertEqual(
+            self.price_levels.levels,
+            {2.0: [order_two], 3.0: [order_one, order_three]},
+        )
+        self.assertEqual(len(self.price_levels), 3)
+
+    def test_remove(self):
+        order_one = self._create_order(3.0)
+        order_two = self._create_order(2.0)
+        self.price_levels.remove(order_one)
+        self.price_levels.remove(order_one)
+        self.assertEqual(self.price_levels.prices, [2.0])
+        self.assertEqual(self.price_levels.levels, {2.0: [order_two]})
+        self.price_levels.remove(order_two)
+        self.assertEqual(self.price_levels.prices, [])
+        self.assertEqual(self.price_levels.levels, {})
+
+    def test_ascending(self):
+        order_one = self._create_order(3.0)
+        order_two = self._create_order(2.0)
+        order_three = self._create_order(3.0)
+        order_four = self._create_order(4.0)
+        self.assertEqual(
+            list(self.price_levels.ascending(3.0)),
+            [order_two, order_one, order_three],
+        )
+        self.assertEqual(list(self.price_levels.ascending(1.01)), [])
+
+    def test_descending(self):
+        order_one = self._create_order(3.0)
+        order_two = self._create_order(2.0)
+        order_three = self._create_order(3.0)
+        order_four = self._create_order(4.0)
+        self.assertEqual(
+            list(self.price_levels.descending(3.0)),
+            [order_four, order_one, order_three],
+        )
+        self.assertEqual(list(self.price_levels.descending(1000)), [])
+
+
+class OrderIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = OrderIndex(lambda o: o.status)
+
+    def _create_order(self, status):
+        mock_order = mock.Mock(lookup=(1, 2, 3), status=status)
+        mock_order.trade.strategy = "test"
+        self.index.add(mock_order)
+        return mock_order
+
+    def test_init(self):
+        self.assertEqual(self.index.groups, {})
+        self.assertEqual(self.index.keys, {})
+        self.assertEqual(self.index.sequence, {})
+        self.assertEqual(self.index._sorted, {})
+        self.assertEqual(self.index._changed_orders, {})
+
+    def test_add(self):
+        mock_order = self._create_order(OrderStatus.PENDING)
+        self.assertEqual(self.index.sequence, {mock_order.id: 0})
+        self.assertEqual(self.index._changed_orders, {mock_order.id: mock_order})
+
+    def test_update(self):
+        mock_order = self._create_order(OrderStatus.PENDING)
+        self.assertEqual(self.index.get("test", OrderStatus.PENDING), [mock_order])
+        mock_order.status = OrderStatus.EXECUTABLE
+        self.index.update(mock_order)
+        self.assertEqual(self.index.get("test", OrderStatus.PENDING), [])
+        self.assertEqual(self.index.get("test", OrderStatus.EXECUTABLE), [mock_order])
+        self.assertEqual(
+            self.index.get("test", 2, 3, OrderStatus.EXECUTABLE), [mock_order]
+        )
+        self.assertEqual(self.index.keys, {mock_order.id: OrderStatus.EXECUTABLE})
+
+    def test_get_insertion_order(self):
+        mock_order_one = self._create_order(OrderStatus.PENDING)
+        mock_order_two = self._create_order(OrderStatus.EXECUTABLE)
+        self.index.get("test", OrderStatus.EXECUTABLE)
+        mock_order_one.status = OrderStatus.EXECUTABLE
+        self.index.update(mock_order_one)
+        self.assertEqual(
+            self.index.get("test", OrderStatus.EXECUTABLE),
+            [mock_order_one, mock_order_two],
+        )
+
+    def test_get_missing(self):
+        self.assertEqual(self.index.get("test", OrderStatus.PENDING), [])
+        self.assertEqual(self.index.groups, {})
+
+    def test_get_cached(self):
+        mock_order_one = self._create_order(OrderStatus.EXECUTABLE)
+        orders = self.index.get("test", OrderStatus.EXECUTABLE)
+        self.assertEqual(orders, [mock_order_one])
+        self.assertEqual(
+            self.index._sorted, {("test", OrderStatus.EXECUTABLE): [mock_order_one]}
+        )
+        orders.append(1)  # copy returned
+        self.assertEqual(
+            self.index.get("test", OrderStatus.EXECUTABLE), [mock_order_one]
+        )
+        # newest order appended
+        mock_order_two = self._create_order(OrderStatus.EXECUTABLE)
+        self.assertEqual(
+            self.index.get("test", OrderStatus.EXECUTABLE),
+            [mock_order_one, mock_order_two],
+        )
+        # removed from group
+        mock_order_one.status = OrderStatus.EXECUTION_COMPLETE
+        self.index.update(mock_order_one)
+        self.assertEqual(
+            self.index.get("test", OrderStatus.EXECUTABLE), [mock_order_two]
+        )
+        # older order added back
+        mock_order_one.status = OrderStatus.EXECUTABLE
+        self.index.update(mock_order_one)
+        self.assertEqual(
+            self.index.get("test", OrderStatus.EXECUTABLE),
+            [mock_order_one, mock_order_two],
+        )
+
+
+class ExposureLedgerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ledger = ExposureLedger()
+
+    def _create_order(self, **kwargs):
+        mock_order = mock.Mock(
+            side="BACK",
+            status=OrderStatus.EXECUTABLE,
+            complete=False,
+            average_price_matched=3.0,
+            size_matched=2.0,
+            size_remaining=4.0,
+            order_type=LimitOrder(price=5.0, size=6.0),
+        )
+        for key, value in kwargs.items():
+            setattr(mock_order, key, value)
+        return mock_order
+
+    def test_init(self):
+        self.assertEqual(self.ledger.contributions, {})
+        self.assertEqual(self.ledger.invalid, {})
+        self.assertEqual(self.ledger.totals, [0.0] * 6)
+        self.assertEqual(self.ledger._changed_orders, {})
+
+    def test_update(self):
+        mock_order = self._create_order()
+        self.ledger.update(mock_order)
+        self.assertEqual(self.ledger._changed_orders, {mock_order.id: mock_order})
+        self.assertEqual(self.ledger.contributions, {})
+
+    def test_calculate_back(self):
+        self.assertEqual(
+            ExposureLedger.calculate(self._create_order()),
+            (4.0, -2.0, 0.0, -4.0, 0.0, 0.0),
+        )
+
+    def test_calculate_lay(self):
+        self.assertEqual(
+            ExposureLedger.calculate(self._create_order(side="LAY")),
+            (-4.0, 2.0, -16.0, 0.0, 0.0, 0.0),
+        )
+
+    def test_calculate_complete(self):
+        self.assertEqual(
+            ExposureLedger.calculate(self._create_order(complete=True)),
+            (4.0, -2.0, 0.0, 0.0, 0.0, 0.0),
+        )
+
+    def test_calculate_pending(self):
+        for status in [
+            OrderStatus.PENDING,
+            OrderStatus.VIOLATION,
+            OrderStatus.EXPIRED,
+        ]:
+            self.assertEqual(
+                ExposureLedger.calculate(self._create_order(status=status)),
+                ExposureLedger.EMPTY,
+            )
+
+    def test_calculate_market_on_close(self):
+        order_type = MarketOnCloseOrder(liability=10.0)
+        self.assertEqual(
+            ExposureLedger.calculate(self._create_order(order_type=order_type)),
+            (0.0, 0.0, 0.0, 0.0, 0.0, -10.0),
+        )
+        self.assertEqual(
+            ExposureLedger.calculate(
+                self._create_order(side="LAY", order_type=order_type)
+            ),
+            (0.0, 0.0, 0.0, 0.0, -10.0, 0.0),
+        )
+
+    def test_exposures_updated(self):
+        mock_order = self._create_order()
+        self.ledger.update(mock_order)
+        self.assertEqual(self.ledger.exposures()["worst_possible_profit_on_lose"], -6)
+        mock_order.size_matched = 6.0
+        mock_order.size_remaining = 0.0
+        mock_order.complete = True
+        self.ledger.update(mock_order)
+        self.assertEqual(
+            self.ledger.exposures(),
+            {
+                "matched_profit_if_lose": -6.0,
+                "matched_profit_if_win": 12.0,
+                "worst_possible_profit_on_lose": -6.0,
+                "worst_possible_profit_on_win": 12.0,
+                "worst_potential_unmatched_profit_if_lose": 0.0,
+                "worst_potential_unmatched_profit_if_win": 0.0,
+            },
+        )
+        self.assertEqual(self.ledger._changed_orders, {})
+
+    def test_exposures_exclusion(self):
+        mock_order = self._create_order()
+        mock_order_two = self._create_order(side="LAY")
+        self.ledger.update(mock_order)
+        self.ledger.update(mock_order_two)
+        self.assertEqual(
+            self.ledger.exposures(exclusion=mock_order_two),
+            {
+                "matched_profit_if_lose": -2.0,
+                "matched_profit_if_win": 4.0,
+                "worst_possible_profit_on_lose": -6.0,
+                "worst_possible_profit_on_win": 4.0,
+                "worst_potential_unmatched_profit_if_lose": -4.0,
+                "worst_potential_unmatched_profit_if_win": 0.0,
+            },
+        )
+        self.assertEqual(self.ledger.exposures()["matched_profit_if_win"], 0.0)
+
+    def test_exposures_invalid(self):
+        mock_order = self._create_order(order_type=mock.Mock(ORDER_TYPE="INVALID"))
+        self.ledger.update(mock_order)
+        with self.assertRaises(ValueError):
+            self.ledger.exposures()
+        self.assertEqual(
+            self.ledger.exposures(exclusion=mock_order)["matched_profit_if_win"], 0.0
+        )
+
+    def test_exposures_match_recalculation(self):
+        # running totals after many fills/cancels/moc
+        # scaling equal totals calculated from scratch
+        rnd = random.Random(1)
+        orders = [
+            self._create_order(side=rnd.choice(["BACK", "LAY"])) for _ in range(10)
+        ] + [
+            self._create_order(
+                side=rnd.choice(["BACK", "LAY"]),
+                order_type=MarketOnCloseOrder(liability=round(rnd.uniform(2, 50), 2)),
+            )
+            for _ in range(5)
+        ]
+        for _ in range(1000):
+            order = rnd.choice(orders)
+            if order.order_type.ORDER_TYPE == OrderTypes.MARKET_ON_CLOSE:
+                order.order_type.liability = round(
+                    order.order_type.liability * rnd.uniform(0.5, 1), 2
+                )
+            else:
+                order.size_matched = round(rnd.uniform(0, 6), 2)
+                order.size_remaining = round(6 - order.size_matched, 2)
+                order.average_price_matched = rnd.choice(PRICES_FLOAT[:150])
+                order.complete = rnd.random() < 0.2
+            self.ledger.update(order)
+            self.ledger.exposures()
+        ledger = ExposureLedger()
+        for order in orders:
+            ledger.update(order)
+        self.assertEqual(self.ledger.exposures(), ledger.exposures())
+
+
+def calculate_exposures(blotter, strategy, lookup: tuple, exclusion=None) -> dict:
+    """Full (O(orders)) exposure calculation used to
+    check the ExposureLedger"""
+    mb, ml, ub, ul = [], [], [], []
+    moc_win_liability, moc_lose_liability = 0.0, 0.0
+    for order in blotter.strategy_selection_orders(strategy, *lookup[1:]):
+        if order == exclusion or order.status in [
+            OrderStatus.PENDING,
+            OrderStatus.VIOLATION,
+            OrderStatus.EXPIRED,
+        ]:
+            continue
+        if order.order_type.ORDER_TYPE == OrderTypes.LIMIT:
+            if order.size_matched:
+                matched = mb if order.side == "BACK" else ml
+                matched.append((order.average_price_matched, order.size_matched))
+            if not order.complete and order.order_type.price and order.size_remaining:
+                unmatched = ub if order.side == "BACK" else ul
+                unmatched.append((order.order_type.price, order.size_remaining))
+        elif order.side == "BACK":
+            moc_lose_liability -= order.order_type.liability
+        else:
+            moc_win_liability -= order.order_type.liability
+    matched_exposure = calculate_matched_exposure(mb, ml)
+    unmatched_exposure = calculate_unmatched_exposure(ub, ul)
+    return {
+        "matched_profit_if_win": matched_exposure[0],
+        "matched_profit_if_lose": matched_exposure[1],
+        "worst_potential_unmatched_profit_if_win": unmatched_exposure[0],
+        "worst_potential_unmatched_profit_if_lose": unmatched_exposure[1],
+        "worst_possible_profit_on_win": matched_exposure[0]
+        + unmatched_exposure[0]
+        + moc_win_liability,
+        "worst_possible_profit_on_lose": matched_exposure[1]
+        + unmatched_exposure[1]
+        + moc_lose_liability,
+    }
+
+
+class BlotterPropertyTest(unittest.TestCase):
+    """
+    Random order lifecycles (place, partial fills,
+    cancels, voids, completion), indexes checked
+    against filtering all orders and exposures
+    against the full calculation after every
+    change. Exposure summation
+    order differs so half penny values can round
+    either way, a penny per rounded total.
+    """
+
+    SEEDS = range(20)
+    STEPS = 200
+
+    def setUp(self) -> None:
+        config.simulated = True
+
+    def tearDown(self) -> None:
+        config.simulated = False
+
+    def test_exposures_match_full_calculation(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                self._run(random.Random(seed))
+
+    def _run(self, rnd: random.Random) -> None:
+        blotter = Blotter("1.23")
+        strategies = [mock.Mock(), mock.Mock()]
+        lookups = [(blotter.market_id, selection_id, 0) for selection_id in (1, 2, 3)]
+        for _ in range(self.STEPS):
+            orders = list(blotter)
+            live_orders = [
+                o
+                for o in orders
+                if o.status == OrderStatus.EXECUTABLE
+                and o.order_type.ORDER_TYPE == OrderTypes.LIMIT
+                and o.size_remaining > 0
+            ]
+            action = rnd.random()
+            if action < 0.3 or not live_orders:
+                self._place(rnd, blotter, rnd.choice(strategies), rnd.choice(lookups))
+            elif action < 0.7:
+                order = rnd.choice(live_orders)
+                size = round(rnd.uniform(0.01, order.size_remaining), 2)
+                price = rnd.choice(PRICES_FLOAT[:150])
+                order.simulated._update_matched([0, price, size])
+                if order.size_remaining == 0:
+                    order.execution_complete()
+            elif action < 0.85:
+                order = rnd.choice(live_orders)
+                order.simulated.size_cancelled += round(
+                    rnd.uniform(0.01, order.size_remaining), 2
+                )
+                if rnd.random() < 0.5:
+                    order.execution_complete()
+            elif action < 0.95:
+                order = rnd.choice(live_orders)
+                order.simulated.matched = []
+                order.simulated.size_voided = order.order_type.size
+                order.execution_complete()
+            else:
+                rnd.choice(orders).violation("test")
+            self._check_indexes(blotter, strategies, lookups)
+            exclusion = rnd.choice(orders) if orders and rnd.random() < 0.2 else None
+            for strategy in strategies:
+                for lookup in lookups:
+                    exposures = blotter.get_exposures(strategy, lookup, exclusion)
+                    expected = calculate_exposures(blotter, strategy, lookup, exclusion)
+                    self.assertEqual(exposures.keys(), expected.keys())
+                    for key, value in expected.items():
+                        delta = 0.02 if key.startswith("worst_possible") else 0.01
+                        self.assertAlmostEqual(
+                            exposures[key], value, delta=delta + 1e-9
+                        )
+
+    def _check_indexes(self, blotter, strategies: list, lookups: list) -> None:
+        for strategy in strategies:
+            orders = blotter.strategy_orders(strategy)
+            for status in (OrderStatus.EXECUTABLE, OrderStatus.EXECUTION_COMPLETE):
+                self.assertEqual(
+                    blotter.strategy_orders(strategy, order_status=status),
+                    [o for o in orders if o.status == status],
+                )
+            self.assertEqual(
+                blotter.strategy_orders(strategy, matched_only=True),
+                [o for o in orders if o.size_matched > 0],
+            )
+            for lookup in lookups:
+                orders = blotter.strategy_selection_orders(strategy, *lookup[1:])
+                self.assertEqual(
+                    blotter.strategy_selection_orders(
+                        strategy,
+                        *lookup[1:],
+                        order_status=OrderStatus.EXECUTION_COMPLETE,
+                        matched_only=True,
+                    ),
+                    [
+                        o
+                        for o in orders
+                        if o.status == OrderStatus.EXECUTION_COMPLETE
+                        and o.size_matched > 0
+                    ],
+                )
+
+    def _place(self, rnd: random.Random, blotter, strategy, lookup: tuple) -> None:
+        trade = Trade(lookup[0], lookup[1], lookup[2], strategy)
+        side = rnd.choice(["BACK", "LAY"])
+        price = rnd.choice(PRICES_FLOAT[:150])
+        order_type = rnd.random()
+        if order_type < 0.8:
+            order_type = LimitOrder(price=price, size=round(rnd.uniform(2, 50), 2))
+        elif order_type < 0.9:
+            order_type = LimitOnCloseOrder(
+                price=price, liability=round(rnd.uniform(2, 50), 2)
+            )
+        else:
+            order_type = MarketOnCloseOrder(liability=round(rnd.uniform(2, 50), 2))
+        order = BetfairOrder(trade, side, order_type)
+        blotter[order.id] = order
+        order.placing()
+        if rnd.random() < 0.9:
+            order.executable()
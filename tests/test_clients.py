@@ -25,6 +25,7 @@ class BaseClientTest(unittest.TestCase):
         self.assertIsNone(self.base_client.account_funds)
         self.assertEqual(self.base_client.commission_paid, 0)
         self.assertIsNone(self.base_client.execution)
+        self.assertIsNone(self.base_client.simulated_order_stream)
         self.assertEqual(self.base_client.trading_controls, [])
         self.assertTrue(self.base_client.order_stream)
         self.assertTrue(self.base_client.best_price_execution)
@@ -0,0 +1,111 @@
+import time
+import unittest
+import threading
+import datetime
+from unittest import mock
+
+from flumine import clock
+
+
+class RealClockTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = clock.RealClock()
+
+    def test_time(self):
+        self.assertAlmostEqual(self.clock.time(), time.time() * 1e3, delta=1000)
+
+    def test_utcnow(self):
+        self.assertIsInstance(self.clock.utcnow(), datetime.datetime)
+
+
+class SimulatedClockTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = clock.SimulatedClock()
+
+    def test_init(self):
+        self.assertIsNone(self.clock._time)
+        self.assertIsNone(self.clock._previous_clock)
+
+    def test_call(self):
+        self.clock(1497351220318)
+        self.assertEqual(self.clock.time(), 1497351220318)
+        self.assertEqual(
+            self.clock.utcnow(), datetime.datetime(2017, 6, 13, 10, 53, 40, 318000)
+        )
+
+    @mock.patch("flumine.clock.RealClock.time", return_value=123)
+    def test_reset(self, mock_time):
+        self.clock.reset()
+        self.assertEqual(self.clock.time(), 123)
+
+    def test_context_manager(self):
+        real_clock = clock.get_clock()
+        with self.clock as c:
+            self.assertEqual(c, self.clock)
+            self.assertEqual(clock.get_clock(), self.clock)
+            self.clock(1497351220318)
+            self.assertEqual(clock.time(), 1497351220318)
+            self.assertEqual(clock.elapsed_seconds(1497351219318), 1)
+            # datetime is not patched
+            self.assertNotEqual(
+                datetime.datetime.utcnow().year, self.clock.utcnow().year
+            )
+        self.assertEqual(clock.get_clock(), real_clock)
+        self.assertIsNone(self.clock._previous_clock)
+
+    def test_context_manager_threads(self):
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def run(publish_time_epoch):
+            with clock.SimulatedClock() as simulated_clock:
+                for i in range(100):
+                    simulated_clock(publish_time_epoch + i)
+                    barrier.wait()
+                    if clock.time() != publish_time_epoch + i:
+                        results[publish_time_epoch] = False
+                        return
+            results[publish_time_epoch] = isinstance(clock.get_clock(), clock.RealClock)
+
+        threads = [
+            threading.Thread(target=run, args=(publish_time_epoch,))
+            for publish_time_epoch in (1497351220318, 1597351220318)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {1497351220318: True, 1597351220318: True})
+        self.assertIsInstance(clock.get_clock(), clock.RealClock)
+
+
+class ClockTest(unittest.TestCase):
+    def test_set_clock(self):
+        mock_clock = mock.Mock()
+        previous = clock.set_clock(mock_clock)
+        try:
+            self.assertEqual(clock.get_clock(), mock_clock)
+            self.assertEqual(clock.time(), mock_clock.time())
+            self.assertEqual(clock.utcnow(), mock_clock.utcnow())
+        finally:
+            clock.set_clock(previous)
+        self.assertIsInstance(clock.get_clock(), clock.RealClock)
+
+    def test_elapsed_seconds(self):
+        self.assertAlmostEqual(
+            clock.elapsed_seconds(time.time() * 1e3 - 2000), 2, delta=1
+        )
+
+    def test_to_epoch(self):
+        self.assertEqual(clock.to_epoch(datetime.datetime(1970, 1, 1)), 0)
+        self.assertEqual(
+            clock.to_epoch(datetime.datetime(2017, 6, 13, 10, 53, 40, 318000)),
+            1497351220318,
+        )
+
+    def test_from_epoch(self):
+        self.assertEqual(clock.from_epoch(0), datetime.datetime(1970, 1, 1))
+        self.assertEqual(
+            clock.from_epoch(1497351220318),
+            datetime.datetime(2017, 6, 13, 10, 53, 40, 318000),
+        )
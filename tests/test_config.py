@@ -1,4 +1,6 @@
+import sys
 import unittest
+from unittest import mock
 
 from flumine import config
 
@@ -9,7 +11,6 @@ class ConfigTest(unittest.TestCase):
         self.assertTrue(config.simulated_strategy_isolation)
         self.assertIsInstance(config.customer_strategy_ref, str)
         self.assertIsInstance(config.process_id, int)
-        self.assertIsNone(config.current_time)
         self.assertFalse(config.raise_errors)
         self.assertEqual(config.max_execution_workers, 32)
         self.assertFalse(config.async_place_orders)
@@ -18,3 +19,10 @@ class ConfigTest(unittest.TestCase):
         self.assertEqual(config.update_latency, 0.150)
         self.assertEqual(config.replace_latency, 0.280)
         self.assertEqual(config.order_sep, "-")
+
+    @unittest.skipIf(sys.version_info < (3, 7), "module __getattr__")
+    @mock.patch("flumine.clock.utcnow")
+    def test_current_time(self, mock_utcnow):
+        self.assertEqual(config.current_time, mock_utcnow())
+        with self.assertRaises(AttributeError):
+            config.unknown
@@ -1,7 +1,11 @@
+import time
+import queue
 import unittest
+import threading
 from unittest import mock
 
 from flumine.events import events
+from flumine.events.handlerqueue import HandlerQueue, ConflatedQueue
 
 
 class BaseEventTest(unittest.TestCase):
@@ -23,3 +27,144 @@ class BaseEventTest(unittest.TestCase):
     def test_str(self):
         self.base_event = events.MarketBookEvent(None)
         self.assertEqual(str(self.base_event), "<MARKET_BOOK [HANDLER]>")
+
+
+class HandlerQueueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = HandlerQueue()
+
+    def test_init(self):
+        self.assertEqual(len(self.queue.queue), 0)
+        self.assertFalse(self.queue._ready.is_set())
+
+    def test_put(self):
+        self.queue.put(1)
+        self.assertEqual(list(self.queue.queue), [1])
+        self.assertTrue(self.queue._ready.is_set())
+
+    def test_get_batch(self):
+        for i in range(3):
+            self.queue.put(i)
+        self.assertEqual(self.queue.get_batch(), [0, 1, 2])
+        self.assertTrue(self.queue.empty())
+
+    def test_get_batch_timeout(self):
+        self.assertEqual(self.queue.get_batch(timeout=0.01), [])
+        self.assertFalse(self.queue._ready.is_set())
+
+    def test_get_batch_blocking(self):
+        def producer():
+            time.sleep(0.02)
+            self.queue.put(1)
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        self.assertEqual(self.queue.get_batch(timeout=2), [1])
+        thread.join()
+
+    def test_get_batch_producers(self):
+        def producer(n):
+            for i in range(1000):
+                self.queue.put((n, i))
+
+        threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        items = []
+        while len(items) < 4000:
+            items += self.queue.get_batch(timeout=2)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(items)), 4000)
+        for n in range(4):  # FIFO per producer
+            self.assertEqual([i for p, i in items if p == n], list(range(1000)))
+
+    def test_get(self):
+        self.queue.put(1)
+        self.queue.put(2)
+        self.assertEqual(self.queue.get(), 1)
+        self.assertEqual(self.queue.get(), 2)
+        with self.assertRaises(queue.Empty):
+            self.queue.get(block=False)
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0.01)
+
+    def test_qsize(self):
+        self.assertEqual(self.queue.qsize(), 0)
+        self.queue.put(1)
+        self.assertEqual(self.queue.qsize(), 1)
+        self.assertFalse(self.queue.empty())
+
+
+class ConflatedQueueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = ConflatedQueue()
+
+    def _market_book(self, market_id, pt):
+        return mock.Mock(market_id=market_id, pt=pt, streaming_update={"rc": []})
+
+    def test_init(self):
+        self.assertEqual(self.queue._pending, {})
+        self.assertEqual(self.queue.conflated_count, 0)
+        self.assertEqual(self.queue.conflated_markets, {})
+
+    def test_conflation(self):
+        book_one = self._market_book("1.1", 1)
+        book_two = self._market_book("1.2", 1)
+        book_three = self._market_book("1.1", 2)
+        order_event = events.CurrentOrdersEvent([])
+        self.queue.put(events.MarketBookEvent([book_one, book_two]))
+        self.queue.put(order_event)
+        self.queue.put(events.MarketBookEvent([book_three]))
+        self.assertEqual(self.queue.qsize(), 3)
+        self.assertEqual(self.queue.get().event, [book_two])
+        self.assertEqual(self.queue.get(), order_event)
+        self.assertEqual(self.queue.get().event, [book_three])
+        self.assertEqual(book_three.streaming_update, {"rc": [], "conflated": True})
+        self.assertEqual(book_two.streaming_update, {"rc": []})
+        self.assertEqual(self.queue.conflated_count, 1)
+        self.assertEqual(self.queue.conflated_markets, {"1.1": 1})
+        self.assertEqual(self.queue._pending, {})
+
+    def test_no_conflation_once_processed(self):
+        self.queue.put(events.MarketBookEvent([self._market_book("1.1", 1)]))
+        self.assertEqual(len(self.queue.get().event), 1)
+        self.queue.put(events.MarketBookEvent([self._market_book("1.1", 2)]))
+        self.assertEqual(len(self.queue.get().event), 1)
+        self.assertEqual(self.queue.conflated_count, 0)
+
+    def test_other_events(self):
+        for event in (
+            events.CloseMarketEvent(self._market_book("1.1", 1)),
+            events.CloseMarketEvent(self._market_book("1.1", 2)),
+            events.TerminationEvent(None),
+        ):
+            self.queue.put(event)
+        self.assertEqual(self.queue.qsize(), 3)
+        self.assertEqual(self.queue.conflated_count, 0)
+
+    def test_bounded_latency(self):
+        # burst of updates for the same markets
+        for pt in range(100):
+            self.queue.put(
+                events.MarketBookEvent(
+                    [self._market_book("1.1", pt), self._market_book("1.2", pt)]
+                )
+            )
+        books = []
+        while not self.queue.empty():
+            books += self.queue.get().event
+        self.assertEqual(
+            [(b.market_id, b.pt) for b in books], [("1.1", 99), ("1.2", 99)]
+        )
+        self.assertEqual(self.queue.conflated_count, 198)
+
+    def test_get_batch(self):
+        self.queue.put(events.MarketBookEvent([self._market_book("1.1", 1)]))
+        self.queue.put(events.MarketBookEvent([self._market_book("1.2", 1)]))
+        self.assertEqual(len(self.queue.get_batch()), 1)
+        self.assertEqual(len(self.queue.get_batch()), 1)
+        self.assertEqual(self.queue.get_batch(timeout=0.01), [])
+
+    def test_info(self):
+        self.assertEqual(self.queue.info, {"queue_size": 0, "conflated_count": 0})
@@ -1,5 +1,6 @@
 import time
 import unittest
+import threading
 from unittest import mock
 from unittest.mock import call
 
@@ -15,6 +16,7 @@ from flumine.execution.baseexecution import (
     OrderPackageType,
 )
 from flumine.execution.betfairexecution import BetfairExecution
+from flumine.execution.scheduler import Scheduler
 from flumine.execution.simulatedexecution import SimulatedExecution
 
 
@@ -922,13 +924,20 @@ class SimulatedExecutionTest(unittest.TestCase):
     def test_handler_paper_trade(self, mock_execute_place):
         mock_thread_pool = mock.Mock()
         self.execution._thread_pool = mock_thread_pool
-        mock_order_package = mock.Mock()
+        mock_scheduler = mock.Mock()
+        self.execution._scheduler = mock_scheduler
+        mock_order_package = mock.Mock(bet_delay=1)
         mock_order_package.client.paper_trade = True
         mock_order_package.package_type = OrderPackageType.PLACE
         self.execution.handler(mock_order_package)
-        mock_thread_pool.submit.assert_called_with(
-            mock_execute_place, mock_order_package, None
+        mock_scheduler.schedule.assert_called_with(
+            config.place_latency + 1,
+            mock_thread_pool.submit,
+            mock_execute_place,
+            mock_order_package,
+            None,
         )
+        mock_thread_pool.submit.assert_not_called()
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.execute_place")
     def test_handler_place(self, mock_execute_place):
@@ -1026,18 +1035,6 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_place_paper_trade(self, mock_time):
-        mock_order_package = mock.MagicMock(
-            market_id="1.23", place_instructions=[], bet_delay=1
-        )
-        mock_order_package.__len__.return_value = 1
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_place(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.place_latency + 1)
-        mock_order_package.client.add_transaction.assert_called_with(1)
-
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_cancel(self, mock__order_logger):
         mock_order = mock.Mock(size_cancelled=2, size_remaining=0)
@@ -1102,14 +1099,6 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1, failed=True)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_cancel_paper_trade(self, mock_time):
-        mock_order_package = mock.Mock(market_id="1.23", bet_delay=1)
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_cancel(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.cancel_latency)
-
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_update(self, mock__order_logger):
         mock_order = mock.Mock()
@@ -1159,16 +1148,6 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1, failed=True)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_update_paper_trade(self, mock_time):
-        mock_order_package = mock.Mock(
-            market_id="1.23", update_instructions=[], bet_delay=1
-        )
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_update(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.update_latency)
-
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_replace(self, mock__order_logger):
         mock_order = mock.Mock()
@@ -1250,13 +1229,109 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__enter__.assert_called_with()
         mock_order.trade.__exit__.assert_called_with(None, None, None)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_replace_paper_trade(self, mock_time):
-        mock_order_package = mock.MagicMock(
-            market_id="1.23", replace_instructions=[], bet_delay=1
-        )
-        mock_order_package.__len__.return_value = 1
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
+    def test__paper_trade_delay(self):
+        mock_order_package = mock.Mock(bet_delay=1)
+        for package_type, delay in (
+            (OrderPackageType.PLACE, config.place_latency + 1),
+            (OrderPackageType.CANCEL, config.cancel_latency),
+            (OrderPackageType.UPDATE, config.update_latency),
+            (OrderPackageType.REPLACE, config.replace_latency + 1),
+        ):
+            mock_order_package.package_type = package_type
+            self.assertEqual(
+                self.execution._paper_trade_delay(mock_order_package), delay
+            )
+
+    def test__order_package_changed(self):
+        mock_order = mock.Mock()
+        mock_order_package = mock.MagicMock()
+        mock_order_package.__iter__.return_value = [mock_order]
+        mock_order_package.client.paper_trade = False
+        self.execution._order_package_changed(mock_order_package)
+        mock_order.simulated.order_changed.assert_not_called()
         mock_order_package.client.paper_trade = True
-        self.execution.execute_replace(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.replace_latency + 1)
+        self.execution._order_package_changed(mock_order_package)
+        mock_order.simulated.order_changed.assert_called_with()
+
+    @mock.patch("flumine.execution.baseexecution.BaseExecution.shutdown")
+    def test_shutdown(self, mock_shutdown):
+        mock_scheduler = mock.Mock()
+        self.execution._scheduler = mock_scheduler
+        self.execution.shutdown()
+        mock_scheduler.shutdown.assert_called_with(wait=True)
+        mock_shutdown.assert_called_with()
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = Scheduler()
+
+    def tearDown(self) -> None:
+        self.scheduler.shutdown()
+
+    def test_init(self):
+        self.assertEqual(self.scheduler.name, "Scheduler")
+        self.assertEqual(self.scheduler._heap, [])
+        self.assertIsNone(self.scheduler._thread)
+        self.assertFalse(self.scheduler._running)
+
+    def test_schedule_no_delay(self):
+        mock_func = mock.Mock()
+        self.scheduler.schedule(0, mock_func, 1, 2)
+        mock_func.assert_called_with(1, 2)
+        self.assertIsNone(self.scheduler._thread)
+
+    def test_schedule(self):
+        calls = []
+        event = threading.Event()
+
+        def func(value):
+            calls.append(value)
+            if len(calls) == 3:
+                event.set()
+
+        self.scheduler.schedule(0.06, func, "c")
+        self.scheduler.schedule(0.02, func, "a")
+        self.scheduler.schedule(0.02, func, "b")
+        self.assertIsNotNone(self.scheduler._thread)
+        self.assertTrue(event.wait(2))
+        self.assertEqual(calls, ["a", "b", "c"])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_schedule_does_not_block(self):
+        # 40 delayed calls are held without blocking any threads
+        event = threading.Event()
+        calls = []
+
+        def func(value):
+            calls.append(value)
+            if len(calls) == 40:
+                event.set()
+
+        start = time.monotonic()
+        for i in range(40):
+            self.scheduler.schedule(0.05, func, i)
+        self.assertTrue(event.wait(2))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(calls, list(range(40)))
+
+    @mock.patch("flumine.execution.scheduler.logger")
+    def test_schedule_error(self, mock_logger):
+        event = threading.Event()
+        mock_func = mock.Mock(side_effect=ValueError)
+        self.scheduler.schedule(0.01, mock_func)
+        self.scheduler.schedule(0.02, event.set)
+        self.assertTrue(event.wait(2))
+        mock_logger.error.assert_called_once()
+
+    def test_shutdown(self):
+        mock_func = mock.Mock()
+        self.scheduler.schedule(0.02, mock_func)
+        self.scheduler.shutdown()
+        mock_func.assert_called_with()
+        self.assertFalse(self.scheduler._running)
+        self.assertIsNone(self.scheduler._thread)
+        # restarts on schedule
+        self.scheduler.schedule(0.01, mock_func)
+        self.scheduler.shutdown()
+        self.assertEqual(mock_func.call_count, 2)
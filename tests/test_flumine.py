@@ -59,6 +59,28 @@ class FlumineTest(unittest.TestCase):
         mock__process_custom_event.assert_called_with(mock_events[7])
         mock__add_default_workers.assert_called()
 
+    @mock.patch("flumine.flumine.Flumine._add_default_workers")
+    @mock.patch("flumine.flumine.Flumine._process_end_flumine")
+    @mock.patch("flumine.flumine.logger")
+    def test_run_unknown_event(self, mock_logger, mock__process_end_flumine, _):
+        mock_event = mock.Mock(EVENT_TYPE="unknown")
+        self.flumine.handler_queue.put(mock_event)
+        self.flumine.handler_queue.put(events.TerminationEvent(None))
+        self.flumine.handler_queue.put(mock_event)
+        self.flumine.run()
+        mock_logger.error.assert_called_once()
+        mock__process_end_flumine.assert_called_with()
+        # events after termination are not processed
+        self.assertEqual(self.flumine.handler_queue.qsize(), 0)
+
+    def test__get_event_handlers(self):
+        handlers = self.flumine._get_event_handlers()
+        self.assertEqual(
+            handlers[events.EventType.MARKET_BOOK], self.flumine._process_market_books
+        )
+        self.assertNotIn(events.EventType.TERMINATOR, handlers)
+        self.assertEqual(len(handlers), 8)
+
     @mock.patch("flumine.worker.BackgroundWorker")
     @mock.patch("flumine.Flumine.add_worker")
     def test__add_default_workers(self, mock_add_worker, mock_worker):
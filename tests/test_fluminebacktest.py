@@ -18,7 +18,7 @@ class FlumineBacktestTest(unittest.TestCase):
 
     def test_init(self):
         self.assertTrue(self.flumine.BACKTEST)
-        self.assertEqual(self.flumine.handler_queue, [])
+        self.assertEqual(len(self.flumine.handler_queue), 0)
 
     def test_run_error(self):
         mock_client = mock.Mock()
@@ -45,6 +45,20 @@ class FlumineBacktestTest(unittest.TestCase):
         mock__process_market_books.assert_called_with(mock_events.MarketBookEvent())
         mock__process_end_flumine.assert_called_with()
 
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_streams")
+    @mock.patch("flumine.backtest.backtest.run_processes")
+    def test_run_processes(
+        self,
+        mock_run_processes,
+        mock__process_streams,
+        mock__process_end_flumine,
+    ):
+        self.flumine.run(processes=4, markets_per_process=2)
+        mock_run_processes.assert_called_with(self.flumine, 4, 2)
+        mock__process_streams.assert_not_called()
+        mock__process_end_flumine.assert_called_with()
+
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
     @mock.patch("flumine.backtest.backtest.events")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_market_books")
@@ -69,6 +83,44 @@ class FlumineBacktestTest(unittest.TestCase):
         mock__process_market_books.assert_called_with(mock_events.MarketBookEvent())
         mock__process_end_flumine.assert_called_with()
 
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_end_flumine")
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_market_books")
+    def test_run_event_order(
+        self,
+        mock__process_market_books,
+        mock__process_end_flumine,
+    ):
+        def create_stream(name, publish_times):
+            market_books = [
+                [mock.Mock(publish_time_epoch=pt, name="%s-%s" % (name, pt))]
+                for pt in publish_times
+            ]
+            mock_stream = mock.Mock(event_processing=True, event_id=123)
+            mock_stream.create_generator.return_value = mock.Mock(
+                return_value=iter(market_books)
+            )
+            return mock_stream, market_books
+
+        stream_one, books_one = create_stream("one", [1, 3, 3, 5])
+        stream_two, books_two = create_stream("two", [2, 3, 4])
+        stream_three, books_three = create_stream("three", [3])
+        self.flumine.streams._streams = [stream_one, stream_two, stream_three]
+        self.flumine.run()
+        processed = [c[0][0].event for c in mock__process_market_books.call_args_list]
+        self.assertEqual(
+            processed,
+            [
+                books_one[0],
+                books_two[0],
+                books_three[0],  # equal epochs processed in insertion order
+                books_one[1],
+                books_two[1],
+                books_one[2],
+                books_two[2],
+                books_one[3],
+            ],
+        )
+
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._process_backtest_orders")
     @mock.patch("flumine.backtest.backtest.FlumineBacktest._check_pending_packages")
     def test__process_market_books(
@@ -76,7 +128,13 @@ class FlumineBacktestTest(unittest.TestCase):
         mock__check_pending_packages,
         mock__process_backtest_orders,
     ):
-        self.flumine.handler_queue.append(mock.Mock())
+        self.flumine.handler_queue.append(
+            mock.Mock(
+                market_id="1.23",
+                _time_created=0,
+                simulated_delay=0.1,
+            )
+        )
         mock_event = mock.Mock()
         mock_market_book = mock.Mock(market_id="1.23")
         mock_market_book.runners = []
@@ -89,9 +147,9 @@ class FlumineBacktestTest(unittest.TestCase):
         mock__process_backtest_orders.assert_called_with(mock_market)
 
     def test_process_order_package(self):
-        mock_order_package = mock.Mock()
+        mock_order_package = mock.Mock(_time_created=0, simulated_delay=0.1)
         self.flumine.process_order_package(mock_order_package)
-        self.assertEqual(self.flumine.handler_queue, [mock_order_package])
+        self.assertEqual(list(self.flumine.handler_queue), [mock_order_package])
 
     def test__process_backtest_orders(self):
         mock_market = mock.Mock(context={})
@@ -102,7 +160,10 @@ class FlumineBacktestTest(unittest.TestCase):
         mock_order_two = mock.Mock(size_remaining=1, complete=False)
         mock_order_two.order_type.ORDER_TYPE = OrderTypes.LIMIT
         mock_order_two.trade.status = TradeStatus.COMPLETE
-        mock_market.blotter._live_orders = [mock_order, mock_order_two]
+        mock_market.blotter._live_orders = {
+            mock_order.id: mock_order,
+            mock_order_two.id: mock_order_two,
+        }
         self.flumine._process_backtest_orders(mock_market)
         mock_order.execution_complete.assert_called()
         mock_order_two.execution_complete.assert_not_called()
@@ -110,16 +171,54 @@ class FlumineBacktestTest(unittest.TestCase):
     def test__process_backtest_orders_strategies(self):
         mock_market = mock.Mock(context={})
         mock_market.blotter.live_orders = []
-        mock_strategy = mock.Mock()
+        mock_market.blotter.pop_changed_orders.return_value = []
+        mock_strategy = mock.Mock(process_orders_on_change=False)
         self.flumine.strategies = [mock_strategy]
         self.flumine._process_backtest_orders(mock_market)
         mock_strategy.process_orders.assert_called_with(
             mock_market, mock_market.blotter.strategy_orders(mock_strategy)
         )
 
+    def test__process_backtest_orders_changed(self):
+        mock_market = mock.Mock(context={})
+        mock_market.blotter = Blotter("1.23")
+        mock_strategy = mock.Mock(process_orders_on_change=True)
+        mock_order = mock.Mock(size_remaining=1, complete=False, changed=True)
+        mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order.trade.strategy = mock_strategy
+        mock_order_two = mock.Mock(size_remaining=1, complete=False, changed=False)
+        mock_order_two.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order_two.trade.strategy = mock_strategy
+        mock_order_three = mock.Mock(complete=True, changed=True)  # voided
+        mock_order_three.trade.strategy = mock_strategy
+        mock_market.blotter._live_orders = {
+            mock_order.id: mock_order,
+            mock_order_two.id: mock_order_two,
+        }
+        mock_market.blotter._status_index.sequence = {
+            mock_order.id: 0,
+            mock_order_two.id: 1,
+            mock_order_three.id: 2,
+        }
+        mock_market.blotter._changed_orders = {
+            mock_order_three.id: mock_order_three,
+            mock_order.id: mock_order,
+        }
+        self.flumine.strategies = [mock_strategy]
+        self.flumine._process_backtest_orders(mock_market)
+        mock_strategy.process_orders.assert_called_with(
+            mock_market, [], [mock_order, mock_order_three]
+        )
+        self.assertFalse(mock_order.changed)
+        self.assertFalse(mock_order_three.changed)
+        # no further changes
+        self.flumine._process_backtest_orders(mock_market)
+        self.assertEqual(mock_strategy.process_orders.call_count, 1)
+
     def test__check_pending_packages_place(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=0,
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=5,
@@ -127,13 +226,14 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_place_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=0,
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=0.2,
@@ -141,13 +241,14 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_not_called()
 
     def test__check_pending_packages_place_diff_market_id(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=0,
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=2,
@@ -155,49 +256,66 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.24")
         mock_client.execution.handler.assert_not_called()
 
     def test__check_pending_packages_cancel(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=3, client=mock_client, simulated_delay=0.2
+            _time_created=0,
+            market_id="1.23",
+            elapsed_seconds=3,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_cancel_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=2, client=mock_client, simulated_delay=0.2
+            _time_created=0,
+            market_id="1.23",
+            elapsed_seconds=2,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_update(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=3, client=mock_client, simulated_delay=0.2
+            _time_created=0,
+            market_id="1.23",
+            elapsed_seconds=3,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_update_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=2, client=mock_client, simulated_delay=0.2
+            _time_created=0,
+            market_id="1.23",
+            elapsed_seconds=2,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_replace(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=0,
             market_id="1.23",
             package_type=OrderPackageType.REPLACE,
             elapsed_seconds=5,
@@ -205,13 +323,14 @@ class FlumineBacktestTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_replace_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=0,
             market_id="1.23",
             package_type=OrderPackageType.REPLACE,
             elapsed_seconds=2,
@@ -228,7 +347,7 @@ class FlumineBacktestTest(unittest.TestCase):
     def test__process_close_market_closed(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.flumine.strategies = [mock_strategy]
+        self.flumine.strategies(mock_strategy, mock.Mock())
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         mock_market.blotter.process_cleared_orders.return_value = []
@@ -249,6 +368,48 @@ class FlumineBacktestTest(unittest.TestCase):
         self.flumine._process_close_market(mock_event)
         self.assertEqual(len(self.flumine.markets._markets), 4)
 
+    @mock.patch("flumine.backtest.backtest.FlumineBacktest._remove_market")
+    @mock.patch("flumine.baseflumine.BaseFlumine._process_close_market")
+    def test__process_close_market_evict(
+        self, mock__process_close_market, mock__remove_market
+    ):
+        mock_market = mock.Mock(closed=True)
+        self.flumine.markets._markets = {"1.23": mock_market}
+        mock_event = mock.Mock()
+        mock_event.event.market_id = "1.23"
+        with mock.patch("flumine.backtest.backtest.config") as mock_config:
+            mock_config.evict_closed_markets = False
+            self.flumine._process_close_market(mock_event)
+            mock__process_close_market.assert_called_with(mock_event)
+            mock__remove_market.assert_not_called()
+            mock_config.evict_closed_markets = True
+            self.flumine._process_close_market(mock_event)
+            mock__remove_market.assert_called_with(mock_market)
+
+    @mock.patch("flumine.backtest.backtest.ParameterSweep")
+    def test_add_sweep(self, mock_sweep):
+        mock_strategy_class = mock.Mock()
+        sweep = self.flumine.add_sweep(
+            mock_strategy_class, [{"a": 1}], name="test", market_filter={}
+        )
+        mock_sweep.assert_called_with(
+            self.flumine, mock_strategy_class, [{"a": 1}], name="test", market_filter={}
+        )
+        mock_sweep().add.assert_called_with()
+        self.assertEqual(sweep, mock_sweep())
+
+    def test_info(self):
+        self.flumine.streams._streams = [1, 2]
+        self.assertEqual(
+            self.flumine.info,
+            {
+                "client": self.flumine.client.info,
+                "markets": {"market_count": 0, "open_market_count": 0},
+                "stream_count": 2,
+                "logging_controls": [],
+            },
+        )
+
     def test_str(self):
         assert str(self.flumine) == "<FlumineBacktest>"
 
@@ -1,10 +1,13 @@
 import unittest
+from unittest import mock
 
 from flumine import FlumineBacktest, clients, BaseStrategy, config
 from flumine.order.trade import Trade
 from flumine.order.order import OrderStatus
 from flumine.order.ordertype import LimitOrder, MarketOnCloseOrder
-from flumine.utils import get_price
+from flumine.utils import get_price, price_ticks_away
+from flumine.markets.middleware import RunnerAnalytics
+from flumine.controls.loggingcontrols import LoggingControl
 
 
 class IntegrationTest(unittest.TestCase):
@@ -26,6 +29,350 @@ class IntegrationTest(unittest.TestCase):
         framework.add_strategy(strategy)
         framework.run()
 
+    def test_backtest_processes(self):
+        class LayOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                return market_book.status == "OPEN" and not market_book.inplay
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    if runner.status == "ACTIVE":
+                        runner_context = self.get_runner_context(
+                            market.market_id, runner.selection_id
+                        )
+                        if runner_context.trade_count == 0:
+                            trade = Trade(
+                                market_book.market_id,
+                                runner.selection_id,
+                                runner.handicap,
+                                self,
+                            )
+                            order = trade.create_order(
+                                side="LAY",
+                                order_type=LimitOrder(
+                                    get_price(runner.ex.available_to_back, 0) or 1.01,
+                                    2.00,
+                                ),
+                            )
+                            market.place_order(order)
+
+        def run(processes):
+            client = clients.BacktestClient()
+            framework = FlumineBacktest(client=client)
+            strategy = LayOrders(
+                market_filter={
+                    "markets": [
+                        "tests/resources/BASIC-1.132153978",
+                        "tests/resources/SELF-1.181223995",
+                    ]
+                },
+                max_order_exposure=1000,
+                max_selection_exposure=1000,
+            )
+            framework.add_strategy(strategy)
+            framework.run(processes=processes, markets_per_process=1)
+            results = {}
+            for market in framework.markets:
+                self.assertIs(market.flumine, framework)
+                for order in market.blotter:
+                    self.assertIs(order.trade.strategy, strategy)
+                results[market.market_id] = (
+                    len(market.blotter),
+                    market.cleared(0)["profit"],
+                )
+            return results
+
+        self.assertEqual(run(None), run(2))
+
+    def test_backtest_evict_closed_markets(self):
+        class LayOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                return market_book.status == "OPEN" and not market_book.inplay
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    if runner.status == "ACTIVE":
+                        runner_context = self.get_runner_context(
+                            market.market_id, runner.selection_id
+                        )
+                        if runner_context.trade_count == 0:
+                            trade = Trade(
+                                market_book.market_id,
+                                runner.selection_id,
+                                runner.handicap,
+                                self,
+                            )
+                            order = trade.create_order(
+                                side="LAY",
+                                order_type=LimitOrder(
+                                    get_price(runner.ex.available_to_back, 0) or 1.01,
+                                    2.00,
+                                ),
+                            )
+                            market.place_order(order)
+
+        class Results(LoggingControl):
+            def __init__(self):
+                super(Results, self).__init__()
+                self.orders = {}
+                self.profit = {}
+
+            def _process_cleared_orders_meta(self, event):
+                for order in event.event:
+                    self.orders.setdefault(order.market_id, []).append(order)
+
+            def _process_cleared_markets(self, event):
+                for cleared_market in event.event.orders:
+                    self.profit[cleared_market.market_id] = cleared_market.profit
+
+        def run(evict):
+            config.evict_closed_markets = evict
+            client = clients.BacktestClient()
+            framework = FlumineBacktest(client=client)
+            strategy = LayOrders(
+                market_filter={
+                    "markets": [
+                        "tests/resources/BASIC-1.132153978",
+                        "tests/resources/SELF-1.181223995",
+                    ]
+                },
+                max_order_exposure=1000,
+                max_selection_exposure=1000,
+            )
+            framework.add_strategy(strategy)
+            results = Results()
+            framework.add_logging_control(results)
+            framework.run()
+            return framework, strategy, results
+
+        try:
+            framework, _, results = run(False)
+            framework_evict, strategy_evict, results_evict = run(True)
+        finally:
+            config.evict_closed_markets = False
+        self.assertEqual(len(framework.markets), 2)
+        self.assertEqual(len(framework_evict.markets), 0)
+        self.assertEqual(strategy_evict._invested, {})
+        self.assertEqual(framework_evict._market_middleware[0].markets, {})
+        self.assertEqual(len(results_evict.profit), 2)
+        self.assertTrue(results_evict.orders)
+        self.assertEqual(results.profit, results_evict.profit)
+        self.assertEqual(
+            {k: len(v) for k, v in results.orders.items()},
+            {k: len(v) for k, v in results_evict.orders.items()},
+        )
+        for market in framework.markets:
+            self.assertEqual(len(market.blotter), len(results.orders[market.market_id]))
+
+    def test_backtest_sweep(self):
+        class SweepOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                return market_book.status == "OPEN" and not market_book.inplay
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    if runner.status == "ACTIVE":
+                        runner_context = self.get_runner_context(
+                            market.market_id, runner.selection_id
+                        )
+                        if runner_context.trade_count == 0:
+                            trade = Trade(
+                                market_book.market_id,
+                                runner.selection_id,
+                                runner.handicap,
+                                self,
+                            )
+                            order = trade.create_order(
+                                side=self.context["side"],
+                                order_type=LimitOrder(
+                                    get_price(runner.ex.available_to_back, 0) or 1.01,
+                                    self.context["size"],
+                                ),
+                            )
+                            market.place_order(order)
+
+        market_filter = {
+            "markets": [
+                "tests/resources/BASIC-1.132153978",
+                "tests/resources/SELF-1.181223995",
+            ]
+        }
+        variants = [
+            {"context": {"side": side, "size": size}}
+            for side in ("BACK", "LAY")
+            for size in (2.00, 5.00)
+        ]
+        # sweep
+        framework = FlumineBacktest(client=clients.BacktestClient())
+        sweep = framework.add_sweep(
+            SweepOrders,
+            variants,
+            market_filter=market_filter,
+            max_order_exposure=1000,
+            max_selection_exposure=1000,
+        )
+        self.assertEqual(len(framework.streams), 2)
+        self.assertEqual(len(framework.strategies), 4)
+        framework.run()
+        results = sweep.results()
+        self.assertEqual(
+            [r["strategy"] for r in results],
+            ["SweepOrders_0", "SweepOrders_1", "SweepOrders_2", "SweepOrders_3"],
+        )
+        self.assertTrue(any(r["bet_count"] for r in results))
+        # compare against individual backtests
+        for variant, result in zip(variants, results):
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            strategy = SweepOrders(
+                market_filter=market_filter,
+                max_order_exposure=1000,
+                max_selection_exposure=1000,
+                **variant
+            )
+            framework.add_strategy(strategy)
+            framework.run()
+            cleared = [market.cleared(0.05) for market in framework.markets]
+            self.assertEqual(result["params"], variant)
+            self.assertEqual(result["bet_count"], sum(c["betCount"] for c in cleared))
+            self.assertEqual(
+                result["profit"], round(sum(c["profit"] for c in cleared), 2)
+            )
+            self.assertEqual(
+                result["commission"], round(sum(c["commission"] for c in cleared), 2)
+            )
+
+    def test_backtest_traded_update(self):
+        # incremental traded (trd) fills match the full ladder diff
+        class PassiveOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                return market_book.status == "OPEN"
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    if runner.status == "ACTIVE" and runner.last_price_traded:
+                        runner_context = self.get_runner_context(
+                            market.market_id, runner.selection_id
+                        )
+                        if (
+                            runner_context.live_trade_count == 0
+                            and runner_context.trade_count < 20
+                        ):
+                            trade = Trade(
+                                market_book.market_id,
+                                runner.selection_id,
+                                runner.handicap,
+                                self,
+                            )
+                            for side, ticks in (("BACK", 2), ("LAY", -2)):
+                                order = trade.create_order(
+                                    side=side,
+                                    order_type=LimitOrder(
+                                        price_ticks_away(
+                                            runner.last_price_traded, ticks
+                                        ),
+                                        10,
+                                    ),
+                                )
+                                market.place_order(order)
+
+        def run():
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            strategy = PassiveOrders(
+                market_filter={
+                    "markets": [
+                        "tests/resources/BASIC-1.132153978",
+                        "tests/resources/SELF-1.181223995",
+                    ]
+                },
+                max_order_exposure=1000,
+                max_selection_exposure=1e6,
+                multi_order_trades=True,
+            )
+            framework.add_strategy(strategy)
+            framework.run()
+            return [
+                (order.selection_id, order.side, order.simulated.matched)
+                for market in framework.markets
+                for order in market.blotter
+            ]
+
+        def _calculate_traded_update(
+            self, traded_update, traded_volume, total_matched=None
+        ):
+            if self._traded_volume == traded_volume:
+                return {}
+            return self._calculate_traded(traded_volume)
+
+        fills = run()
+        with mock.patch.object(
+            RunnerAnalytics, "_calculate_traded_update", _calculate_traded_update
+        ):
+            full_fills = run()
+        self.assertTrue(sum(len(matched) for _, _, matched in fills) > 100)
+        self.assertEqual(fills, full_fills)
+
+    def test_backtest_simulated_delta(self):
+        # delta updates (price levels) fills match full processing
+        class PassiveOrders(BaseStrategy):
+            def check_market_book(self, market, market_book):
+                return market_book.status == "OPEN"
+
+            def process_market_book(self, market, market_book):
+                for runner in market_book.runners:
+                    if runner.status == "ACTIVE" and runner.last_price_traded:
+                        runner_context = self.get_runner_context(
+                            market.market_id, runner.selection_id
+                        )
+                        if (
+                            runner_context.live_trade_count == 0
+                            and runner_context.trade_count < 2
+                        ):
+                            trade = Trade(
+                                market_book.market_id,
+                                runner.selection_id,
+                                runner.handicap,
+                                self,
+                            )
+                            for side, ticks in (("BACK", 1), ("LAY", -1)):
+                                for i in range(1, 4):
+                                    order = trade.create_order(
+                                        side=side,
+                                        order_type=LimitOrder(
+                                            price_ticks_away(
+                                                runner.last_price_traded, ticks * i
+                                            ),
+                                            2,
+                                        ),
+                                    )
+                                    market.place_order(order)
+
+        def run():
+            framework = FlumineBacktest(client=clients.BacktestClient())
+            for name in ("one", "two"):
+                strategy = PassiveOrders(
+                    market_filter={"markets": ["tests/resources/SELF-1.181223995"]},
+                    max_order_exposure=1000,
+                    max_selection_exposure=1e6,
+                    multi_order_trades=True,
+                    name=name,
+                )
+                framework.add_strategy(strategy)
+            framework.run()
+            return [
+                (order.trade.strategy.name, order.side, order.simulated.matched)
+                for market in framework.markets
+                for order in market.blotter
+            ]
+
+        fills = run()
+        with mock.patch(
+            "flumine.markets.middleware.SimulatedMiddleware._process_streaming_update",
+            return_value=None,
+        ):
+            full_fills = run()
+        self.assertTrue(sum(len(matched) for _, _, matched in fills) >= 50)
+        self.assertEqual(fills, full_fills)
+
     def test_backtest_pro(self):
         class LimitOrders(BaseStrategy):
             def check_market_book(self, market, market_book):
@@ -1,3 +1,4 @@
+import time
 import unittest
 import datetime
 from unittest import mock
@@ -13,6 +14,7 @@ class MarketsTest(unittest.TestCase):
 
     def test_init(self):
         self.assertEqual(self.markets._markets, {})
+        self.assertEqual(self.markets._reconciled_orders, {})
 
     def test_add_market(self):
         mock_market = mock.Mock()
@@ -39,6 +41,14 @@ class MarketsTest(unittest.TestCase):
         self.markets.remove_market("1.1")
         self.assertEqual(self.markets._markets, {})
 
+    def test_remove_market_reconciled_orders(self):
+        mock_order = mock.Mock(bet_id="321")
+        mock_market = mock.Mock(blotter=[mock_order])
+        self.markets._markets = {"1.1": mock_market}
+        self.markets._reconciled_orders = {"321": mock_order, "456": 1}
+        self.markets.remove_market("1.1")
+        self.assertEqual(self.markets._reconciled_orders, {"456": 1})
+
     def test_get_order(self):
         mock_market = mock.Mock()
         mock_market.closed = False
@@ -55,6 +65,13 @@ class MarketsTest(unittest.TestCase):
         self.markets.get_order_from_bet_id("1.1", "321")
         mock_blotter.get_order_bet_id.assert_called_with("321")
 
+    def test_get_reconciled_order(self):
+        mock_order = mock.Mock()
+        self.markets.add_reconciled_order("321", mock_order)
+        self.assertEqual(self.markets._reconciled_orders, {"321": mock_order})
+        self.assertEqual(self.markets.get_reconciled_order("321"), mock_order)
+        self.assertIsNone(self.markets.get_reconciled_order("123"))
+
     def test_markets(self):
         self.assertEqual(self.markets.markets, {})
         mock_market = mock.Mock()
@@ -108,6 +125,7 @@ class MarketTest(unittest.TestCase):
         self.assertFalse(self.market.closed)
         self.assertIsNotNone(self.market.date_time_created)
         self.assertIsNone(self.market.date_time_closed)
+        self.assertIsNone(self.market.time_closed)
         self.assertEqual(self.market.market_book, self.mock_market_book)
         self.assertEqual(self.market.market_catalogue, self.mock_market_catalogue)
         self.assertTrue(self.market.update_market_catalogue)
@@ -123,6 +141,17 @@ class MarketTest(unittest.TestCase):
         self.assertEqual(self.market.market_book, mock_market_book)
         self.assertTrue(self.market.update_market_catalogue)
 
+    @mock.patch("flumine.markets.market.get_runner_book")
+    def test_get_runner_book(self, mock_get_runner_book):
+        self.assertEqual(
+            self.market.get_runner_book(123, 1), mock_get_runner_book.return_value
+        )
+        mock_get_runner_book.assert_called_with(self.market.market_book, 123, 1)
+
+    def test_get_runner_book_no_market_book(self):
+        self.market.market_book = None
+        self.assertIsNone(self.market.get_runner_book(123))
+
     def test_open_market(self):
         self.market.closed = True
         self.market.orders_cleared = True
@@ -135,7 +164,8 @@ class MarketTest(unittest.TestCase):
     def test_close_market(self):
         self.market.close_market()
         self.assertTrue(self.market.closed)
-        self.assertIsNotNone(self.market.date_time_closed)
+        self.assertIsNotNone(self.market.time_closed)
+        self.assertIsInstance(self.market.date_time_closed, datetime.datetime)
 
     @mock.patch("flumine.markets.market.Transaction")
     def test_transaction(self, mock_transaction):
@@ -260,6 +290,18 @@ class MarketTest(unittest.TestCase):
         )
         self.assertLess(self.market.seconds_to_start, 0)
 
+    @mock.patch("flumine.markets.market.clock.time", return_value=1000)
+    def test_seconds_to_start_cached(self, mock_time):
+        market_start_time = datetime.datetime.utcfromtimestamp(61)
+        self.market.market_catalogue.market_start_time = market_start_time
+        self.assertEqual(self.market.seconds_to_start, 60)
+        self.assertEqual(self.market._market_start_datetime, market_start_time)
+        self.assertEqual(self.market._market_start_epoch, 61000)
+        self.market.market_catalogue.market_start_time = (
+            datetime.datetime.utcfromtimestamp(121)
+        )
+        self.assertEqual(self.market.seconds_to_start, 120)
+
     def test_seconds_to_start_none(self):
         self.market.market_book = None
         self.market.market_catalogue = None
@@ -268,8 +310,17 @@ class MarketTest(unittest.TestCase):
     def test_elapsed_seconds_closed(self):
         self.assertIsNone(self.market.elapsed_seconds_closed)
         self.market.closed = True
-        self.market.date_time_closed = datetime.datetime.utcnow()
-        self.assertGreaterEqual(self.market.elapsed_seconds_closed, 0)
+        self.market.time_closed = time.time() * 1e3 - 2000
+        self.assertAlmostEqual(self.market.elapsed_seconds_closed, 2, delta=1)
+
+    def test_date_time_closed_setter(self):
+        self.market.date_time_closed = datetime.datetime(1970, 1, 1, 0, 0, 2)
+        self.assertEqual(self.market.time_closed, 2000)
+        self.assertEqual(
+            self.market.date_time_closed, datetime.datetime(1970, 1, 1, 0, 0, 2)
+        )
+        self.market.date_time_closed = None
+        self.assertIsNone(self.market.time_closed)
 
     def test_event_name_mc(self):
         mock_market_catalogue = mock.Mock()
@@ -5,12 +5,15 @@ from flumine.markets.middleware import (
     Middleware,
     SimulatedMiddleware,
     RunnerAnalytics,
+    TradedView,
     OrderStatus,
     OrderTypes,
     WIN_MINIMUM_ADJUSTMENT_FACTOR,
     PLACE_MINIMUM_ADJUSTMENT_FACTOR,
 )
+from flumine.markets.blotter import Blotter
 from flumine.order.ordertype import MarketOnCloseOrder
+from flumine.order.trade import Trade
 
 
 class MiddlewareTest(unittest.TestCase):
@@ -28,6 +31,9 @@ class MiddlewareTest(unittest.TestCase):
         mock_market = mock.Mock()
         self.assertIsNone(self.middleware.remove_market(mock_market))
 
+    def test_reset(self):
+        self.assertIsNone(self.middleware.reset())
+
 
 class SimulatedMiddlewareTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -35,10 +41,22 @@ class SimulatedMiddlewareTest(unittest.TestCase):
 
     def test_init(self):
         self.assertEqual(self.middleware.markets, {})
+        self.assertEqual(self.middleware._updated_runners, {})
         self.assertEqual(self.middleware._runner_removals, [])
         self.assertEqual(WIN_MINIMUM_ADJUSTMENT_FACTOR, 2.5)
         self.assertEqual(PLACE_MINIMUM_ADJUSTMENT_FACTOR, 0)
 
+    def test_reset(self):
+        self.middleware.markets["1.23"][(123, 0)] = mock.Mock()
+        self.middleware._updated_runners["1.23"] = {(123, 0)}
+        self.middleware._runner_removals.append(mock.Mock())
+        markets = self.middleware.markets
+        self.middleware.reset()
+        self.assertIs(self.middleware.markets, markets)
+        self.assertEqual(self.middleware.markets, {})
+        self.assertEqual(self.middleware._updated_runners, {})
+        self.assertEqual(self.middleware._runner_removals, [])
+
     @mock.patch(
         "flumine.markets.middleware.SimulatedMiddleware._process_simulated_orders"
     )
@@ -103,7 +121,7 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_market = mock.Mock(blotter=[mock_order, mock_order_two])
         self.middleware._process_runner_removal(mock_market, 12345, 0, 16.2)
         self.assertEqual(mock_order.simulated.matched, [[123, 7.21, 10]])
-        self.assertEqual(mock_order.simulated.average_price_matched, 7.21)
+        mock_order.simulated.refresh_matched.assert_called_with()
         self.assertEqual(mock_order_two.simulated.matched, [[123, 8.6, 10]])
 
     def test__process_runner_removal_under_limit(self):
@@ -156,7 +174,9 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_market = mock.Mock(
             market_type="WIN", blotter=[mock_order], market_book=mock_market_book
         )
+        mock_market.get_runner_book.return_value = mock_market_book.runners[0]
         self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
+        mock_market.get_runner_book.assert_called_with(1234, 0)
 
         # The liability of £200 is adjusted by the multiplier of 37.5%, which s
         # defined in the example here: https://github.com/liampauling/flumine/issues/454
@@ -181,7 +201,9 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_market = mock.Mock(
             market_type="WIN", blotter=[mock_order], market_book=mock_market_book
         )
+        mock_market.get_runner_book.return_value = mock_market_book.runners[0]
         self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
+        mock_market.get_runner_book.assert_called_with(1234, 0)
 
         # The liability of £200 is adjusted by the multiplier of 37.5%, which s
         # defined in the example here: https://github.com/liampauling/flumine/issues/454
@@ -239,29 +261,211 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         # Size matched should be 100 / (10.0-1.0) \approx 11.11
         self.assertEqual(11.11, mock_order.current_order.size_matched)
 
+    def test__process_runner_removal_sp_exposures(self):
+        for market_type in ("WIN", "PLACE"):
+            blotter = Blotter("1.23")
+            mock_strategy = mock.Mock()
+            mock_strategy.client.paper_trade = True
+            trade = Trade("1.23", 1234, 0, mock_strategy)
+            order = trade.create_order("LAY", MarketOnCloseOrder(liability=100))
+            blotter[order.id] = order
+            self.assertEqual(
+                blotter.get_exposures(mock_strategy, order.lookup)[
+                    "worst_possible_profit_on_win"
+                ],
+                -100.0,
+            )
+            mock_market_book = mock.Mock()
+            mock_market_book.runners = [
+                mock.Mock(selection_id=1234, handicap=0, adjustment_factor=0)
+            ]
+            mock_market = mock.Mock(
+                market_id="1.23",
+                market_type=market_type,
+                blotter=blotter,
+                market_book=mock_market_book,
+            )
+            mock_market.get_runner_book.return_value = mock_market_book.runners[0]
+            self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
+            self.assertEqual(order.order_type.liability, 50)
+            self.assertEqual(
+                blotter.get_exposures(mock_strategy, order.lookup)[
+                    "worst_possible_profit_on_win"
+                ],
+                -50.0,
+            )
+
     def test__process_streaming_update(self):
         mock_market_book = mock.Mock(
             streaming_update={"img": True, "rc": [{"id": 3}, {"id": 4}]},
             runners=[mock.Mock(selection_id=1), mock.Mock(selection_id=2)],
         )
-        self.assertEqual(
-            self.middleware._process_streaming_update(mock_market_book), [1, 2]
-        )
+        self.assertIsNone(self.middleware._process_streaming_update(mock_market_book))
         mock_market_book = mock.Mock(
             streaming_update={"marketDefinition": {1: 2}, "rc": [{"id": 3}, {"id": 4}]},
             runners=[mock.Mock(selection_id=1), mock.Mock(selection_id=2)],
         )
-        self.assertEqual(
-            self.middleware._process_streaming_update(mock_market_book), [1, 2]
+        self.assertIsNone(self.middleware._process_streaming_update(mock_market_book))
+        mock_market_book = mock.Mock(
+            streaming_update={"conflated": True, "rc": [{"id": 3}]},
+            runners=[mock.Mock(selection_id=1), mock.Mock(selection_id=2)],
         )
+        self.assertIsNone(self.middleware._process_streaming_update(mock_market_book))
         mock_market_book = mock.Mock(
-            streaming_update={"rc": [{"id": 3}, {"id": 4}]},
+            streaming_update={
+                "rc": [
+                    {"id": 3},
+                    {"id": 4, "hc": 1.5, "trd": [[1.01, 2]]},
+                    {"id": 5, "trd": []},
+                ]
+            },
             runners=[mock.Mock(selection_id=1), mock.Mock(selection_id=2)],
         )
         self.assertEqual(
-            self.middleware._process_streaming_update(mock_market_book), [3, 4]
+            self.middleware._process_streaming_update(mock_market_book),
+            {(3, 0): (), (4, 1.5): [[1.01, 2]], (5, 0): None},
+        )
+
+    @mock.patch(
+        "flumine.markets.middleware.SimulatedMiddleware._process_simulated_orders"
+    )
+    @mock.patch("flumine.markets.middleware.SimulatedMiddleware._process_runner")
+    def test_call_runner_updates(
+        self, mock__process_runner, mock__process_simulated_orders
+    ):
+        mock_market = mock.Mock(context={}, market_id="1.23")
+        mock_runner_one = mock.Mock(status="ACTIVE", selection_id=1, handicap=0)
+        mock_runner_two = mock.Mock(status="ACTIVE", selection_id=2, handicap=0)
+        mock_market.market_book = mock.Mock(
+            streaming_update={"rc": [{"id": 1, "trd": [[1.01, 2]]}]},
+            runners=[mock_runner_one, mock_runner_two],
+        )
+        mock_runner_analytics_one = mock.Mock(traded={1.01: 2})
+        mock_runner_analytics_two = mock.Mock()
+        market_analytics = {
+            (1, 0): mock_runner_analytics_one,
+            (2, 0): mock_runner_analytics_two,
+        }
+        self.middleware.markets["1.23"] = market_analytics
+        self.middleware._updated_runners["1.23"] = {(1, 0), (2, 0)}
+        self.middleware(mock_market)
+        mock__process_runner.assert_called_once_with(
+            market_analytics, mock_runner_one, True, [[1.01, 2]]
+        )
+        mock_runner_analytics_one.assert_not_called()
+        mock_runner_analytics_two.assert_called_with(None, False)
+        self.assertEqual(self.middleware._updated_runners, {"1.23": {(1, 0)}})
+        mock__process_simulated_orders.assert_called_with(
+            mock_market, market_analytics, {(1, 0)}
         )
 
+    @mock.patch("flumine.markets.middleware.SimulatedMiddleware._process_traded_orders")
+    def test__process_simulated_orders_traded_runners(
+        self, mock__process_traded_orders
+    ):
+        mock_market = mock.Mock()
+        self.middleware._process_simulated_orders(mock_market, {}, {(123, 0)})
+        mock__process_traded_orders.assert_called_with(mock_market, {}, {(123, 0)})
+        mock_market.blotter.strategy_live_orders.assert_not_called()
+
+    def _create_resting_order(self, blotter, strategy, side, price, selection_id=123):
+        mock_order = mock.Mock(
+            selection_id=selection_id,
+            handicap=0,
+            lookup=("1.23", selection_id, 0),
+            side=side,
+            status=OrderStatus.EXECUTABLE,
+        )
+        mock_order.trade.strategy = strategy
+        mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order.order_type.price = price
+        mock_order.simulated._bsp_reconciled = True
+        blotter[str(len(blotter))] = mock_order
+        return mock_order
+
+    @mock.patch("flumine.markets.middleware.config")
+    def test__process_traded_orders(self, mock_config):
+        mock_config.simulated_strategy_isolation = True
+        mock_market = mock.Mock(blotter=Blotter("1.23"))
+        mock_market.market_book.bsp_reconciled = False
+        calls = []
+        lay_low = self._create_resting_order(mock_market.blotter, 1, "LAY", 1.5)
+        lay_high = self._create_resting_order(mock_market.blotter, 1, "LAY", 2.5)
+        back_low = self._create_resting_order(mock_market.blotter, 1, "BACK", 2.0)
+        back_high = self._create_resting_order(mock_market.blotter, 1, "BACK", 3.5)
+        back_other = self._create_resting_order(mock_market.blotter, 2, "BACK", 2.0)
+        other_runner = self._create_resting_order(
+            mock_market.blotter, 1, "BACK", 2.0, selection_id=456
+        )
+        pending = self._create_resting_order(mock_market.blotter, 1, "BACK", 1.5)
+        pending.status = OrderStatus.PENDING
+        for order in mock_market.blotter:
+            order.simulated.side_effect = lambda mb, traded, o=order: calls.append(
+                (o, traded)
+            )
+        market_analytics = {(123, 0): mock.Mock(traded={2.0: 10, 3.0: 4})}
+        self.middleware._process_traded_orders(
+            mock_market, market_analytics, {(123, 0)}
+        )
+        # lays highest first then backs lowest first
+        self.assertEqual([o for o, _ in calls], [lay_high, back_low, back_other])
+        lay_high.simulated.assert_called_with(
+            mock_market.market_book, {2.0: 10, 3.0: 4}
+        )
+        # traded copied per strategy
+        self.assertIs(calls[0][1], calls[1][1])
+        self.assertIsNot(calls[0][1], calls[2][1])
+        self.assertIsNot(calls[0][1], market_analytics[(123, 0)].traded)
+        lay_low.simulated.assert_not_called()
+        back_high.simulated.assert_not_called()
+        other_runner.simulated.assert_not_called()
+        pending.simulated.assert_not_called()
+
+    @mock.patch("flumine.markets.middleware.config")
+    def test__process_traded_orders_instance(self, mock_config):
+        mock_config.simulated_strategy_isolation = False
+        mock_market = mock.Mock(blotter=Blotter("1.23"))
+        mock_market.market_book.bsp_reconciled = False
+        order_one = self._create_resting_order(mock_market.blotter, 1, "BACK", 2.0)
+        order_two = self._create_resting_order(mock_market.blotter, 2, "BACK", 2.0)
+        market_analytics = {(123, 0): mock.Mock(traded={2.0: 10})}
+        self.middleware._process_traded_orders(
+            mock_market, market_analytics, {(123, 0)}
+        )
+        self.assertIs(
+            order_one.simulated.call_args[0][1], order_two.simulated.call_args[0][1]
+        )
+
+    @mock.patch("flumine.markets.middleware.config")
+    def test__process_traded_orders_bsp_reconciled(self, mock_config):
+        mock_config.simulated_strategy_isolation = True
+        mock_market = mock.Mock(blotter=Blotter("1.23"))
+        mock_market.market_book.bsp_reconciled = True
+        order_one = self._create_resting_order(mock_market.blotter, 1, "BACK", 2.0)
+        order_one.simulated._bsp_reconciled = False
+        order_two = self._create_resting_order(
+            mock_market.blotter, 1, "BACK", 2.0, selection_id=456
+        )
+        order_two.simulated._bsp_reconciled = False
+        order_three = self._create_resting_order(
+            mock_market.blotter, 1, "BACK", 2.0, selection_id=789
+        )
+        market_analytics = {(123, 0): mock.Mock(traded={2.0: 10})}
+        self.middleware._process_traded_orders(
+            mock_market, market_analytics, {(123, 0)}
+        )
+        order_one.simulated.assert_called_once_with(mock_market.market_book, {2.0: 10})
+        order_two.simulated.assert_called_once_with(mock_market.market_book, {})
+        order_three.simulated.assert_not_called()
+
+    def test_remove_market_updated_runners(self):
+        mock_market = mock.Mock(market_id="1.23")
+        self.middleware.markets["1.23"] = {}
+        self.middleware._updated_runners["1.23"] = set()
+        self.middleware.remove_market(mock_market)
+        self.assertEqual(self.middleware.markets, {})
+        self.assertEqual(self.middleware._updated_runners, {})
+
     def test__calculate_reduction_factor(self):
         self.assertEqual(self.middleware._calculate_reduction_factor(10, 10), 9)
         self.assertEqual(self.middleware._calculate_reduction_factor(1000, 0), 1000)
@@ -286,9 +490,12 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_order_three = mock.Mock(
             selection_id=123, handicap=1, status=OrderStatus.EXECUTABLE, simulated=False
         )
-        mock_market.blotter._strategy_orders = {
-            "test": [mock_order, mock_order_two, mock_order_three]
-        }
+        mock_market.flumine.strategies = ["test"]
+        mock_market.blotter.strategy_live_orders.return_value = [
+            mock_order,
+            mock_order_two,
+            mock_order_three,
+        ]
         mock_market_analytics = {
             (mock_order.selection_id, mock_order.handicap): mock.Mock(traded={1: 2})
         }
@@ -326,6 +533,52 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_order.simulated.assert_called_with(mock_market_book, {1: 2})
         mock_order_two.simulated.assert_not_called()
 
+    @mock.patch("flumine.markets.middleware.config")
+    def test__process_simulated_orders_traded_view(self, mock_config):
+        mock_config.simulated_strategy_isolation = True
+        mock_market = mock.Mock()
+
+        def consume(market_book, traded):
+            traded[1] = 0
+
+        mock_order = mock.Mock(
+            selection_id=123, handicap=1, status=OrderStatus.EXECUTABLE, side="LAY"
+        )
+        mock_order.order_type.price = 1.02
+        mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order.simulated.side_effect = consume
+        mock_order_two = mock.Mock(
+            selection_id=123, handicap=1, status=OrderStatus.EXECUTABLE, side="LAY"
+        )
+        mock_order_two.order_type.price = 1.02
+        mock_order_two.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_market.flumine.strategies = ["test", "test_two"]
+        strategy_live_orders = {"test": [mock_order], "test_two": [mock_order_two]}
+        mock_market.blotter.strategy_live_orders.side_effect = strategy_live_orders.get
+        traded = {1: 2}
+        mock_market_analytics = {
+            (123, 1): mock.Mock(traded=traded),
+            (456, 1): mock.Mock(traded={3: 4}),
+        }
+        self.middleware._process_simulated_orders(mock_market, mock_market_analytics)
+        # isolated per strategy and only copied on consumption
+        self.assertEqual(traded, {1: 2})
+        mock_order_two.simulated.assert_called_with(mock_market.market_book, {1: 2})
+        self.assertIs(mock_order_two.simulated.call_args[0][1]._traded, traded)
+
+    def test__get_traded_view(self):
+        mock_order = mock.Mock(selection_id=123, handicap=1)
+        traded = {1: 2}
+        _lookup = {}
+        traded_view = self.middleware._get_traded_view(
+            _lookup, {(123, 1): mock.Mock(traded=traded)}, mock_order
+        )
+        self.assertIsInstance(traded_view, TradedView)
+        self.assertEqual(_lookup, {(123, 1): traded_view})
+        self.assertIs(
+            self.middleware._get_traded_view(_lookup, {}, mock_order), traded_view
+        )
+
     def test__sort_orders(self):
         order_one = mock.Mock(side="LAY", bet_id=1)
         order_one.order_type.price = 1.01
@@ -373,7 +626,39 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         self.middleware._process_runner(market_analytics, mock_runner, False)
         self.assertEqual(len(market_analytics), 1)
         mock_runner_analytics.assert_called_with(mock_runner)
-        mock_runner_analytics().assert_called_with(mock_runner, False)
+        mock_runner_analytics().assert_called_with(mock_runner, False, None)
+
+
+class TradedViewTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.traded = {1.01: 2, 1.02: 3}
+        self.traded_view = TradedView(self.traded)
+
+    def test_init(self):
+        self.assertIs(self.traded_view._traded, self.traded)
+        self.assertFalse(self.traded_view._copied)
+
+    def test_read(self):
+        self.assertEqual(list(self.traded_view.items()), [(1.01, 2), (1.02, 3)])
+        self.assertEqual(list(self.traded_view), [1.01, 1.02])
+        self.assertEqual(self.traded_view[1.01], 2)
+        self.assertEqual(self.traded_view.get(1.03, 0), 0)
+        self.assertEqual(len(self.traded_view), 2)
+        self.assertTrue(self.traded_view)
+        self.assertFalse(TradedView({}))
+        self.assertEqual(self.traded_view, {1.01: 2, 1.02: 3})
+        self.assertEqual(self.traded_view, TradedView({1.01: 2, 1.02: 3}))
+        self.assertIs(self.traded_view._traded, self.traded)
+
+    def test_setitem(self):
+        for price, size in self.traded_view.items():
+            self.traded_view[price] = size - 1
+        self.assertTrue(self.traded_view._copied)
+        self.assertEqual(self.traded_view, {1.01: 1, 1.02: 2})
+        self.assertEqual(self.traded, {1.01: 2, 1.02: 3})
+        copied = self.traded_view._traded
+        self.traded_view[1.01] = 0
+        self.assertIs(self.traded_view._traded, copied)
 
 
 class RunnerAnalyticsTest(unittest.TestCase):
@@ -457,6 +742,95 @@ class RunnerAnalyticsTest(unittest.TestCase):
         )
         self.assertEqual(self.runner_analytics._p_v, {1.01: 69, 10: 32})
 
+    @mock.patch("flumine.markets.middleware.RunnerAnalytics._calculate_matched")
+    @mock.patch("flumine.markets.middleware.RunnerAnalytics._calculate_middle")
+    @mock.patch("flumine.markets.middleware.RunnerAnalytics._calculate_traded_update")
+    @mock.patch("flumine.markets.middleware.RunnerAnalytics._calculate_traded")
+    def test_call_traded_update(
+        self,
+        mock__calculate_traded,
+        mock__calculate_traded_update,
+        mock__calculate_middle,
+        mock__calculate_matched,
+    ):
+        mock_runner = mock.Mock()
+        self.runner_analytics(mock_runner, True, [[1.01, 2]])
+        mock__calculate_traded.assert_not_called()
+        mock__calculate_traded_update.assert_called_with(
+            [[1.01, 2]], mock_runner.ex.traded_volume, mock_runner.total_matched
+        )
+        self.assertEqual(self.runner_analytics.traded, mock__calculate_traded_update())
+        self.assertEqual(
+            self.runner_analytics._traded_volume, mock_runner.ex.traded_volume
+        )
+
+    def test__calculate_traded_update(self):
+        self.runner_analytics._p_v = {1.01: 30, 2: 5}
+        traded_volume = [
+            {"price": 1.01, "size": 69},
+            {"price": 2, "size": 5},
+            {"price": 10, "size": 32},
+        ]
+        self.assertEqual(
+            self.runner_analytics._calculate_traded_update(
+                [[10, 32], [1.01, 69]], traded_volume
+            ),
+            {1.01: 39.0, 10: 32},
+        )
+        self.assertEqual(list(self.runner_analytics.traded), [])
+        self.assertEqual(self.runner_analytics._p_v, {1.01: 69, 2: 5, 10: 32})
+
+    def test__calculate_traded_update_removal(self):
+        self.runner_analytics._p_v = {1.01: 30, 2: 5}
+        self.assertEqual(
+            self.runner_analytics._calculate_traded_update(
+                [[2, 0], [1.01, 20]], [{"price": 1.01, "size": 20}]
+            ),
+            {},
+        )
+        self.assertEqual(self.runner_analytics._p_v, {1.01: 20})
+
+    def test__calculate_traded_update_resync(self):
+        self.runner_analytics._p_v = {1.01: 30}
+        traded_volume = [
+            {"price": 1.01, "size": 31},
+            {"price": 2, "size": 5},
+            {"price": 10, "size": 32},
+        ]
+        self.assertEqual(
+            self.runner_analytics._calculate_traded_update([[10, 32]], traded_volume),
+            {1.01: 1.0, 2: 5, 10: 32},
+        )
+        self.assertEqual(self.runner_analytics._p_v, {1.01: 31, 2: 5, 10: 32})
+
+    def test__calculate_traded_update_resync_total_matched(self):
+        # missed update at an existing price, ladder length unchanged
+        self.runner_analytics._p_v = {1.01: 30, 2: 5}
+        self.runner_analytics._p_v_total = 35
+        traded_volume = [
+            {"price": 1.01, "size": 40},
+            {"price": 2, "size": 6},
+        ]
+        self.assertEqual(
+            self.runner_analytics._calculate_traded_update([[2, 6]], traded_volume, 46),
+            {1.01: 10.0, 2: 1.0},
+        )
+        self.assertEqual(self.runner_analytics._p_v, {1.01: 40, 2: 6})
+        self.assertEqual(self.runner_analytics._p_v_total, 46)
+
+    def test__calculate_traded_update_total_matched(self):
+        self.runner_analytics._p_v = {1.01: 30, 2: 5}
+        self.runner_analytics._p_v_total = 35
+        traded_volume = [
+            {"price": 1.01, "size": 30},
+            {"price": 2, "size": 6},
+        ]
+        self.assertEqual(
+            self.runner_analytics._calculate_traded_update([[2, 6]], traded_volume, 36),
+            {2: 1.0},
+        )
+        self.assertEqual(self.runner_analytics._p_v_total, 36)
+
     def test__calculate_middle(self):
         mock_runner = mock.Mock()
         mock_runner.ex.available_to_back = []
@@ -40,6 +40,7 @@ class BaseOrderTest(unittest.TestCase):
         self.assertIsNone(self.order.runner_status)
         self.assertIsNone(self.order.status)
         self.assertFalse(self.order.complete)
+        self.assertFalse(self.order.changed)
         self.assertEqual(self.order.status_log, [])
         self.assertIsNone(self.order.violation_msg)
         self.assertEqual(self.order.context, {1: 2})
@@ -63,9 +64,18 @@ class BaseOrderTest(unittest.TestCase):
         self.order._update_status(OrderStatus.EXECUTION_COMPLETE)
         self.assertEqual(self.order.status_log, [OrderStatus.EXECUTION_COMPLETE])
         self.assertEqual(self.order.status, OrderStatus.EXECUTION_COMPLETE)
+        self.assertTrue(self.order.changed)
         self.mock_trade.complete_trade.assert_called()
         mock__is_complete.assert_called()
 
+    def test_mark_changed(self):
+        self.order.mark_changed()
+        self.assertTrue(self.order.changed)
+        mock_blotter = mock.Mock()
+        self.order.blotter = mock_blotter
+        self.order.mark_changed()
+        mock_blotter.order_changed.assert_called_with(self.order)
+
     @mock.patch("flumine.order.order.BaseOrder._update_status")
     def test_placing(self, mock__update_status):
         self.order.placing()
@@ -145,6 +155,29 @@ class BaseOrderTest(unittest.TestCase):
         mock_current_order = mock.Mock()
         self.order.update_current_order(mock_current_order)
         self.assertEqual(self.order.responses.current_order, mock_current_order)
+        self.assertTrue(self.order.changed)
+
+    def test_update_current_order_unchanged(self):
+        state = dict(
+            status="EXECUTABLE",
+            persistence_type="LAPSE",
+            average_price_matched=0,
+            size_matched=0,
+            size_remaining=2,
+            size_lapsed=0,
+            size_cancelled=0,
+            size_voided=0,
+        )
+        self.order.update_current_order(mock.Mock(**state))
+        self.assertEqual(self.order._current_order_state, tuple(state.values()))
+        self.order.changed = False
+        # full image resend
+        mock_current_order = mock.Mock(**state)
+        self.order.update_current_order(mock_current_order)
+        self.assertEqual(self.order.responses.current_order, mock_current_order)
+        self.assertFalse(self.order.changed)
+        self.order.update_current_order(mock.Mock(**dict(state, size_matched=2)))
+        self.assertTrue(self.order.changed)
 
     def test_current_order(self):
         self.assertIsNone(self.order.current_order)
@@ -209,13 +242,21 @@ class BaseOrderTest(unittest.TestCase):
     def test_elapsed_seconds(self):
         self.assertIsNone(self.order.elapsed_seconds)
         mock_responses = mock.Mock()
-        mock_responses.date_time_placed = datetime.datetime.utcnow()
         self.order.responses = mock_responses
-        self.assertGreaterEqual(self.order.elapsed_seconds, 0)
+        self.assertEqual(
+            self.order.elapsed_seconds, mock_responses.elapsed_seconds_placed
+        )
 
-    def elapsed_seconds_created(self):
+    def test_elapsed_seconds_created(self):
         self.assertGreaterEqual(self.order.elapsed_seconds_created, 0)
 
+    def test_date_time_created(self):
+        self.order.time_created = 1497351220318
+        self.assertEqual(
+            self.order.date_time_created,
+            datetime.datetime(2017, 6, 13, 10, 53, 40, 318000),
+        )
+
     def test_elapsed_seconds_executable(self):
         self.assertIsNone(self.order.elapsed_seconds_executable)
         mock_responses = mock.Mock()
@@ -49,7 +49,7 @@ class BaseOrderTest(unittest.TestCase):
         market.blotter = {"123": betfair_order}
         event = mock.Mock(event=[mock.Mock(orders=[current_order])])
 
-        process.process_current_orders(
+        market_ids = process.process_current_orders(
             markets=markets,
             strategies=strategies,
             event=event,
@@ -57,6 +57,95 @@ class BaseOrderTest(unittest.TestCase):
             add_market=mock_add_market,
         )
         self.assertEqual(current_order, betfair_order.responses.current_order)
+        self.assertEqual(market_ids, ["market_id"])
+
+    def test_process_current_orders_paper_trade(self):
+        # SimulatedOrderStream current orders are the orders
+        markets = Markets()
+        market = Market(flumine=mock.Mock(), market_id="1.1", market_book=None)
+        markets.add_market("1.1", market)
+        mock_strategy = mock.Mock(name_hash="abcdefghijklm")
+        trade = mock.Mock(market_id="1.1", strategy=mock_strategy)
+        trade.client.paper_trade = True
+        order = BetfairOrder(trade=trade, side="BACK", order_type=mock.Mock())
+        order.bet_id = "321"
+        order.lookup = ("1.1", 123, 0)
+        market.blotter[order.id] = order
+        event = mock.Mock(event=[mock.Mock(orders=[order])])
+        for _ in range(2):
+            order.changed = False
+            process.process_current_orders(
+                markets, mock.Mock(), event, mock.Mock(), mock.Mock()
+            )
+            self.assertEqual(order.responses.current_order, order)
+            self.assertTrue(order.changed)
+
+    @mock.patch("flumine.order.process.process_current_order")
+    @mock.patch("flumine.order.process.reconcile_current_order")
+    def test_process_current_orders_reconciled(
+        self, mock_reconcile_current_order, mock_process_current_order
+    ):
+        markets = Markets()
+        mock_order = mock.Mock()
+        markets.add_reconciled_order("321", mock_order)
+        current_order = mock.Mock(bet_id="321")
+        event = mock.Mock(event=[mock.Mock(orders=[current_order])])
+        mock_log_control = mock.Mock()
+        process.process_current_orders(
+            markets, mock.Mock(), event, mock_log_control, mock.Mock()
+        )
+        mock_reconcile_current_order.assert_not_called()
+        mock_process_current_order.assert_called_with(
+            mock_order, current_order, mock_log_control
+        )
+
+    def test_reconcile_current_order(self):
+        markets = Markets()
+        market = Market(flumine=mock.Mock(), market_id="1.1", market_book=None)
+        markets.add_market("1.1", market)
+        mock_order = mock.Mock(bet_id=None)
+        market.blotter = {"123": mock_order}
+        current_order = mock.Mock(
+            customer_order_ref="abcdefghijklm-123", market_id="1.1", bet_id="321"
+        )
+        order = process.reconcile_current_order(
+            markets, mock.Mock(), current_order, mock.Mock()
+        )
+        self.assertEqual(order, mock_order)
+        self.assertEqual(markets.get_reconciled_order("321"), mock_order)
+
+    def test_reconcile_current_order_replaced(self):
+        markets = Markets()
+        mock_market = mock.Mock()
+        mock_order = mock.Mock(bet_id="321")
+        mock_market.blotter = {"123": mock_order}
+        mock_replacement_order = mock.Mock(bet_id="456")
+        markets._markets = {"1.1": mock_market}
+        current_order = mock.Mock(
+            customer_order_ref="abcdefghijklm-123", market_id="1.1", bet_id="456"
+        )
+        with mock.patch.object(
+            markets, "get_order_from_bet_id", return_value=mock_replacement_order
+        ) as mock_get_order_from_bet_id:
+            order = process.reconcile_current_order(
+                markets, mock.Mock(), current_order, mock.Mock()
+            )
+        mock_get_order_from_bet_id.assert_called_with(market_id="1.1", bet_id="456")
+        self.assertEqual(order, mock_replacement_order)
+        self.assertEqual(markets.get_reconciled_order("456"), mock_replacement_order)
+
+    @mock.patch("flumine.order.process.create_order_from_current", return_value=None)
+    def test_reconcile_current_order_missing(self, mock_create_order_from_current):
+        markets = Markets()
+        current_order = mock.Mock(
+            customer_order_ref="abcdefghijklm-123", market_id="1.1", bet_id="321"
+        )
+        self.assertIsNone(
+            process.reconcile_current_order(
+                markets, mock.Mock(), current_order, mock.Mock()
+            )
+        )
+        self.assertIsNone(markets.get_reconciled_order("321"))
 
     def test_process_current_order(self):
         mock_order = mock.Mock(status=OrderStatus.EXECUTABLE)
@@ -90,7 +179,7 @@ class BaseOrderTest(unittest.TestCase):
         )
         markets.add_market("market_id", market)
         cheap_hash = create_cheap_hash("strategy_name", 13)
-        strategy = mock.Mock(name_hash=cheap_hash)
+        strategy = mock.Mock(name_hash=cheap_hash, stream_ids=[])
         strategies = Strategies()
         strategies(strategy=strategy, client=mock.Mock())
         current_order = mock.Mock(
@@ -1,6 +1,8 @@
 import unittest
+import datetime
 from unittest import mock
 
+from flumine import clock
 from flumine.order.responses import Responses
 
 
@@ -14,12 +16,12 @@ class ResponsesTest(unittest.TestCase):
         self.assertEqual(self.responses.cancel_responses, [])
         self.assertEqual(self.responses.replace_responses, [])
         self.assertEqual(self.responses.cancel_responses, [])
-        self.assertIsNone(self.responses._date_time_placed)
+        self.assertIsNone(self.responses.time_placed)
         self.assertIsNone(self.responses.current_order)
 
     def test_placed(self):
         self.responses.placed(12)
-        self.assertIsNotNone(self.responses._date_time_placed)
+        self.assertIsNotNone(self.responses.time_placed)
         self.assertEqual(self.responses.place_response, 12)
 
     def test_cancelled(self):
@@ -37,8 +39,17 @@ class ResponsesTest(unittest.TestCase):
 
     def test_date_time_placed(self):
         self.assertIsNone(self.responses.date_time_placed)
-        self.responses._date_time_placed = 1
+        self.responses.time_placed = 1000
         self.responses.current_order = mock.Mock(placed_date=2)
-        self.assertEqual(self.responses.date_time_placed, 1)
-        self.responses._date_time_placed = None
+        self.assertEqual(
+            self.responses.date_time_placed, datetime.datetime(1970, 1, 1, 0, 0, 1)
+        )
+        self.responses.time_placed = None
         self.assertEqual(self.responses.date_time_placed, 2)
+
+    def test_elapsed_seconds_placed(self):
+        self.assertIsNone(self.responses.elapsed_seconds_placed)
+        self.responses.current_order = mock.Mock(placed_date=datetime.datetime.utcnow())
+        self.assertGreaterEqual(self.responses.elapsed_seconds_placed, 0)
+        self.responses.time_placed = clock.time() - 2000
+        self.assertAlmostEqual(self.responses.elapsed_seconds_placed, 2, delta=1)
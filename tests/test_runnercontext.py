@@ -2,6 +2,7 @@ import uuid
 import unittest
 import datetime
 
+from flumine import clock
 from flumine.strategy.runnercontext import RunnerContext
 
 
@@ -54,10 +55,24 @@ class RunnerContextTest(unittest.TestCase):
 
     def test_placed_elapsed_seconds(self):
         self.assertIsNone(self.context.placed_elapsed_seconds)
-        self.context.datetime_last_placed = datetime.datetime.utcnow()
+        self.context.time_last_placed = clock.time()
         self.assertGreaterEqual(self.context.placed_elapsed_seconds, 0)
 
+    def test_datetime_last_placed(self):
+        self.context.time_last_placed = 1497351220318
+        self.assertEqual(
+            self.context.datetime_last_placed,
+            datetime.datetime(2017, 6, 13, 10, 53, 40, 318000),
+        )
+
+    def test_datetime_last_reset(self):
+        self.context.time_last_reset = 1497351220318
+        self.assertEqual(
+            self.context.datetime_last_reset,
+            datetime.datetime(2017, 6, 13, 10, 53, 40, 318000),
+        )
+
     def test_reset_elapsed_seconds(self):
         self.assertIsNone(self.context.reset_elapsed_seconds)
-        self.context.datetime_last_reset = datetime.datetime.utcnow()
+        self.context.time_last_reset = clock.time()
         self.assertGreaterEqual(self.context.reset_elapsed_seconds, 0)
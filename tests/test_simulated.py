@@ -1,8 +1,10 @@
 import unittest
 from unittest import mock
 
+from flumine import config
 from flumine.backtest import simulated
 from flumine.order.ordertype import OrderTypes
+from flumine.utils import wap
 
 
 class SimulatedTest(unittest.TestCase):
@@ -415,6 +417,9 @@ class SimulatedTest(unittest.TestCase):
             self.simulated._get_runner(mock_market_book),
             mock_runner,
         )
+        # index is built once per MarketBook
+        self.assertEqual(mock_market_book._runner_index, {(1234, 1): mock_runner})
+        mock_market_book = mock.Mock()
         mock_runner = mock.Mock(selection_id=134, handicap=1)
         mock_market_book.runners = [mock_runner]
         self.assertIsNone(self.simulated._get_runner(mock_market_book))
@@ -670,6 +675,86 @@ class SimulatedTest(unittest.TestCase):
         self.assertEqual(self.simulated.size_matched, 2.64)
         self.assertEqual(self.simulated.average_price_matched, 10.0)
 
+    def test__update_matched_partial_fills(self):
+        self.mock_order_type.size = 1000
+        matched = []
+        for i in range(500):
+            match = [i, 1.01 + (i % 50) / 10, 0.01 * (i % 7) + 0.01]
+            matched.append(list(match))
+            self.simulated._update_matched(match)
+            self.assertEqual(
+                (self.simulated.size_matched, self.simulated.average_price_matched),
+                wap(matched),
+            )
+            self.assertEqual(
+                self.simulated.size_remaining, round(1000 - wap(matched)[0], 2)
+            )
+
+    def test_refresh_matched(self):
+        self.simulated._update_matched([12345, 10.0, 2])
+        self.simulated.matched[0][1] = 5.0
+        self.assertEqual(self.simulated.average_price_matched, 10.0)
+        self.simulated.refresh_matched()
+        self.assertEqual(self.simulated.size_matched, 2)
+        self.assertEqual(self.simulated.average_price_matched, 5.0)
+
+    def test_matched_setter(self):
+        self.simulated._update_matched([12345, 10.0, 2])
+        self.simulated.matched = [[12345, 4.0, 1], [12346, 6.0, 1]]
+        self.assertEqual(self.simulated.size_matched, 2)
+        self.assertEqual(self.simulated.average_price_matched, 5.0)
+        self.simulated.matched = []
+        self.assertEqual(self.simulated.size_matched, 0)
+        self.assertEqual(self.simulated.average_price_matched, 0)
+        self.simulated._update_matched([12347, 3.0, 1])
+        self.assertEqual(self.simulated.size_matched, 1)
+        self.assertEqual(self.simulated.average_price_matched, 3.0)
+
+    def test_size_remaining_cache(self):
+        self.assertEqual(self.simulated.size_remaining, 2)
+        self.assertEqual(self.simulated._size_remaining, (2.0, 2))
+        self.simulated.size_cancelled = 0.5
+        self.assertIsNone(self.simulated._size_remaining)
+        self.assertEqual(self.simulated.size_remaining, 1.5)
+        self.simulated.size_lapsed = 0.5
+        self.assertEqual(self.simulated.size_remaining, 1)
+        self.simulated.size_voided = 0.5
+        self.assertEqual(self.simulated.size_remaining, 0.5)
+        self.simulated._update_matched([1234, 1.5, 0.5])
+        self.assertEqual(self.simulated.size_remaining, 0)
+        self.mock_order_type.size = 4
+        self.assertEqual(self.simulated.size_remaining, 2)
+
+    @mock.patch("flumine.backtest.simulated.Simulated.order_changed")
+    def test__changed(self, mock_order_changed):
+        self.simulated._size_remaining = (2, 2)
+        self.simulated.size_cancelled = 1
+        self.assertIsNone(self.simulated._size_remaining)
+        self.mock_order.mark_changed.assert_called_with()
+        mock_order_changed.assert_called_with()
+
+    @mock.patch("flumine.backtest.simulated.Simulated.order_changed")
+    def test__changed_backtest(self, mock_order_changed):
+        config.simulated = True
+        try:
+            self.simulated._update_matched([1234, 1.5, 0.5])
+        finally:
+            config.simulated = False
+        mock_order_changed.assert_not_called()
+
+    def test_order_changed(self):
+        mock_stream = mock.Mock()
+        self.mock_order.trade.client.simulated_order_stream = mock_stream
+        self.simulated.order_changed()
+        mock_stream.order_changed.assert_called_with(self.mock_order)
+        self.mock_order.trade.client.simulated_order_stream = None
+        self.simulated.order_changed()
+        self.assertEqual(mock_stream.order_changed.call_count, 1)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self.simulated.unknown = 1
+
     def test_size_remaining(self):
         self.assertEqual(self.simulated.size_remaining, 2)
         self.simulated._update_matched([1234, 1, 1])
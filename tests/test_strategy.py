@@ -10,14 +10,72 @@ class StrategiesTest(unittest.TestCase):
 
     def test_init(self):
         self.assertEqual(self.strategies._strategies, [])
+        self.assertEqual(self.strategies._stream_index, {})
+        self.assertEqual(self.strategies._indexed_stream_ids, {})
+        self.assertEqual(self.strategies._hashes, {})
 
     def test_call(self):
-        mock_strategy = mock.Mock()
+        mock_strategy = mock.Mock(stream_ids=[1])
         mock_client = mock.Mock()
         self.strategies(mock_strategy, mock_client)
         self.assertEqual(self.strategies._strategies, [mock_strategy])
         mock_strategy.add.assert_called_with()
         mock_strategy.client = mock_client
+        self.assertEqual(self.strategies._stream_index, {1: [mock_strategy]})
+        self.assertEqual(self.strategies._indexed_stream_ids, {mock_strategy: {1}})
+        self.assertEqual(
+            self.strategies._hashes, {mock_strategy.name_hash: mock_strategy}
+        )
+
+    def test_update_stream_index(self):
+        mock_strategy_one = mock.Mock(stream_ids=[1, 2, 2])
+        mock_strategy_two = mock.Mock(stream_ids=[3, 2])
+        self.strategies._indexed_stream_ids = {
+            mock_strategy_one: set(),
+            mock_strategy_two: set(),
+        }
+        self.strategies.update_stream_index(mock_strategy_one)
+        self.strategies.update_stream_index(mock_strategy_two)
+        self.strategies.update_stream_index(mock_strategy_one)
+        self.assertEqual(
+            self.strategies._stream_index,
+            {
+                1: [mock_strategy_one],
+                2: [mock_strategy_one, mock_strategy_two],
+                3: [mock_strategy_two],
+            },
+        )
+
+    def test_update_stream_index_not_added(self):
+        mock_strategy = mock.Mock(stream_ids=[1])
+        self.strategies.update_stream_index(mock_strategy)
+        self.assertEqual(self.strategies._stream_index, {})
+
+    def test_stream_strategies(self):
+        mock_strategy = mock.Mock(stream_ids=[1])
+        self.strategies(mock_strategy, mock.Mock())
+        self.assertEqual(self.strategies.stream_strategies(1), [mock_strategy])
+        self.assertEqual(self.strategies.stream_strategies(2), [])
+        # subscribed after add
+        mock_strategy.stream_ids = [1, 2]
+        self.strategies.update_stream_index(mock_strategy)
+        self.assertEqual(self.strategies.stream_strategies(2), [mock_strategy])
+
+    def test_stream_strategies_miss(self):
+        mock_strategy = mock.Mock(stream_ids=[1])
+        self.strategies(mock_strategy, mock.Mock())
+        # custom stream subscribed to outside of flumine
+        mock_strategy.stream_ids = [1, 3]
+        self.assertEqual(self.strategies.stream_strategies(3), [mock_strategy])
+        self.assertEqual(self.strategies._stream_index[3], [mock_strategy])
+        self.assertEqual(self.strategies.stream_strategies(4), [])
+        self.assertNotIn(4, self.strategies._stream_index)
+
+    def test_hashes(self):
+        mock_strategy = mock.Mock(stream_ids=[], name_hash="abc")
+        self.strategies(mock_strategy, mock.Mock())
+        self.assertEqual(self.strategies.hashes, {"abc": mock_strategy})
+        self.assertIs(self.strategies.hashes, self.strategies.hashes)
 
     def test_start(self):
         mock_strategy = mock.Mock()
@@ -230,6 +288,17 @@ class BaseStrategyTest(unittest.TestCase):
         self.strategy.historic_stream_ids = [123]
         self.assertEqual(self.strategy.stream_ids, [123])
 
+    def test_stream_id_set(self):
+        self.assertEqual(self.strategy.stream_id_set, set())
+        mock_stream = mock.Mock(stream_id=321)
+        self.strategy.streams.append(mock_stream)
+        self.assertEqual(self.strategy.stream_id_set, {321})
+        self.assertIs(self.strategy.stream_id_set, self.strategy.stream_id_set)
+        self.strategy.historic_stream_ids.append(123)
+        self.assertEqual(self.strategy.stream_id_set, {123})
+        self.strategy.historic_stream_ids = [456]
+        self.assertEqual(self.strategy.stream_id_set, {456})
+
     def test_info(self):
         self.assertEqual(
             self.strategy.info,
@@ -246,6 +315,7 @@ class BaseStrategyTest(unittest.TestCase):
                 "max_order_exposure": 2,
                 "max_selection_exposure": 1,
                 "max_trade_count": 3,
+                "process_orders_on_change": False,
                 "client": str(self.strategy.client),
             },
         )
@@ -1,3 +1,9 @@
+import os
+import bz2
+import gzip
+import lzma
+import tarfile
+import tempfile
 import unittest
 import datetime
 from unittest import mock
@@ -26,6 +32,9 @@ class StreamsTest(unittest.TestCase):
         mock_strategy = mock.Mock(streams=[], raw_data=False)
         self.streams(mock_strategy)
         mock_add_stream.assert_called_with(mock_strategy)
+        self.mock_flumine.strategies.update_stream_index.assert_called_with(
+            mock_strategy
+        )
 
     @mock.patch("flumine.streams.streams.Streams.add_stream")
     def test_call_data_stream(self, mock_add_stream):
@@ -33,10 +42,12 @@ class StreamsTest(unittest.TestCase):
         self.streams(mock_strategy)
         mock_add_stream.assert_called_with(mock_strategy)
 
-    @mock.patch("flumine.streams.streams.get_file_md")
     @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
-    def test_call_backtest_markets(self, mock_add_historical_stream, mock_get_file_md):
+    def test_call_backtest_markets(self, mock_add_historical_stream):
         self.mock_flumine.BACKTEST = True
+        mock_market_index = mock.Mock()
+        mock_market_index.filter.return_value = ["dubs of the mad skint and british"]
+        self.streams._market_index = mock_market_index
         mock_strategy = mock.Mock(
             streams=[],
             historic_stream_ids=[],
@@ -55,53 +66,35 @@ class StreamsTest(unittest.TestCase):
         )
         self.assertEqual(len(mock_strategy.streams), 1)
         self.assertEqual(len(mock_strategy.historic_stream_ids), 1)
-        mock_get_file_md.assert_has_calls(
-            [
-                call("dubs of the mad skint and british", "marketType"),
-                call("dubs of the mad skint and british", "countryCode"),
-            ]
-        )
-
-    @mock.patch("flumine.streams.streams.get_file_md", return_value="PLACE")
-    @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
-    def test_call_backtest_markets_type(
-        self, mock_add_historical_stream, mock_get_file_md
-    ):
-        self.mock_flumine.BACKTEST = True
-        mock_strategy = mock.Mock(
-            streams=[],
-            historic_stream_ids=[],
-            market_filter={
-                "markets": ["dubs of the mad skint and british"],
-                "listener_kwargs": {"canary_yellow": True},
-                "market_types": ["WIN"],
-            },
+        mock_market_index.update.assert_called_with(
+            ["dubs of the mad skint and british"]
         )
-        self.streams(mock_strategy)
-
-        mock_add_historical_stream.assert_not_called()
-        self.assertEqual(len(mock_strategy.streams), 0)
-        self.assertEqual(len(mock_strategy.historic_stream_ids), 0)
-        mock_get_file_md.assert_has_calls(
-            [
-                call("dubs of the mad skint and british", "marketType"),
-                call("dubs of the mad skint and british", "countryCode"),
-            ]
+        mock_market_index.filter.assert_called_with(
+            ["dubs of the mad skint and british"],
+            market_types=None,
+            country_codes=None,
+            event_ids=None,
+            venues=None,
+            market_start_time=None,
         )
 
-    @mock.patch("flumine.streams.streams.get_file_md", return_value="PLACE")
     @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
-    def test_call_backtest_country_code(
-        self, mock_add_historical_stream, mock_get_file_md
-    ):
+    def test_call_backtest_markets_filter(self, mock_add_historical_stream):
         self.mock_flumine.BACKTEST = True
+        mock_market_index = mock.Mock()
+        mock_market_index.filter.return_value = []
+        self.streams._market_index = mock_market_index
         mock_strategy = mock.Mock(
             streams=[],
             historic_stream_ids=[],
             market_filter={
                 "markets": ["dubs of the mad skint and british"],
                 "listener_kwargs": {"canary_yellow": True},
+                "market_types": ["WIN"],
                 "country_codes": ["VERDANSK"],
+                "event_ids": ["123"],
+                "venues": ["Ascot"],
+                "market_start_time": {"from": "2021-01-01T00:00:00.000Z"},
             },
         )
         self.streams(mock_strategy)
@@ -109,11 +102,13 @@ class StreamsTest(unittest.TestCase):
         mock_add_historical_stream.assert_not_called()
         self.assertEqual(len(mock_strategy.streams), 0)
         self.assertEqual(len(mock_strategy.historic_stream_ids), 0)
-        mock_get_file_md.assert_has_calls(
-            [
-                call("dubs of the mad skint and british", "marketType"),
-                call("dubs of the mad skint and british", "countryCode"),
-            ]
+        mock_market_index.filter.assert_called_with(
+            ["dubs of the mad skint and british"],
+            market_types=["WIN"],
+            country_codes=["VERDANSK"],
+            event_ids=["123"],
+            venues=["Ascot"],
+            market_start_time={"from": "2021-01-01T00:00:00.000Z"},
         )
 
     @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
@@ -222,14 +217,12 @@ class StreamsTest(unittest.TestCase):
         self.assertEqual(len(self.streams), 1)
         mock_increment.assert_not_called()
 
-    @mock.patch("flumine.streams.streams.get_file_md")
     @mock.patch("flumine.streams.streams.HistoricalStream")
     @mock.patch("flumine.streams.streams.Streams._increment_stream_id")
-    def test_add_historical_stream(
-        self, mock_increment, mock_historical_stream_class, mock_get_file_md
-    ):
+    def test_add_historical_stream(self, mock_increment, mock_historical_stream_class):
         mock_historical_stream_class.__name__ = "test"
         self.mock_flumine.BACKTEST = True
+        self.streams._market_index = mock.MagicMock()
         mock_strategy = mock.Mock()
         mock_strategy.market_filter = 1
         mock_strategy.market_data_filter = 2
@@ -242,7 +235,7 @@ class StreamsTest(unittest.TestCase):
         )
         self.assertEqual(len(self.streams), 1)
         mock_increment.assert_called_with()
-        mock_get_file_md.assert_called_with("GANG", "eventId")
+        self.streams.market_index.get.assert_called_with("GANG")
         mock_historical_stream_class.assert_called_with(
             flumine=self.mock_flumine,
             stream_id=mock_increment(),
@@ -252,46 +245,57 @@ class StreamsTest(unittest.TestCase):
             conflate_ms=mock_strategy.conflate_ms,
             output_queue=False,
             event_processing=False,
-            event_id=mock_get_file_md(),
+            event_id=self.streams.market_index.get()["event_id"],
             inplay=True,
         )
 
     def test_add_historical_stream_old(self):
         self.mock_flumine.BACKTEST = True
+        self.streams._market_index = mock.MagicMock()
         mock_strategy = mock.Mock()
-        mock_stream = mock.Mock(
-            spec=streams.HistoricalStream, event_processing=False, listener_kwargs={}
-        )
-        mock_stream.market_filter = "GANG"
-        self.streams._streams = [mock_stream]
-
         stream = self.streams.add_historical_stream(
-            mock_strategy, "GANG", event_processing=False, **{}
+            mock_strategy, "GANG", event_processing=False, inplay=True
         )
-        self.assertEqual(stream, mock_stream)
-        self.assertEqual(len(self.streams), 1)
+        self.assertEqual(
+            self.streams.add_historical_stream(
+                mock_strategy, "GANG", event_processing=False, inplay=True
+            ),
+            stream,
+        )
+        self.assertNotEqual(
+            self.streams.add_historical_stream(
+                mock_strategy, "GANG", event_processing=True, inplay=True
+            ),
+            stream,
+        )
+        self.assertNotEqual(
+            self.streams.add_historical_stream(
+                mock_strategy, "GANG", event_processing=False
+            ),
+            stream,
+        )
+        self.assertEqual(len(self.streams), 3)
+        self.assertEqual(len(self.streams._historical_streams), 3)
 
-    @mock.patch("flumine.streams.streams.get_file_md")
     @mock.patch("flumine.streams.streams.HistoricalStream")
     @mock.patch("flumine.streams.streams.Streams._increment_stream_id")
     def test_add_historical_stream_kwargs(
-        self, mock_increment, mock_historical_stream_class, mock_get_file_md
+        self, mock_increment, mock_historical_stream_class
     ):
         mock_historical_stream_class.__name__ = "test"
         self.mock_flumine.BACKTEST = True
+        self.streams._market_index = mock.MagicMock()
         mock_strategy = mock.Mock()
-        mock_stream = mock.Mock(
-            spec=streams.HistoricalStream, event_processing=False, listener_kwargs={}
-        )
-        mock_stream.market_filter = "GANG"
+        mock_stream = mock.Mock()
         self.streams._streams = [mock_stream]
+        self.streams._historical_streams = {("GANG", False, ()): mock_stream}
 
         self.streams.add_historical_stream(
             mock_strategy, "GANG", event_processing=False, **{"inplay": True}
         )
         self.assertEqual(len(self.streams), 2)
         mock_increment.assert_called_with()
-        mock_get_file_md.assert_called_with("GANG", "eventId")
+        self.streams.market_index.get.assert_called_with("GANG")
         mock_historical_stream_class.assert_called_with(
             flumine=self.mock_flumine,
             stream_id=mock_increment(),
@@ -301,21 +305,19 @@ class StreamsTest(unittest.TestCase):
             conflate_ms=mock_strategy.conflate_ms,
             output_queue=False,
             event_processing=False,
-            event_id=mock_get_file_md(),
+            event_id=self.streams.market_index.get()["event_id"],
             inplay=True,
         )
 
-    @mock.patch("flumine.streams.streams.get_file_md")
     @mock.patch("flumine.streams.streams.HistoricalStream")
-    def test_add_historical_stream_event_processing(
-        self, mock_historical_stream_class, mock_get_file_md
-    ):
+    def test_add_historical_stream_event_processing(self, mock_historical_stream_class):
         mock_historical_stream_class.__name__ = "test"
         self.mock_flumine.BACKTEST = True
+        self.streams._market_index = mock.MagicMock()
         mock_strategy = mock.Mock()
-        mock_stream = mock.Mock(spec=streams.HistoricalStream, event_processing=False)
-        mock_stream.market_filter = "GANG"
+        mock_stream = mock.Mock()
         self.streams._streams = [mock_stream]
+        self.streams._historical_streams = {("GANG", False, ()): mock_stream}
 
         stream = self.streams.add_historical_stream(
             mock_strategy, "GANG", event_processing=True
@@ -361,6 +363,7 @@ class StreamsTest(unittest.TestCase):
             client=mock_client,
             custom=True,
         )
+        self.assertEqual(mock_client.simulated_order_stream, mock_order_stream_class())
 
     @mock.patch("flumine.streams.streams.Streams._increment_stream_id")
     def test_add_custom_stream(self, mock_increment):
@@ -388,6 +391,12 @@ class StreamsTest(unittest.TestCase):
         self.streams.stop()
         mock_stream.stop.assert_called_with()
 
+    @mock.patch("flumine.streams.streams.MarketIndex")
+    def test_market_index(self, mock_market_index_class):
+        market_index = self.streams.market_index
+        self.assertEqual(self.streams.market_index, market_index)
+        mock_market_index_class.assert_called_once_with(":memory:")
+
     def test__increment_stream_id(self):
         self.assertEqual(self.streams._increment_stream_id(), 1000)
 
@@ -626,8 +635,10 @@ class TestHistoricalStream(unittest.TestCase):
         self.assertEqual(self.stream.conflate_ms, 100)
         self.assertIsNone(self.stream._stream)
         self.assertIsNone(self.stream.MAX_LATENCY)
-        self.assertTrue(self.stream._listener.inplay)
-        self.assertEqual(self.stream._listener.seconds_to_start, 123)
+        self.assertEqual(
+            self.stream.listener_kwargs, {"inplay": True, "seconds_to_start": 123}
+        )
+        self.assertFalse(hasattr(self.stream, "__dict__"))
 
     def test_run(self):
         self.stream.run()
@@ -635,21 +646,212 @@ class TestHistoricalStream(unittest.TestCase):
     def test_handle_output(self):
         self.stream.handle_output()
 
+    def test_stop(self):
+        self.stream.stop()
+
+    def test_create_listener(self):
+        listener = self.stream.create_listener()
+        self.assertIsInstance(listener, historicalstream.HistoricListener)
+        self.assertTrue(listener.inplay)
+        self.assertEqual(listener.seconds_to_start, 123)
+        self.assertIsNone(listener.output_queue)
+        self.assertIsNone(listener.max_latency)
+        self.assertFalse(listener.lightweight)
+        self.assertFalse(listener.debug)
+        self.assertFalse(listener.update_clk)
+        self.assertIsNot(listener, self.stream.create_listener())
+
+    @mock.patch("flumine.streams.historicalstream.HistoricalStream.create_listener")
     @mock.patch("flumine.streams.historicalstream.FlumineHistoricalGeneratorStream")
-    def test_create_generator(self, mock_generator):
+    def test_create_generator(self, mock_generator, mock_create_listener):
         generator = self.stream.create_generator()
         mock_generator.assert_called_with(
             file_path={"test": "me"},
-            listener=self.stream._listener,
+            listener=mock_create_listener(),
             operation="marketSubscription",
             unique_id=self.stream.stream_id,
         )
-        self.assertIsNone(self.stream._listener.max_latency)
-        self.assertFalse(self.stream._listener.lightweight)
-        self.assertFalse(self.stream._listener.debug)
-        self.assertFalse(self.stream._listener.update_clk)
         self.assertEqual(generator, mock_generator().get_generator())
 
+    def test_client(self):
+        self.assertEqual(self.stream.client, self.mock_flumine.client)
+        self.assertEqual(
+            self.stream.betting_client, self.mock_flumine.client.betting_client
+        )
+
+
+class TestOpenHistoricFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.file_path = "tests/resources/BASIC-1.132153978"
+        with open(self.file_path, "rb") as f:
+            self.data = f.read()
+        with open(self.file_path, "r") as f:
+            self.lines = f.readlines()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def _read(self, path: str, **kwargs) -> list:
+        with historicalstream.open_historic_file(path, **kwargs) as f:
+            return list(f)
+
+    def test_plain(self):
+        self.assertEqual(self._read(self.file_path), self.lines)
+
+    def test_compressed(self):
+        for name, compress in (
+            ("1.132153978.gz", gzip.compress),
+            ("1.132153978.bz2", bz2.compress),
+            ("1.132153978.xz", lzma.compress),
+        ):
+            path = self._write(name, compress(self.data))
+            self.assertEqual(self._read(path), self.lines)
+            self.assertEqual(self._read(path, buffer_size=1024), self.lines)
+
+    def test_background(self):
+        path = self._write("1.132153978.bz2", bz2.compress(self.data))
+        self.assertEqual(
+            self._read(path, background=True, buffer_size=1024), self.lines
+        )
+
+    def test_background_early_exit(self):
+        with historicalstream.open_historic_file(
+            self.file_path, background=True, buffer_size=1024
+        ) as f:
+            self.assertEqual(next(iter(f)), self.lines[0])
+
+    def test_archive(self):
+        member_path = self._write("1.132153978.bz2", bz2.compress(self.data))
+        archive_path = os.path.join(self.tmp_dir.name, "2016_12_DecRacingPro.tar")
+        with tarfile.open(archive_path, "w") as tar:
+            tar.add(member_path, arcname="BASIC/2016/Dec/1/1.132153978.bz2")
+            tar.add(self.file_path, arcname="BASIC/2016/Dec/1/1.132153978")
+        self.assertEqual(
+            historicalstream.split_archive_path(
+                os.path.join(archive_path, "BASIC/2016/Dec/1/1.132153978.bz2")
+            ),
+            (archive_path, "BASIC/2016/Dec/1/1.132153978.bz2"),
+        )
+        for member in ("1.132153978.bz2", "1.132153978"):
+            path = os.path.join(archive_path, "BASIC/2016/Dec/1", member)
+            self.assertEqual(self._read(path), self.lines)
+        with self.assertRaises(FileNotFoundError):
+            self._read(os.path.join(archive_path, "BASIC/1.123"))
+
+    def test_split_archive_path(self):
+        self.assertEqual(
+            historicalstream.split_archive_path(self.file_path), (None, None)
+        )
+        self.assertEqual(
+            historicalstream.split_archive_path("/tmp/missing.tar/1.123"),
+            (None, None),
+        )
+
+    @mock.patch("flumine.streams.historicalstream.zstandard", None)
+    def test_zstd_missing(self):
+        path = self._write("1.132153978.zst", b"\x28\xb5\x2f\xfd" + b"0" * 10)
+        with self.assertRaises(ImportError):
+            self._read(path)
+
+    @mock.patch("flumine.streams.historicalstream.READERS", [])
+    def test_register_reader(self):
+        mock_opener = mock.Mock(side_effect=lambda f: f)
+        historicalstream.register_reader("test", b"{", mock_opener)
+        self.assertEqual(self._read(self.file_path), self.lines)
+        mock_opener.assert_called()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+
+class TestReplayCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.file_path = "tests/resources/BASIC-1.132153978"
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+
+    def _text_updates(self, file_path: str) -> list:
+        updates = []
+        with historicalstream.open_historic_file(file_path) as f:
+            for line in f:
+                update = historicalstream.json.loads(line)
+                updates.append((update["pt"], update["mc"]))
+        return updates
+
+    def test_compile_read(self):
+        cache_path = os.path.join(self.tmp_dir.name, "test.flr")
+        self.assertEqual(
+            historicalstream.compile_replay_cache(self.file_path, cache_path),
+            cache_path,
+        )
+        self.assertEqual(
+            list(historicalstream.read_replay_cache(cache_path)),
+            self._text_updates(self.file_path),
+        )
+
+    def test_read_invalid(self):
+        cache_path = os.path.join(self.tmp_dir.name, "test.flr")
+        with open(cache_path, "wb") as f:
+            f.write(b"hello world")
+        with self.assertRaises(ValueError):
+            list(historicalstream.read_replay_cache(cache_path))
+
+    def test_get_replay_cache(self):
+        file_path = os.path.join(self.tmp_dir.name, "1.132153978")
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        with open(file_path, "wb") as f:
+            f.write(data)
+        cache_path = historicalstream.get_replay_cache(file_path, self.cache_dir)
+        self.assertEqual(
+            cache_path,
+            os.path.join(
+                self.cache_dir, historicalstream.file_hash(file_path) + ".flr"
+            ),
+        )
+        with mock.patch(
+            "flumine.streams.historicalstream.compile_replay_cache"
+        ) as mock_compile:
+            self.assertEqual(
+                historicalstream.get_replay_cache(file_path, self.cache_dir),
+                cache_path,
+            )
+            mock_compile.assert_not_called()
+        # source changed so recompiled
+        with open(file_path, "wb") as f:
+            f.write(data.splitlines(True)[0])
+        new_cache_path = historicalstream.get_replay_cache(file_path, self.cache_dir)
+        self.assertNotEqual(new_cache_path, cache_path)
+        self.assertEqual(
+            len(list(historicalstream.read_replay_cache(new_cache_path))), 1
+        )
+
+    def test_replay(self):
+        def replay():
+            stream = streams.HistoricalStream(
+                mock.Mock(), 1, None, None, self.file_path, {}, output_queue=False
+            )
+            return [
+                (mb.publish_time_epoch, mb.status, mb.total_matched)
+                for market_books in stream.create_generator()()
+                for mb in market_books
+            ]
+
+        text = replay()
+        with mock.patch(
+            "flumine.streams.historicalstream.config.historic_replay_cache_dir",
+            self.cache_dir,
+        ):
+            self.assertEqual(replay(), text)
+            self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
 
 class TestFlumineMarketStream(unittest.TestCase):
     def setUp(self) -> None:
@@ -909,15 +1111,91 @@ class TestSimulatedOrderStream(unittest.TestCase):
         self.assertEqual(current_orders.orders, [1])
         self.assertFalse(current_orders.more_available)
 
-    # def test_run(self):
-    #     pass
+    def test_order_changed(self):
+        self.stream.order_changed(1)
+        self.assertEqual(self.stream._changed_orders.get_nowait(), 1)
+
+    def test_stop(self):
+        self.stream.stop()
+        self.assertIsNone(self.stream._changed_orders.get_nowait())
+
+    @mock.patch("flumine.streams.simulatedorderstream.SimulatedOrderStream.is_alive")
+    def test_run(self, mock_is_alive):
+        mock_is_alive.return_value = True
+        mock_market = mock.Mock(closed=False)
+        self.mock_flumine.markets.markets = {"1.23": mock_market}
+        order = mock.Mock(simulated=True, market_id="1.23")
+        order.trade.client = self.stream.client
+        self.stream.order_changed(order)
+        self.stream.stop()
+        self.stream.run()
+        self.mock_flumine.handler_queue.put.assert_called_once()
+        event = self.mock_flumine.handler_queue.put.call_args[0][0]
+        self.assertEqual(event.event[0].orders, [order])
+
+    def test__get_changed_orders(self):
+        order_one = mock.Mock(id=1)
+        order_two = mock.Mock(id=2)
+        for order in (order_one, order_two, order_one):
+            self.stream.order_changed(order)
+        self.assertEqual(self.stream._get_changed_orders(), [order_one, order_two])
+        self.assertTrue(self.stream._changed_orders.empty())
+
+    def test__get_changed_orders_stop(self):
+        order = mock.Mock(id=1)
+        self.stream.order_changed(order)
+        self.stream.stop()
+        self.assertEqual(self.stream._get_changed_orders(), [order])
+        self.assertIsNone(self.stream._get_changed_orders())
+
+    def test__get_changed_orders_timeout(self):
+        self.assertEqual(self.stream._get_changed_orders(0.001), [])
+
+    @mock.patch("flumine.streams.simulatedorderstream.SimulatedOrderStream.is_alive")
+    def test_run_live_orders(self, mock_is_alive):
+        # resting orders are emitted every streaming_timeout
+        mock_is_alive.side_effect = [True, False]
+        order = mock.Mock(simulated=True, market_id="1.23")
+        order.trade.client = self.stream.client
+        mock_market = mock.Mock(closed=False)
+        mock_market.blotter.live_orders = [order]
+        self.mock_flumine.markets.markets = {"1.23": mock_market}
+        self.mock_flumine.markets.__iter__ = mock.Mock(return_value=iter([mock_market]))
+        self.stream.run()
+        event = self.mock_flumine.handler_queue.put.call_args[0][0]
+        self.assertEqual(event.event[0].orders, [order])
+
+    def test__add_live_orders(self):
+        order_one = mock.Mock(id=1)
+        order_two = mock.Mock(id=2)
+        order_three = mock.Mock(id=3)
+        mock_market = mock.Mock(closed=False)
+        mock_market.blotter.live_orders = [order_one, order_two]
+        mock_market_closed = mock.Mock(closed=True)
+        mock_market_closed.blotter.live_orders = [order_three]
+        self.mock_flumine.markets.__iter__ = mock.Mock(
+            return_value=iter([mock_market, mock_market_closed])
+        )
+        self.assertEqual(
+            self.stream._add_live_orders([order_two]), [order_two, order_one]
+        )
 
     def test__get_current_orders(self):
         mock_market = mock.Mock(closed=False)
-        order_one = mock.Mock(simulated=True)
+        self.mock_flumine.markets.markets = {
+            "1.23": mock_market,
+            "1.24": mock.Mock(closed=True),
+        }
+        order_one = mock.Mock(simulated=True, market_id="1.23")
         order_one.trade.client = self.stream.client
-        order_two = mock.Mock(simulated=True)
-        order_three = mock.Mock(simulated=True)
-        mock_market.blotter = [order_one, order_two, order_three]
-        self.stream.flumine.markets = [mock_market, mock.Mock(closed=True)]
-        self.assertEqual(self.stream._get_current_orders(), [order_one])
+        order_two = mock.Mock(simulated=True, market_id="1.23")
+        order_three = mock.Mock(simulated=True, market_id="1.24")
+        order_three.trade.client = self.stream.client
+        order_four = mock.Mock(simulated=True, market_id="1.25")
+        order_four.trade.client = self.stream.client
+        self.assertEqual(
+            self.stream._get_current_orders(
+                [order_one, order_two, order_three, order_four]
+            ),
+            [order_one],
+        )
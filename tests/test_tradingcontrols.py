@@ -539,7 +539,7 @@ class TestStrategyExposure(unittest.TestCase):
         mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
         mock_order.order_type.size = 12.0
         mock_order.order_type.price = 1.01
-        mock_market.blotter._live_orders = [mock_order]
+        mock_market.blotter._live_orders = {mock_order.id: mock_order}
         self.trading_control._validate(mock_order, OrderPackageType.PLACE)
         mock_on_error.assert_called_with(
             mock_order,
@@ -645,7 +645,7 @@ class TestStrategyExposure(unittest.TestCase):
         order1.order_type.size = 9.0
         order1.size_remaining = 9.0
 
-        self.market.blotter._strategy_selection_orders = {(strategy, 2, 3): [order1]}
+        self.market.blotter["order1"] = order1
 
         # Show that the exposures aren't double counted when REPLACE is used
         self.trading_control._validate(order1, OrderPackageType.REPLACE)
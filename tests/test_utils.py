@@ -1,4 +1,7 @@
+import os
+import bz2
 import logging
+import tempfile
 import unittest
 import datetime
 from unittest import mock
@@ -36,6 +39,21 @@ class UtilsTest(unittest.TestCase):
             "29761984",
         )
 
+    def test_get_file_md_compressed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "1.132153978.bz2")
+            with open("tests/resources/BASIC-1.132153978", "rb") as f:
+                data = f.read()
+            with open(file_path, "wb") as f:
+                f.write(bz2.compress(data))
+            self.assertEqual(utils.get_file_md(file_path, "eventId"), "28270094")
+
+    def test_get_file_md_empty(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "1.132153978")
+            open(file_path, "w").close()
+            self.assertIsNone(utils.get_file_md(file_path, "eventId"))
+
     def test_chunks(self):
         self.assertEqual([i for i in utils.chunks([1, 2, 3], 1)], [[1], [2], [3]])
 
@@ -280,6 +298,17 @@ class UtilsTest(unittest.TestCase):
         utils.call_process_orders_error_handling(mock_strategy, mock_market, [])
         mock_strategy.process_orders.assert_called_with(mock_market, [])
 
+    def test_call_process_orders_error_handling_changed_orders(self):
+        mock_strategy = mock.Mock()
+        mock_market = mock.Mock()
+        mock_order = mock.Mock()
+        utils.call_process_orders_error_handling(
+            mock_strategy, mock_market, [mock_order], [mock_order]
+        )
+        mock_strategy.process_orders.assert_called_with(
+            mock_market, [mock_order], [mock_order]
+        )
+
     def test_call_process_orders_error_handling_flumine_error(self):
         mock_strategy = mock.MagicMock()
         mock_strategy.process_orders.side_effect = FlumineException
@@ -308,6 +337,20 @@ class UtilsTest(unittest.TestCase):
         mock_runner = mock.Mock(selection_id=123, handicap=0)
         mock_market_book.runners = [mock_runner]
         self.assertEqual(utils.get_runner_book(mock_market_book, 123), mock_runner)
+        self.assertIsNone(utils.get_runner_book(mock_market_book, 123, 1))
+
+    def test_get_runner_index(self):
+        mock_market_book = mock.Mock()
+        mock_runner_one = mock.Mock(selection_id=123, handicap=0)
+        mock_runner_two = mock.Mock(selection_id=123, handicap=1.5)
+        mock_market_book.runners = [mock_runner_one, mock_runner_two]
+        runner_index = utils.get_runner_index(mock_market_book)
+        self.assertEqual(
+            runner_index, {(123, 0): mock_runner_one, (123, 1.5): mock_runner_two}
+        )
+        # cached on the MarketBook
+        mock_market_book.runners = []
+        self.assertIs(utils.get_runner_index(mock_market_book), runner_index)
 
     @mock.patch("flumine.utils.get_price", return_value=1.01)
     def test_get_market_notes(self, mock_get_price):